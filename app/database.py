@@ -18,11 +18,27 @@ def ensure_schema() -> None:
     from models import Base as ModelBase  # pylint: disable=import-outside-toplevel
 
     with engine.begin() as connection:
+        existing_tables = set(inspect(connection).get_table_names())
         # Create any tables that do not yet exist. ``create_all`` is idempotent so
         # running it on every startup is safe and prevents "relation does not
         # exist" errors when new tables (e.g. quiz_sessions) are introduced.
         ModelBase.metadata.create_all(bind=connection)
 
+        if "quiz_questions" in existing_tables and "quiz_session_groups" not in existing_tables:
+            # Sessions started before the table existed: derive their groups from
+            # the questions once, as ``start_quiz`` now records them.
+            connection.execute(
+                text(
+                    """
+                    INSERT INTO quiz_session_groups (session_id, group_id, position)
+                    SELECT quiz_questions.session_id, words.group_id, MIN(quiz_questions.position)
+                    FROM quiz_questions
+                    JOIN words ON words.id = quiz_questions.word_id
+                    GROUP BY quiz_questions.session_id, words.group_id
+                    """
+                )
+            )
+
         inspector = inspect(connection)
         try:
             columns = {column["name"] for column in inspector.get_columns("words")}
@@ -71,6 +87,14 @@ def ensure_schema() -> None:
                 )
             )
 
+        # Serves the incorrect-question lists of ``/quizzes/{id}/progress``.
+        connection.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS idx_quiz_questions_session_correct "
+                "ON quiz_questions(session_id, is_correct)"
+            )
+        )
+
         try:
             profile_columns = {
                 column["name"] for column in inspector.get_columns("profiles")
@@ -156,6 +180,109 @@ def ensure_schema() -> None:
                 text("ALTER TABLE groups ADD COLUMN profile_id INTEGER REFERENCES profiles(id)")
             )
 
+        def add_group_column(column_name: str, ddl: str) -> None:
+            if group_columns and column_name not in group_columns:
+                connection.execute(text(ddl))
+
+        add_group_column(
+            "word_count",
+            "ALTER TABLE groups ADD COLUMN word_count INTEGER NOT NULL DEFAULT 0",
+        )
+        add_group_column(
+            "star_histogram",
+            "ALTER TABLE groups ADD COLUMN star_histogram JSON NOT NULL DEFAULT '{}'",
+        )
+        connection.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS idx_groups_profile_folder "
+                "ON groups(profile_id, folder_id)"
+            )
+        )
+
+        hangul_columns = {
+            "folders": (folder_columns, ("name",)),
+            "groups": (group_columns, ("name",)),
+            "words": (columns, ("term", "meaning")),
+        }
+        for table_name, (existing_columns, sources) in hangul_columns.items():
+            for source in sources:
+                for suffix in ("chosung", "jamo"):
+                    column_name = f"{source}_{suffix}"
+                    if existing_columns and column_name not in existing_columns:
+                        connection.execute(
+                            text(f"ALTER TABLE {table_name} ADD COLUMN {column_name} VARCHAR")
+                        )
+
+        # Imported lazily for the same reason as ``models`` above.
+        from utils.word_search import (  # pylint: disable=import-outside-toplevel
+            ensure_hangul_index,
+            ensure_search_index,
+        )
+
+        ensure_search_index(connection)
+        ensure_hangul_index(connection)
+
+        if "quiz_questions" in existing_tables and "word_stats" not in existing_tables:
+            from utils.word_stats import backfill_word_stats  # pylint: disable=import-outside-toplevel
+
+            backfill_word_stats(connection)
+
+        if "word_stats" in existing_tables:
+            word_stat_columns = {
+                column["name"] for column in inspector.get_columns("word_stats")
+            }
+            if "next_due_at" not in word_stat_columns:
+                for ddl in (
+                    "ALTER TABLE word_stats ADD COLUMN profile_id INTEGER "
+                    "REFERENCES profiles(id) ON DELETE CASCADE",
+                    "ALTER TABLE word_stats ADD COLUMN repetitions INTEGER NOT NULL DEFAULT 0",
+                    "ALTER TABLE word_stats ADD COLUMN interval_days FLOAT NOT NULL DEFAULT 0",
+                    "ALTER TABLE word_stats ADD COLUMN ease FLOAT NOT NULL DEFAULT 2.5",
+                    "ALTER TABLE word_stats ADD COLUMN next_due_at TIMESTAMP",
+                ):
+                    connection.execute(text(ddl))
+                connection.execute(
+                    text(
+                        """
+                        UPDATE word_stats
+                        SET profile_id = (
+                            SELECT groups.profile_id FROM groups
+                            WHERE groups.id = word_stats.group_id
+                        )
+                        """
+                    )
+                )
+                from utils.word_stats import schedule_graded_history  # pylint: disable=import-outside-toplevel
+
+                schedule_graded_history(connection)
+            if "recent_error" not in word_stat_columns:
+                connection.execute(
+                    text(
+                        "ALTER TABLE word_stats ADD COLUMN recent_error FLOAT NOT NULL DEFAULT 0"
+                    )
+                )
+                connection.execute(text("UPDATE word_stats SET recent_error = error_rate"))
+            connection.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS idx_word_stats_profile_due "
+                    "ON word_stats(profile_id, next_due_at)"
+                )
+            )
+            connection.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS idx_word_stats_group_recent "
+                    "ON word_stats(group_id, recent_error, word_id)"
+                )
+            )
+
+    if group_columns and "word_count" not in group_columns:
+        # Fill the counters added above for groups that already hold words.
+        from utils.group_counters import refresh_group_counters  # pylint: disable=import-outside-toplevel
+
+        with SessionLocal() as session:
+            refresh_group_counters(session)
+            session.commit()
+
 
 def get_db():
     db = SessionLocal()
@@ -20,6 +20,8 @@ from routers import (
     folders,
     groups,
     words,
+    duplicates,
+    workbook_imports,
     profiles,
     quizzes,
     auth,
@@ -92,6 +94,8 @@ def root(request: Request):
 app.include_router(folders.router, prefix="/folders", tags=["folders"])
 app.include_router(groups.router, prefix="/groups", tags=["groups"])
 app.include_router(words.router, prefix="/words", tags=["words"])
+app.include_router(duplicates.router, prefix="/words/duplicates", tags=["words"])
+app.include_router(workbook_imports.router, prefix="/words/import-workbook", tags=["words"])
 app.include_router(profiles.router, prefix="/profiles", tags=["profiles"])
 app.include_router(quizzes.router, prefix="/quizzes", tags=["quizzes"])
 app.include_router(auth.router, prefix="/auth", tags=["auth"])
@@ -9,10 +9,36 @@ from sqlalchemy import (
     func,
     UniqueConstraint,
     Boolean,
+    Float,
+    Index,
+    JSON,
     text,
+    event,
+    inspect,
 )
 from sqlalchemy.orm import relationship
 from database import Base
+from utils.hangul import hangul_chosung, hangul_jamo
+
+
+def _hangul_default(source, transform):
+    """Column default deriving a Hangul search key from ``source``.
+
+    Running as an insert default covers ORM inserts and Core bulk inserts alike.
+    """
+
+    def default(context):
+        return transform(context.get_current_parameters().get(source))
+
+    return default
+
+
+def _hangul_columns(source):
+    return (
+        Column(String, default=_hangul_default(source, hangul_chosung)),
+        Column(String, default=_hangul_default(source, hangul_jamo)),
+    )
+
 
 class Folder(Base):
     __tablename__ = "folders"
@@ -21,6 +47,7 @@ class Folder(Base):
     name = Column(String, nullable=False)
     parent_id = Column(Integer, ForeignKey("folders.id"), nullable=True)
     default_language = Column(String, nullable=True)
+    name_chosung, name_jamo = _hangul_columns("name")
     created_at = Column(DateTime, server_default=func.now())
     groups = relationship("Group", back_populates="folder", cascade="all,delete")
     children = relationship("Folder", cascade="all,delete")
@@ -32,10 +59,18 @@ class Group(Base):
     profile_id = Column(Integer, ForeignKey("profiles.id"), nullable=True)
     folder_id = Column(Integer, ForeignKey("folders.id"))
     name = Column(String, nullable=False)
+    name_chosung, name_jamo = _hangul_columns("name")
+    # Kept in step with ``words`` by utils.group_counters.adjust_group_counters.
+    word_count = Column(Integer, nullable=False, default=0, server_default="0")
+    star_histogram = Column(JSON, nullable=False, default=dict, server_default=text("'{}'"))
     created_at = Column(DateTime, server_default=func.now())
     folder = relationship("Folder", back_populates="groups")
     words = relationship("Word", back_populates="group", cascade="all,delete")
     quiz_sessions = relationship("QuizSession", back_populates="group", cascade="all,delete")
+    quiz_session_links = relationship(
+        "QuizSessionGroup", back_populates="group", cascade="all,delete"
+    )
+    word_stats = relationship("WordStat", cascade="all,delete")
     profile = relationship("Profile", back_populates="groups")
 
 class Word(Base):
@@ -50,11 +85,35 @@ class Word(Base):
     example = Column(Text)
     memo = Column(Text)
     star = Column(Integer, nullable=False, default=0, server_default="0")
+    term_chosung, term_jamo = _hangul_columns("term")
+    meaning_chosung, meaning_jamo = _hangul_columns("meaning")
     created_at = Column(DateTime, server_default=func.now())
     group = relationship("Group", back_populates="words")
     __table_args__ = (UniqueConstraint("group_id", "language", "term", name="uq_group_lang_term"),)
 
 
+# Source columns whose Hangul search keys live in ``<source>_chosung`` and
+# ``<source>_jamo``.
+HANGUL_SEARCH_SOURCES = {
+    Folder: ("name",),
+    Group: ("name",),
+    Word: ("term", "meaning"),
+}
+
+
+def _refresh_hangul_columns(_mapper, _connection, target) -> None:
+    state = inspect(target)
+    for source in HANGUL_SEARCH_SOURCES[type(target)]:
+        if state.attrs[source].history.has_changes():
+            value = getattr(target, source)
+            setattr(target, f"{source}_chosung", hangul_chosung(value))
+            setattr(target, f"{source}_jamo", hangul_jamo(value))
+
+
+for _model in HANGUL_SEARCH_SOURCES:
+    event.listen(_model, "before_update", _refresh_hangul_columns)
+
+
 class Profile(Base):
     __tablename__ = "profiles"
     id = Column(Integer, primary_key=True)
@@ -128,6 +187,9 @@ class QuizSession(Base):
     profile = relationship("Profile", back_populates="sessions")
     group = relationship("Group", back_populates="quiz_sessions")
     questions = relationship("QuizQuestion", back_populates="session", cascade="all,delete")
+    group_links = relationship(
+        "QuizSessionGroup", back_populates="session", cascade="all,delete"
+    )
 
 
 class QuizQuestion(Base):
@@ -145,6 +207,54 @@ class QuizQuestion(Base):
     word = relationship("Word")
 
 
+class WordStat(Base):
+    """Answer statistics of one word, kept by ``utils.word_stats``."""
+
+    __tablename__ = "word_stats"
+    word_id = Column(Integer, ForeignKey("words.id", ondelete="CASCADE"), primary_key=True)
+    # Copy of ``words.group_id`` so the index below can list a group's words.
+    group_id = Column(Integer, ForeignKey("groups.id", ondelete="CASCADE"), nullable=False)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    correct = Column(Integer, nullable=False, default=0, server_default="0")
+    streak = Column(Integer, nullable=False, default=0, server_default="0")
+    last_correct = Column(Boolean)
+    last_answered_at = Column(DateTime)
+    error_rate = Column(Float, nullable=False, default=0.0, server_default="0")
+    # Error rate with recent answers weighted more, for the "weak" quiz mode.
+    recent_error = Column(Float, nullable=False, default=0.0, server_default="0")
+    # Spaced-repetition schedule (SM-2), updated by exam answers. ``profile_id``
+    # is the owner of the word's group, so the due queue is one index range.
+    profile_id = Column(Integer, ForeignKey("profiles.id", ondelete="CASCADE"))
+    repetitions = Column(Integer, nullable=False, default=0, server_default="0")
+    interval_days = Column(Float, nullable=False, default=0.0, server_default="0")
+    ease = Column(Float, nullable=False, default=2.5, server_default="2.5")
+    next_due_at = Column(DateTime)
+    __table_args__ = (
+        Index("idx_word_stats_group_error", "group_id", "error_rate", "attempts", "word_id"),
+        Index("idx_word_stats_profile_due", "profile_id", "next_due_at"),
+        Index("idx_word_stats_group_recent", "group_id", "recent_error", "word_id"),
+    )
+
+
+class QuizSessionGroup(Base):
+    """A group a quiz session asked words from, written when it starts.
+
+    ``position`` is that of the session's first question from the group, so
+    history lists groups in the order the quiz met them.
+    """
+
+    __tablename__ = "quiz_session_groups"
+    session_id = Column(
+        Integer, ForeignKey("quiz_sessions.id", ondelete="CASCADE"), primary_key=True
+    )
+    group_id = Column(
+        Integer, ForeignKey("groups.id", ondelete="CASCADE"), primary_key=True, index=True
+    )
+    position = Column(Integer, nullable=False)
+    session = relationship("QuizSession", back_populates="group_links")
+    group = relationship("Group", back_populates="quiz_session_links")
+
+
 class StudyPlan(Base):
     __tablename__ = "study_plans"
     id = Column(Integer, primary_key=True)
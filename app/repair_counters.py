@@ -0,0 +1,14 @@
+"""Recompute the denormalized per-group word counters."""
+
+from database import SessionLocal, ensure_schema
+from utils.group_counters import refresh_group_counters
+
+if __name__ == "__main__":
+    ensure_schema()
+    session = SessionLocal()
+    try:
+        repaired = refresh_group_counters(session)
+        session.commit()
+    finally:
+        session.close()
+    print(f"Recounted {repaired} groups.")
@@ -0,0 +1,162 @@
+"""Duplicate-word analysis jobs and merging."""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Literal
+from uuid import uuid4
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+import models
+import schemas
+from database import SessionLocal, get_db
+from utils.auth import require_current_user
+from utils.word_delete import owned_word_ids
+from utils.word_duplicates import (
+    DuplicateCluster,
+    find_duplicate_clusters,
+    load_profile_words,
+    merge_words,
+)
+
+DUPLICATE_JOB_TTL = timedelta(hours=1)
+
+
+@dataclass
+class DuplicateAnalysisJob:
+    """Represents an async duplicate analysis over one account."""
+
+    id: str
+    profile_id: int
+    status: Literal["pending", "processing", "completed", "failed"] = "pending"
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    completed_at: datetime | None = None
+    word_count: int = 0
+    clusters: list[DuplicateCluster] = field(default_factory=list)
+    message: str | None = None
+
+
+duplicate_jobs: dict[str, DuplicateAnalysisJob] = {}
+duplicate_jobs_lock = Lock()
+
+
+def _cleanup_jobs() -> None:
+    cutoff = datetime.utcnow() - DUPLICATE_JOB_TTL
+    with duplicate_jobs_lock:
+        expired = [
+            job_id
+            for job_id, job in duplicate_jobs.items()
+            if job.completed_at and job.completed_at < cutoff
+        ]
+        for job_id in expired:
+            duplicate_jobs.pop(job_id, None)
+
+
+def _get_job(task_id: str, profile_id: int) -> DuplicateAnalysisJob:
+    with duplicate_jobs_lock:
+        job = duplicate_jobs.get(task_id)
+    if job is None or job.profile_id != profile_id:
+        raise HTTPException(404, "요청한 작업을 찾을 수 없습니다.")
+    return job
+
+
+def _process_duplicate_job(job: DuplicateAnalysisJob) -> None:
+    job.status = "processing"
+    db = SessionLocal()
+    try:
+        words = load_profile_words(db, job.profile_id)
+    finally:
+        db.close()
+    clusters = find_duplicate_clusters(words)
+    job.word_count = len(words)
+    job.clusters = clusters
+    job.message = (
+        "중복 후보 {}묶음을 찾았습니다.".format(len(clusters))
+        if clusters
+        else "중복된 단어가 없습니다."
+    )
+    job.status = "completed"
+    job.completed_at = datetime.utcnow()
+
+
+async def _run_duplicate_job(job: DuplicateAnalysisJob) -> None:
+    try:
+        await asyncio.to_thread(_process_duplicate_job, job)
+    except Exception as exc:  # pragma: no cover - defensive
+        job.status = "failed"
+        job.message = f"알 수 없는 오류가 발생했습니다: {exc}"
+        job.completed_at = datetime.utcnow()
+
+
+router = APIRouter()
+
+
+@router.post("", status_code=202, response_model=schemas.DuplicateJobCreated)
+async def start_duplicate_analysis(
+    current_user: models.Profile = Depends(require_current_user),
+) -> schemas.DuplicateJobCreated:
+    """Start finding exact and near-duplicate words across the account."""
+
+    _cleanup_jobs()
+    job = DuplicateAnalysisJob(id=uuid4().hex, profile_id=current_user.id)
+    with duplicate_jobs_lock:
+        duplicate_jobs[job.id] = job
+    asyncio.create_task(_run_duplicate_job(job))
+    return schemas.DuplicateJobCreated(
+        task_id=job.id, status_url=f"/words/duplicates/{job.id}"
+    )
+
+
+@router.get("/{task_id}", response_model=schemas.DuplicateJobStatus)
+def get_duplicate_analysis(
+    task_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: models.Profile = Depends(require_current_user),
+) -> schemas.DuplicateJobStatus:
+    """Return the job status and one page of clusters, largest first."""
+
+    _cleanup_jobs()
+    job = _get_job(task_id, current_user.id)
+    page = job.clusters[offset : offset + limit]
+    return schemas.DuplicateJobStatus(
+        task_id=job.id,
+        status=job.status,
+        word_count=job.word_count,
+        cluster_count=len(job.clusters),
+        message=job.message,
+        created_at=job.created_at,
+        completed_at=job.completed_at,
+        offset=offset,
+        limit=limit,
+        has_more=offset + limit < len(job.clusters),
+        clusters=[schemas.DuplicateClusterOut.model_validate(cluster) for cluster in page],
+    )
+
+
+@router.post("/merge", response_model=schemas.WordMergeResult)
+def merge_duplicate_words(
+    payload: schemas.WordMergeRequest,
+    db: Session = Depends(get_db),
+    current_user: models.Profile = Depends(require_current_user),
+) -> schemas.WordMergeResult:
+    """Keep ``canonical_id`` and fold the other words (and their quiz history) into it."""
+
+    word_ids = owned_word_ids(db, current_user.id, [payload.canonical_id, *payload.word_ids])
+    if payload.canonical_id not in word_ids:
+        raise HTTPException(404, "남길 단어를 찾을 수 없습니다.")
+    merged_ids = [word_id for word_id in word_ids if word_id != payload.canonical_id]
+    if not merged_ids:
+        raise HTTPException(400, "합칠 단어를 선택하세요.")
+
+    moved_questions = merge_words(db, payload.canonical_id, merged_ids)
+    db.commit()
+    return schemas.WordMergeResult(
+        canonical_id=payload.canonical_id,
+        merged_ids=merged_ids,
+        moved_questions=moved_questions,
+    )
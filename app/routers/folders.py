@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 from database import get_db
 import models, schemas
 from utils.sorting import korean_alnum_sort_key
 from utils.auth import require_current_user
+from utils.word_search import hangul_prefix_condition
 
 router = APIRouter()
 
@@ -37,14 +39,17 @@ def create_folder(
 
 @router.get("", response_model=list[dict])
 def list_folders(
+    name_prefix: str | None = Query(None, max_length=200, description="초성 또는 이름 앞부분"),
     db: Session = Depends(get_db),
     current_user: models.Profile = Depends(require_current_user),
 ):
-    rows = (
-        db.query(models.Folder)
-        .filter(models.Folder.profile_id == current_user.id)
-        .all()
-    )
+    q = db.query(models.Folder).filter(models.Folder.profile_id == current_user.id)
+    if name_prefix and name_prefix.strip():
+        condition, params = hangul_prefix_condition(
+            db.get_bind().dialect.name, "folders", "name", name_prefix.strip()
+        )
+        q = q.filter(text(condition)).params(**params)
+    rows = q.all()
     rows.sort(key=lambda r: korean_alnum_sort_key(r.name or ""))
     return [
         {
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 from database import get_db
 import models, schemas
 from utils.sorting import korean_alnum_sort_key
 from utils.auth import require_current_user
+from utils.word_search import hangul_prefix_condition
 
 router = APIRouter()
 
@@ -31,15 +33,30 @@ def create_group(
 @router.get("", response_model=list[dict])
 def list_groups(
     folder_id: int | None = None,
+    name_prefix: str | None = Query(None, max_length=200, description="초성 또는 이름 앞부분"),
     db: Session = Depends(get_db),
     current_user: models.Profile = Depends(require_current_user),
 ):
     q = db.query(models.Group).filter(models.Group.profile_id == current_user.id)
     if folder_id:
         q = q.filter(models.Group.folder_id == folder_id)
+    if name_prefix and name_prefix.strip():
+        condition, params = hangul_prefix_condition(
+            db.get_bind().dialect.name, "groups", "name", name_prefix.strip()
+        )
+        q = q.filter(text(condition)).params(**params)
     rows = q.all()
     rows.sort(key=lambda r: korean_alnum_sort_key(r.name or ""))
-    return [{"id": r.id, "folder_id": r.folder_id, "name": r.name} for r in rows]
+    return [
+        {
+            "id": r.id,
+            "folder_id": r.folder_id,
+            "name": r.name,
+            "word_count": r.word_count,
+            "star_histogram": r.star_histogram or {},
+        }
+        for r in rows
+    ]
 
 
 @router.patch("/{group_id}", response_model=dict)
@@ -100,3 +117,54 @@ def delete_group(
     db.delete(group)
     db.commit()
     return {"status": "deleted", "id": group_id}
+
+
+@router.get("/{group_id}/weakest-words", response_model=list[schemas.WeakWordOut])
+def list_weakest_words(
+    group_id: int,
+    limit: int = Query(20, ge=1, le=200),
+    min_attempts: int = Query(1, ge=1),
+    db: Session = Depends(get_db),
+    current_user: models.Profile = Depends(require_current_user),
+):
+    """Words of the group most often answered wrong, worst first.
+
+    Read in ``idx_word_stats_group_error`` order; words never missed are left out.
+    """
+
+    group = (
+        db.query(models.Group)
+        .filter(
+            models.Group.id == group_id,
+            models.Group.profile_id == current_user.id,
+        )
+        .one_or_none()
+    )
+    if not group:
+        raise HTTPException(404, "그룹을 찾을 수 없습니다.")
+
+    stats = models.WordStat
+    rows = (
+        db.query(models.Word, stats)
+        .join(stats, stats.word_id == models.Word.id)
+        .filter(
+            stats.group_id == group_id,
+            stats.error_rate > 0,
+            stats.attempts >= min_attempts,
+        )
+        .order_by(stats.error_rate.desc(), stats.attempts.desc(), stats.word_id.desc())
+        .limit(limit)
+        .all()
+    )
+    return [
+        schemas.WeakWordOut(
+            **schemas.WordOut.model_validate(word).model_dump(),
+            attempts=stat.attempts,
+            correct=stat.correct,
+            streak=stat.streak,
+            error_rate=stat.error_rate,
+            last_correct=stat.last_correct,
+            last_answered_at=stat.last_answered_at,
+        )
+        for word, stat in rows
+    ]
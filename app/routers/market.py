@@ -13,6 +13,7 @@ import models
 import schemas
 from database import get_db
 from utils.auth import require_current_user
+from utils.group_counters import adjust_group_counters, word_count_changes
 from utils.sorting import korean_alnum_sort_key
 
 router = APIRouter()
@@ -120,23 +121,17 @@ def list_groups(
         raise HTTPException(404, "폴더를 찾을 수 없습니다.")
 
     rows = (
-        db.query(models.Group, func.count(models.Word.id).label("word_count"))
-        .outerjoin(models.Word, models.Word.group_id == models.Group.id)
+        db.query(models.Group.id, models.Group.name, models.Group.word_count)
         .filter(
             models.Group.folder_id == folder_id,
             models.Group.profile_id == folder.profile_id,
         )
-        .group_by(models.Group.id)
         .all()
     )
 
     groups = [
-        schemas.MarketGroupOut(
-            id=group.id,
-            name=group.name,
-            word_count=int(word_count or 0),
-        )
-        for group, word_count in rows
+        schemas.MarketGroupOut(id=group_id, name=name, word_count=word_count)
+        for group_id, name, word_count in rows
     ]
     groups.sort(key=lambda item: korean_alnum_sort_key(item.name))
     return groups
@@ -236,6 +231,7 @@ def import_groups(
     updated_groups = 0
     imported_words = 0
     skipped_words = 0
+    imported_keys: list[tuple[int, int]] = []
 
     for source_group in ordered_groups:
         target_group = group_cache.get(source_group.name)
@@ -275,8 +271,10 @@ def import_groups(
             )
             db.add(new_word)
             cache.add(key)
+            imported_keys.append((target_group.id, word.star))
             imported_words += 1
 
+    adjust_group_counters(db, word_count_changes(added=imported_keys))
     db.commit()
 
     return schemas.MarketImportSummary(
@@ -1,15 +1,47 @@
+import asyncio
+import anyio
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, Query, Response
-from sqlalchemy import case
+import json
+from urllib.parse import urlsplit
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import and_, case, func, insert, select, update
 from sqlalchemy.orm import Session
-from database import get_db
+from database import SessionLocal, get_db
 import models, schemas
 import random
 from utils.auth import require_current_user
+from utils.group_counters import adjust_group_counters, word_count_changes
+from utils.response_formats import (
+    COMPACT_RESPONSES,
+    ResponseFormat,
+    columnar,
+    negotiate_format,
+    render_compact,
+)
+from utils.word_stats import record_word_answers, select_due_words, weak_word_query
 
 router = APIRouter()
 
 MAX_STAR_SCORE = schemas.MAX_STAR_RATING
+# Answers arriving over ``/{session_id}/ws`` within this window (or until this
+# many are queued) are written together.
+SOCKET_BATCH_SECONDS = 0.25
+SOCKET_BATCH_MAX = 200
+# Modes whose answers raise stars and move the review schedule.
+GRADED_MODES = ("exam", "weak")
+QUESTION_OUT_COLUMNS = tuple(schemas.QuizQuestionOut.model_fields)
 
 
 def _serialize_star_values(values: list[int] | None) -> str | None:
@@ -33,16 +65,96 @@ def _deserialize_star_values(value: str | None) -> list[int]:
     return result
 
 
+def _insert_questions(
+    db: Session, session_id: int, questions: list[tuple[int, str, str]]
+) -> list[int]:
+    """Insert ``(word_id, prompt, answer)`` rows as positions 1..n.
+
+    All rows go out as one multi-row INSERT ... RETURNING (batched by
+    insertmanyvalues). RETURNING order is not guaranteed everywhere, so the ids
+    are put back in order through their positions.
+    """
+
+    if not questions:
+        return []
+    returned = db.execute(
+        insert(models.QuizQuestion).returning(
+            models.QuizQuestion.id, models.QuizQuestion.position
+        ),
+        [
+            {
+                "session_id": session_id,
+                "word_id": word_id,
+                "position": position,
+                "prompt_text": prompt,
+                "answer_text": answer,
+            }
+            for position, (word_id, prompt, answer) in enumerate(questions, start=1)
+        ],
+    )
+    ids = [0] * len(questions)
+    for question_id, position in returned:
+        ids[position - 1] = question_id
+    return ids
+
+
+def _insert_session_groups(
+    db: Session, session_id: int, question_group_ids: list[int]
+) -> None:
+    """Record the groups behind a session's questions, given in question order."""
+
+    positions: dict[int, int] = {}
+    for position, group_id in enumerate(question_group_ids, start=1):
+        positions.setdefault(group_id, position)
+    if positions:
+        db.execute(
+            insert(models.QuizSessionGroup),
+            [
+                {"session_id": session_id, "group_id": group_id, "position": position}
+                for group_id, position in positions.items()
+            ],
+        )
+
+
+def _quiz_start_response(
+    session_id: int,
+    direction: str,
+    rows: list[tuple],
+    response_format: ResponseFormat = "json",
+):
+    """Build the start/retry response from ``QUESTION_OUT_COLUMNS`` tuples."""
+
+    if response_format != "json":
+        return render_compact(
+            {
+                "session_id": session_id,
+                "total": len(rows),
+                "direction": direction,
+                "questions": columnar(QUESTION_OUT_COLUMNS, rows),
+            },
+            response_format,
+        )
+    return schemas.QuizStartResponse(
+        session_id=session_id,
+        total=len(rows),
+        direction=direction,
+        questions=[
+            schemas.QuizQuestionOut(**dict(zip(QUESTION_OUT_COLUMNS, row))) for row in rows
+        ],
+    )
+
+
 def _quiz_progress(session: models.QuizSession, db: Session) -> schemas.QuizProgress:
-    incorrect_rows = (
-        db.query(models.QuizQuestion.id)
-        .filter(
+    """Full snapshot, with the incorrect list read from its session index."""
+
+    incorrect_ids = db.scalars(
+        select(models.QuizQuestion.id)
+        .where(
             models.QuizQuestion.session_id == session.id,
             models.QuizQuestion.is_correct.is_(False),
         )
-        .all()
-    )
-    incorrect_ids = [row[0] for row in incorrect_rows]
+        .order_by(models.QuizQuestion.id)
+    ).all()
     return schemas.QuizProgress(
         session_id=session.id,
         total=session.total_questions,
@@ -53,61 +165,196 @@ def _quiz_progress(session: models.QuizSession, db: Session) -> schemas.QuizProg
     )
 
 
-@router.post("/start", response_model=schemas.QuizStartResponse)
-def start_quiz(
-    payload: schemas.QuizStartRequest,
-    db: Session = Depends(get_db),
-    current_user: models.Profile = Depends(require_current_user),
+def _open_session(
+    db: Session,
+    session: models.QuizSession,
+    words: list,
+    response_format: ResponseFormat = "json",
 ):
-    group_ids = payload.group_ids or []
-    if not group_ids:
-        raise HTTPException(400, "시험을 시작할 그룹을 선택하세요.")
+    """Save ``session`` with one question per word, in order, and commit.
 
-    groups = (
-        db.query(models.Group)
-        .filter(
-            models.Group.id.in_(group_ids),
-            models.Group.profile_id == current_user.id,
+    ``words`` need ``id``, ``group_id``, ``term``, ``meaning``, ``star`` and
+    ``reading``; the response is built before the commit expires them.
+    """
+
+    direction = session.direction
+    db.add(session)
+    db.flush()
+    session_id = session.id
+
+    if direction == "term_to_meaning":
+        pairs = [(word.term, word.meaning) for word in words]
+    else:
+        pairs = [(word.meaning, word.term) for word in words]
+    question_ids = _insert_questions(
+        db,
+        session_id,
+        [(word.id, prompt, answer) for word, (prompt, answer) in zip(words, pairs)],
+    )
+    _insert_session_groups(db, session_id, [word.group_id for word in words])
+    rows = [
+        (question_id, word.id, position, prompt, answer, word.star, word.reading)
+        for position, (question_id, word, (prompt, answer)) in enumerate(
+            zip(question_ids, words, pairs), start=1
         )
-        .all()
+    ]
+    db.commit()
+    return _quiz_start_response(session_id, direction, rows, response_format)
+
+
+def _apply_answers(
+    db: Session, session: models.QuizSession, answers: list[schemas.QuizAnswerSubmit]
+) -> schemas.QuizProgressDelta:
+    """Record ``answers`` in submission order without committing.
+
+    Re-answering a question only moves the correct count, and a word gains a
+    star the first time its question is answered wrong in a non-retry exam,
+    exactly as if each answer had been posted on its own. Every question must
+    belong to ``session`` or nothing is applied.
+
+    No row is read into Python first. Each UPDATE matches questions by their
+    stored state (unanswered, then answered the other way), and the counters
+    are raised by what those statements actually changed with
+    ``SET x = x + n``. Concurrent requests for the same session therefore
+    count every transition exactly once, without ``SELECT ... FOR UPDATE``.
+    """
+
+    first: dict[int, bool] = {}
+    final: dict[int, schemas.QuizAnswerSubmit] = {}
+    for answer in answers:
+        first.setdefault(answer.question_id, answer.is_correct)
+        final[answer.question_id] = answer
+
+    question = models.QuizQuestion
+    target = case(
+        {question_id: answer.is_correct for question_id, answer in final.items()},
+        value=question.id,
+    )
+    user_answer = case(
+        {question_id: answer.answer for question_id, answer in final.items()},
+        value=question.id,
     )
-    if len(groups) != len(group_ids):
-        existing_ids = {g.id for g in groups}
-        missing = sorted({gid for gid in group_ids if gid not in existing_ids})
-        raise HTTPException(404, f"선택한 그룹을 찾을 수 없습니다: {missing}")
 
-    folder_ids = {g.folder_id for g in groups}
-    if len(folder_ids) > 1:
-        raise HTTPException(400, "같은 폴더의 그룹만 선택할 수 있습니다.")
-    if payload.folder_id and folder_ids and payload.folder_id not in folder_ids:
-        raise HTTPException(400, "선택한 폴더에 그룹이 속해있지 않습니다.")
+    def record(ids, *conditions, **values):
+        return db.execute(
+            update(question)
+            .where(question.id.in_(ids), question.session_id == session.id, *conditions)
+            .values(user_answer=user_answer, **values)
+            .returning(question.id, question.word_id)
+            .execution_options(synchronize_session=False)
+        ).all()
+
+    answered_now = record(final, question.is_correct.is_(None), is_correct=target)
+    remaining = set(final).difference(row.id for row in answered_now)
+    flipped = []
+    if remaining:
+        flipped = record(remaining, question.is_correct != target, is_correct=target)
+        unchanged = remaining.difference(row.id for row in flipped)
+        if unchanged and len(record(unchanged)) != len(unchanged):
+            db.rollback()
+            raise HTTPException(404, "해당 세션에서 문항을 찾을 수 없습니다.")
+
+    answered = len(answered_now)
+    correct = sum(final[row.id].is_correct for row in answered_now) + sum(
+        1 if final[row.id].is_correct else -1 for row in flipped
+    )
+    changed = [row.id for row in [*answered_now, *flipped]]
+    scheduled = session.mode in GRADED_MODES and not session.is_retry
+    record_word_answers(
+        db,
+        [
+            (row.word_id, final[row.id].is_correct, first_answer)
+            for rows, first_answer in ((answered_now, True), (flipped, False))
+            for row in rows
+            if row.word_id is not None
+        ],
+        schedule=scheduled,
+    )
 
-    primary_group_id = payload.group_id or group_ids[0]
+    if scheduled:
+        starred_words = [
+            row.word_id
+            for row in answered_now
+            if not first[row.id] and row.word_id is not None
+        ]
+    else:
+        starred_words = []
+    if starred_words:
+        # Words already at the top rating are left alone, so every returned
+        # row moved up exactly one star.
+        raised = db.execute(
+            update(models.Word)
+            .where(models.Word.id.in_(starred_words), models.Word.star < MAX_STAR_SCORE)
+            .values(star=models.Word.star + 1)
+            .returning(models.Word.group_id, models.Word.star)
+            .execution_options(synchronize_session=False)
+        ).all()
+        adjust_group_counters(
+            db,
+            word_count_changes(
+                removed=[(group_id, star - 1) for group_id, star in raised], added=raised
+            ),
+        )
 
-    if (payload.number_start is not None or payload.number_end is not None) and len(group_ids) != 1:
-        raise HTTPException(400, "번호 범위는 하나의 그룹을 선택했을 때만 사용할 수 있습니다.")
+    quiz = models.QuizSession
+    answered_total = quiz.answered_questions + answered
+    total, answered_questions, correct_questions = db.execute(
+        update(quiz)
+        .where(quiz.id == session.id)
+        .values(
+            answered_questions=answered_total,
+            correct_questions=quiz.correct_questions + correct,
+            is_completed=and_(quiz.total_questions > 0, answered_total >= quiz.total_questions),
+        )
+        .returning(quiz.total_questions, quiz.answered_questions, quiz.correct_questions)
+        .execution_options(synchronize_session=False)
+    ).one()
+    return schemas.QuizProgressDelta(
+        session_id=session.id,
+        total=total,
+        answered=answered_questions,
+        correct=correct_questions,
+        remaining=max(0, total - answered_questions),
+        incorrect_added=[
+            question_id for question_id in changed if not final[question_id].is_correct
+        ],
+        incorrect_removed=[row.id for row in flipped if final[row.id].is_correct],
+    )
+
+
+def _select_quiz_words(
+    db: Session, payload: schemas.QuizStartRequest, group_ids: list[int]
+) -> list:
+    """Return the ``(id, group_id, term, meaning, star, reading)`` rows a new quiz asks.
 
-    query = db.query(models.Word).filter(models.Word.group_id.in_(group_ids))
+    Only the chosen rows are fetched: the words are numbered with
+    ROW_NUMBER() over the quiz order, and a random ``limit`` draws that many
+    numbers in Python so the database filters by position instead of sorting
+    every candidate by ``random()``.
+    """
+
+    word = models.Word
+    conditions = [word.group_id.in_(group_ids)]
     if payload.min_star is not None:
-        query = query.filter(models.Word.star >= payload.min_star)
+        conditions.append(word.star >= payload.min_star)
     if payload.star_values:
-        query = query.filter(models.Word.star.in_(payload.star_values))
-
+        conditions.append(word.star.in_(payload.star_values))
     if len(group_ids) > 1:
         group_order = case(
             *[(gid, idx) for idx, gid in enumerate(group_ids)],
-            value=models.Word.group_id,
+            value=word.group_id,
         )
-        query = query.order_by(group_order, models.Word.id)
+        ordering = [group_order, word.id]
     else:
-        query = query.order_by(models.Word.id)
+        ordering = [word.id]
 
-    words = query.all()
-    if not words:
+    total = db.scalar(select(func.count()).select_from(word).where(*conditions))
+    if not total:
         raise HTTPException(400, "선택한 조건에 해당하는 단어가 없습니다.")
 
+    columns = [word.id, word.group_id, word.term, word.meaning, word.star, word.reading]
+    start_number, end_number = 1, total
     if payload.number_start is not None or payload.number_end is not None:
-        total = len(words)
         start_number = payload.number_start or 1
         end_number = payload.number_end or total
 
@@ -119,16 +366,100 @@ def start_quiz(
         if start_number > end_number:
             raise HTTPException(400, "시작 번호는 끝 번호보다 작거나 같아야 합니다.")
 
-        words = words[start_number - 1 : end_number]
-        if not words:
-            raise HTTPException(400, "선택한 번호 범위에 해당하는 단어가 없습니다.")
-
+    numbered = (
+        select(*columns, func.row_number().over(order_by=ordering).label("number"))
+        .where(*conditions)
+        .subquery()
+    )
+    available = end_number - start_number + 1
+    count = min(payload.limit or available, available)
+    if payload.random and count < available:
+        numbers = random.sample(range(start_number, end_number + 1), count)
+        position = numbered.c.number.in_(numbers)
+    else:
+        position = numbered.c.number.between(start_number, start_number + count - 1)
+    statement = (
+        select(*(numbered.c[column.key] for column in columns))
+        .where(position)
+        .order_by(numbered.c.number)
+    )
+    words = db.execute(statement).all()
     if payload.random:
         random.shuffle(words)
+    return words
+
 
+def _select_weak_words(
+    db: Session, payload: schemas.QuizStartRequest, group_ids: list[int]
+) -> list:
+    """Return the ``limit`` words of ``group_ids`` with the worst recent accuracy.
+
+    Ranked by ``word_stats.recent_error`` in one query over
+    ``idx_word_stats_group_recent``; words never answered wrong are not asked.
+    """
+
+    word = models.Word
+    statement = weak_word_query(
+        [word.id, word.group_id, word.term, word.meaning, word.star, word.reading], group_ids
+    )
+    if payload.min_star is not None:
+        statement = statement.where(word.star >= payload.min_star)
+    if payload.star_values:
+        statement = statement.where(word.star.in_(payload.star_values))
     if payload.limit:
-        words = words[: payload.limit]
+        statement = statement.limit(payload.limit)
+    words = db.execute(statement).all()
+    if not words:
+        raise HTTPException(400, "선택한 그룹에 틀린 기록이 있는 단어가 없습니다.")
+    if payload.random:
+        random.shuffle(words)
+    return words
+
+
+@router.post("/start", response_model=schemas.QuizStartResponse, responses=COMPACT_RESPONSES)
+def start_quiz(
+    payload: schemas.QuizStartRequest,
+    accept: str | None = Header(default=None),
+    db: Session = Depends(get_db),
+    current_user: models.Profile = Depends(require_current_user),
+):
+    # Negotiate before anything is written so a 406 leaves no session behind.
+    response_format = negotiate_format(accept)
+    group_ids = payload.group_ids or []
+    if not group_ids:
+        raise HTTPException(400, "시험을 시작할 그룹을 선택하세요.")
+
+    groups = (
+        db.query(models.Group)
+        .filter(
+            models.Group.id.in_(group_ids),
+            models.Group.profile_id == current_user.id,
+        )
+        .all()
+    )
+    if len(groups) != len(group_ids):
+        existing_ids = {g.id for g in groups}
+        missing = sorted({gid for gid in group_ids if gid not in existing_ids})
+        raise HTTPException(404, f"선택한 그룹을 찾을 수 없습니다: {missing}")
+
+    folder_ids = {g.folder_id for g in groups}
+    if len(folder_ids) > 1:
+        raise HTTPException(400, "같은 폴더의 그룹만 선택할 수 있습니다.")
+    if payload.folder_id and folder_ids and payload.folder_id not in folder_ids:
+        raise HTTPException(400, "선택한 폴더에 그룹이 속해있지 않습니다.")
+
+    primary_group_id = payload.group_id or group_ids[0]
+
+    numbered = payload.number_start is not None or payload.number_end is not None
+    if numbered and len(group_ids) != 1:
+        raise HTTPException(400, "번호 범위는 하나의 그룹을 선택했을 때만 사용할 수 있습니다.")
 
+    if payload.mode == "weak":
+        if numbered:
+            raise HTTPException(400, "취약 단어 시험에서는 번호 범위를 사용할 수 없습니다.")
+        words = _select_weak_words(db, payload, group_ids)
+    else:
+        words = _select_quiz_words(db, payload, group_ids)
     session = models.QuizSession(
         profile_id=current_user.id,
         group_id=primary_group_id,
@@ -141,53 +472,63 @@ def start_quiz(
         total_questions=len(words),
         is_retry=False,
     )
-    db.add(session)
-    db.flush()
+    return _open_session(db, session, words, response_format)
 
-    quiz_questions = []
-    for idx, word in enumerate(words, start=1):
-        if payload.direction == "term_to_meaning":
-            prompt = word.term
-            answer = word.meaning
-        else:
-            prompt = word.meaning
-            answer = word.term
-
-        question = models.QuizQuestion(
-            session_id=session.id,
-            word_id=word.id,
-            position=idx,
-            prompt_text=prompt,
-            answer_text=answer,
-        )
-        db.add(question)
-        db.flush()
-        quiz_questions.append((question, word))
 
-    db.commit()
+@router.get("/due", response_model=schemas.QuizDueList)
+def list_due_words(
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: models.Profile = Depends(require_current_user),
+):
+    """Words due for review across every group, most overdue first."""
+
+    rows = select_due_words(db, current_user.id, limit + 1)
+    return schemas.QuizDueList(
+        items=[
+            schemas.DueWordOut(
+                **schemas.WordOut.model_validate(word).model_dump(),
+                repetitions=stat.repetitions,
+                interval_days=stat.interval_days,
+                ease=stat.ease,
+                next_due_at=stat.next_due_at,
+            )
+            for word, stat in rows[:limit]
+        ],
+        has_more=len(rows) > limit,
+    )
 
-    questions_out = [
-        schemas.QuizQuestionOut(
-            id=question.id,
-            word_id=question.word_id,
-            position=question.position,
-            prompt=question.prompt_text,
-            answer=question.answer_text,
-            star=word.star,
-            reading=word.reading,
-        )
-        for question, word in quiz_questions
-    ]
 
-    return schemas.QuizStartResponse(
-        session_id=session.id,
-        total=session.total_questions,
-        direction=session.direction,
-        questions=questions_out,
+@router.post("/due", response_model=schemas.QuizStartResponse, responses=COMPACT_RESPONSES)
+def start_due_quiz(
+    payload: schemas.QuizDueStartRequest,
+    accept: str | None = Header(default=None),
+    db: Session = Depends(get_db),
+    current_user: models.Profile = Depends(require_current_user),
+):
+    """Start an exam over the most overdue words, whichever groups they are in."""
+
+    response_format = negotiate_format(accept)
+    words = [word for word, _ in select_due_words(db, current_user.id, payload.limit)]
+    if not words:
+        raise HTTPException(400, "복습할 단어가 없습니다.")
+    if payload.random:
+        random.shuffle(words)
+
+    session = models.QuizSession(
+        profile_id=current_user.id,
+        group_id=words[0].group_id,
+        direction=payload.direction,
+        mode="exam",
+        randomize=payload.random,
+        limit_count=payload.limit,
+        total_questions=len(words),
+        is_retry=False,
     )
+    return _open_session(db, session, words, response_format)
 
 
-@router.post("/{session_id}/answer", response_model=schemas.QuizProgress)
+@router.post("/{session_id}/answer", response_model=schemas.QuizProgressDelta)
 def submit_answer(
     session_id: int,
     payload: schemas.QuizAnswerSubmit,
@@ -205,51 +546,173 @@ def submit_answer(
     if not session:
         raise HTTPException(404, "시험 세션을 찾을 수 없습니다.")
 
-    question = (
-        db.query(models.QuizQuestion)
-        .filter(models.QuizQuestion.id == payload.question_id)
-        .one_or_none()
-    )
-    if not question or question.session_id != session_id:
-        raise HTTPException(404, "해당 세션에서 문항을 찾을 수 없습니다.")
+    progress = _apply_answers(db, session, [payload])
+    db.commit()
 
-    previously_answered = question.is_correct is not None
-    previous_correct = question.is_correct if previously_answered else False
+    return progress
 
-    question.user_answer = payload.answer
-    question.is_correct = payload.is_correct
 
-    should_increment_star = (
-        session.mode == "exam"
-        and not session.is_retry
-        and not previously_answered
-        and not payload.is_correct
-    )
+@router.post("/{session_id}/answers", response_model=schemas.QuizProgressDelta)
+def submit_answers(
+    session_id: int,
+    payload: schemas.QuizAnswerBatch,
+    db: Session = Depends(get_db),
+    current_user: models.Profile = Depends(require_current_user),
+):
+    """Record several answers at once, in the order they were given.
 
-    if not previously_answered:
-        session.answered_questions += 1
-        if payload.is_correct:
-            session.correct_questions += 1
-    else:
-        if previous_correct and not payload.is_correct:
-            session.correct_questions -= 1
-        elif (not previous_correct) and payload.is_correct:
-            session.correct_questions += 1
-
-    if should_increment_star:
-        word = question.word
-        if word is not None:
-            word.star = min(MAX_STAR_SCORE, (word.star or 0) + 1)
-
-    total_questions = session.total_questions or 0
-    session.is_completed = (
-        total_questions > 0 and session.answered_questions >= total_questions
+    The result is the same as posting each one to ``/answer`` in turn, but
+    all of them are applied in a single transaction.
+    """
+
+    session = (
+        db.query(models.QuizSession)
+        .filter(
+            models.QuizSession.id == session_id,
+            models.QuizSession.profile_id == current_user.id,
+        )
+        .one_or_none()
     )
+    if not session:
+        raise HTTPException(404, "시험 세션을 찾을 수 없습니다.")
 
+    progress = _apply_answers(db, session, payload.answers)
     db.commit()
-    db.refresh(session)
 
-    return _quiz_progress(session, db)
+    return progress
+
+
+def _load_socket_session(session_id: int, user_id: int | None) -> models.QuizSession | None:
+    """Return the detached session for the socket's user, or ``None``."""
+
+    if not user_id:
+        return None
+    db = SessionLocal()
+    try:
+        return (
+            db.query(models.QuizSession)
+            .filter(
+                models.QuizSession.id == session_id,
+                models.QuizSession.profile_id == user_id,
+            )
+            .one_or_none()
+        )
+    finally:
+        db.close()
+
+
+def _record_socket_answers(
+    session: models.QuizSession, answers: list[schemas.QuizAnswerSubmit]
+) -> dict:
+    """Apply one window of socket answers and build the frame to send back."""
+
+    question_ids = list(dict.fromkeys(answer.question_id for answer in answers))
+    db = SessionLocal()
+    try:
+        progress = _apply_answers(db, session, answers)
+        db.commit()
+    except HTTPException as exc:
+        return {
+            "type": "error",
+            "detail": exc.detail,
+            "count": len(answers),
+            "question_ids": question_ids,
+        }
+    finally:
+        db.close()
+    return {
+        "type": "progress",
+        "count": len(answers),
+        "question_ids": question_ids,
+        **progress.model_dump(),
+    }
+
+
+def _same_origin(websocket: WebSocket) -> bool:
+    """Whether the handshake comes from a page served by this host.
+
+    Browsers attach the session cookie to cross-site WebSocket handshakes too,
+    so a page elsewhere could otherwise answer on the user's behalf. Clients
+    that send no ``Origin`` are not browsers and are let through.
+    """
+
+    origin = websocket.headers.get("origin")
+    if origin is None:
+        return True
+    return urlsplit(origin).netloc == websocket.headers.get("host")
+
+
+@router.websocket("/{session_id}/ws")
+async def exam_socket(websocket: WebSocket, session_id: int):
+    """Live exam channel, authenticated once from the session cookie.
+
+    Clients send ``{"type": "answer", "question_id", "answer", "is_correct"}``
+    frames and may send ``{"type": "flush"}`` to write queued answers at once.
+    Answers are applied with the rules of ``/answer`` in batches of
+    ``SOCKET_BATCH_SECONDS``; each batch is acknowledged with a ``progress``
+    frame (a :class:`schemas.QuizProgressDelta` plus the ``count`` of answers
+    and the ``question_ids`` it covers) or an ``error`` frame, after which the
+    client can resend those answers over HTTP. Resending is safe because an
+    answer that is already recorded changes nothing. Answers still queued when
+    the socket closes are written.
+    """
+
+    if not _same_origin(websocket):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    user_id = websocket.session.get("user_id")
+    session = await asyncio.to_thread(_load_socket_session, session_id, user_id)
+    if session is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await websocket.accept()
+
+    frames: asyncio.Queue = asyncio.Queue()
+
+    async def read_frames() -> None:
+        try:
+            while True:
+                await frames.put(await websocket.receive_text())
+        except (WebSocketDisconnect, RuntimeError):
+            await frames.put(None)
+
+    loop = asyncio.get_running_loop()
+    reader = asyncio.create_task(read_frames())
+    pending: list[schemas.QuizAnswerSubmit] = []
+    deadline: float | None = None
+    try:
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - loop.time())
+            try:
+                text = await asyncio.wait_for(frames.get(), timeout)
+            except asyncio.TimeoutError:
+                text = '{"type": "flush"}'
+            if text is None:
+                break
+            try:
+                frame = json.loads(text)
+                if frame.get("type", "answer") == "answer":
+                    pending.append(schemas.QuizAnswerSubmit.model_validate(frame))
+                    deadline = deadline or loop.time() + SOCKET_BATCH_SECONDS
+                elif frame.get("type") != "flush":
+                    raise ValueError(frame.get("type"))
+            except (ValueError, AttributeError, ValidationError):
+                await websocket.send_json({"type": "error", "detail": "잘못된 메시지입니다."})
+                continue
+            if pending and (frame.get("type") == "flush" or len(pending) >= SOCKET_BATCH_MAX):
+                batch, pending, deadline = pending, [], None
+                await websocket.send_json(
+                    await asyncio.to_thread(_record_socket_answers, session, batch)
+                )
+    except WebSocketDisconnect:
+        pass
+    finally:
+        reader.cancel()
+        if pending:
+            # Shielded so a cancelled handler still waits for the answers to
+            # be written, off the event loop.
+            with anyio.CancelScope(shield=True):
+                await run_in_threadpool(_record_socket_answers, session, pending)
 
 
 @router.get("/{session_id}/progress", response_model=schemas.QuizProgress)
@@ -302,9 +765,12 @@ def retry_incorrect(
     randomize = session.randomize if payload is None or payload.random is None else payload.random
     word_ids = [q.word_id for q in questions]
 
-    words_query = db.query(models.Word).filter(models.Word.id.in_(word_ids))
-    words = words_query.all()
-    word_map = {w.id: w for w in words}
+    word_map = {
+        word.id: word
+        for word in db.query(
+            models.Word.id, models.Word.group_id, models.Word.star, models.Word.reading
+        ).filter(models.Word.id.in_(word_ids))
+    }
 
     ordered_questions = list(questions)
     if randomize:
@@ -326,42 +792,32 @@ def retry_incorrect(
     )
     db.add(new_session)
     db.flush()
-
-    quiz_questions = []
-    for idx, original_question in enumerate(ordered_questions, start=1):
-        word = word_map[original_question.word_id]
-        question = models.QuizQuestion(
-            session_id=new_session.id,
-            word_id=word.id,
-            position=idx,
-            prompt_text=original_question.prompt_text,
-            answer_text=original_question.answer_text,
-        )
-        db.add(question)
-        db.flush()
-        quiz_questions.append((question, word))
-
+    new_session_id = new_session.id
+    direction = new_session.direction
+
+    # Plain tuples, so nothing reloads the expired ORM objects after commit.
+    retried = [(q.word_id, q.prompt_text, q.answer_text) for q in ordered_questions]
+    question_ids = _insert_questions(db, new_session_id, retried)
+    _insert_session_groups(
+        db, new_session_id, [word_map[word_id].group_id for word_id, _, _ in retried]
+    )
     db.commit()
 
-    questions_out = [
-        schemas.QuizQuestionOut(
-            id=q.id,
-            word_id=q.word_id,
-            position=q.position,
-            prompt=q.prompt_text,
-            answer=q.answer_text,
-            star=word.star,
-            reading=word.reading,
+    rows = [
+        (
+            question_id,
+            word_id,
+            position,
+            prompt,
+            answer,
+            word_map[word_id].star,
+            word_map[word_id].reading,
+        )
+        for position, (question_id, (word_id, prompt, answer)) in enumerate(
+            zip(question_ids, retried), start=1
         )
-        for q, word in quiz_questions
     ]
-
-    return schemas.QuizStartResponse(
-        session_id=new_session.id,
-        total=new_session.total_questions,
-        direction=new_session.direction,
-        questions=questions_out,
-    )
+    return _quiz_start_response(new_session_id, direction, rows)
 
 
 @router.delete("/{session_id}", status_code=204)
@@ -408,19 +864,19 @@ def list_history(
 
     group_rows = (
         db.query(
-            models.QuizQuestion.session_id,
+            models.QuizSessionGroup.session_id,
             models.Group.id.label("group_id"),
             models.Group.name.label("group_name"),
             models.Folder.id.label("folder_id"),
             models.Folder.name.label("folder_name"),
         )
-        .join(models.Word, models.Word.id == models.QuizQuestion.word_id)
-        .join(models.Group, models.Group.id == models.Word.group_id)
+        .join(models.Group, models.Group.id == models.QuizSessionGroup.group_id)
         .join(models.Folder, models.Folder.id == models.Group.folder_id)
         .filter(
-            models.QuizQuestion.session_id.in_(session_ids),
+            models.QuizSessionGroup.session_id.in_(session_ids),
             models.Group.profile_id == current_user.id,
         )
+        .order_by(models.QuizSessionGroup.session_id, models.QuizSessionGroup.position)
         .all()
     )
 
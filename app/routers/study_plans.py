@@ -110,13 +110,12 @@ def list_study_plans(
 
     group_ids_by_session: dict[int, set[int]] = {}
     if session_ids:
-        question_rows = (
-            db.query(models.QuizQuestion.session_id, models.Word.group_id)
-            .join(models.Word, models.Word.id == models.QuizQuestion.word_id)
-            .filter(models.QuizQuestion.session_id.in_(session_ids))
+        link_rows = (
+            db.query(models.QuizSessionGroup.session_id, models.QuizSessionGroup.group_id)
+            .filter(models.QuizSessionGroup.session_id.in_(session_ids))
             .all()
         )
-        for session_id, group_id in question_rows:
+        for session_id, group_id in link_rows:
             if group_id is None or group_id not in group_ids:
                 continue
             targets = group_ids_by_session.setdefault(session_id, set())
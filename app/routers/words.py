@@ -1,15 +1,58 @@
-from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, Query
+from typing import Literal
+from urllib.parse import quote
+
+from fastapi import APIRouter, Depends, UploadFile, File, Form, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from database import get_db
 import models, schemas
 import pandas as pd
-from io import BytesIO, StringIO
-import math
-from collections import defaultdict
+from io import BytesIO
+from utils import word_search
+from utils.anki_import import AnkiCollection, AnkiImportError, iter_anki_frames
 from utils.auth import require_current_user
+from utils.group_counters import adjust_group_counters, word_count_changes
+from utils.response_formats import (
+    COMPACT_RESPONSES,
+    MSGPACK_MEDIA_TYPE,
+    columnar,
+    negotiate_format,
+    render_compact,
+)
+from utils.table_reader import (
+    STRUCTURED_COLUMN_ALIASES,
+    canonical_column,
+    canonicalize_columns,
+    read_delimited,
+    read_xlsx,
+)
+from utils.word_delete import delete_words, owned_word_ids
+from utils.word_readings import fill_hanja_readings
+from utils.word_stats import sync_word_stat_groups
+from utils.word_transfer import apply_transfer, plan_transfer
+from utils.word_export import (
+    EXPORT_MEDIA_TYPES,
+    EXPORT_WRITERS,
+    export_statement,
+    iter_export_batches,
+)
+from utils.word_import import (
+    apply_group_import,
+    apply_structured_import,
+    normalize_cell,
+    normalize_group_frame,
+    normalize_structured_frame,
+    plan_group_import,
+    plan_structured_import,
+    preview_group_import,
+    preview_structured_import,
+)
 
 router = APIRouter()
 
+WORD_OUT_COLUMNS = tuple(schemas.WordOut.model_fields)
+
 @router.post("", response_model=dict)
 def create_word(
     payload: schemas.WordCreate,
@@ -29,18 +72,28 @@ def create_word(
 
     w = models.Word(**payload.model_dump())
     db.add(w)
+    db.flush()
+    adjust_group_counters(db, word_count_changes(added=[(w.group_id, w.star)]))
     db.commit()
     db.refresh(w)
     return {"id": w.id}
 
-@router.get("", response_model=list[schemas.WordOut])
+@router.get(
+    "",
+    response_model=list[schemas.WordOut],
+    responses=COMPACT_RESPONSES,
+)
 def list_words(
     group_id: int,
     min_star: int | None = Query(default=None, ge=0, le=schemas.MAX_STAR_RATING),
     star_values: list[int] | None = Query(default=None),
+    accept: str | None = Header(default=None),
     db: Session = Depends(get_db),
     current_user: models.Profile = Depends(require_current_user),
 ):
+    """List a group's words; see :mod:`utils.response_formats` for compact forms."""
+
+    response_format = negotiate_format(accept)
     q = (
         db.query(models.Word)
         .join(models.Group, models.Group.id == models.Word.group_id)
@@ -53,10 +106,120 @@ def list_words(
         q = q.filter(models.Word.star >= min_star)
     if star_values:
         q = q.filter(models.Word.star.in_(star_values))
-    rows = q.order_by(models.Word.id).all()
+    q = q.order_by(models.Word.id)
+    if response_format != "json":
+        columns = [getattr(models.Word, name) for name in WORD_OUT_COLUMNS]
+        return render_compact(
+            columnar(WORD_OUT_COLUMNS, q.with_entities(*columns).all()), response_format
+        )
+    rows = q.all()
     return rows
 
 
+@router.get("/search", response_model=schemas.WordSearchResponse)
+def search_words(
+    q: str = Query(..., min_length=1, max_length=200, description="검색어"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    mode: Literal["text", "hangul"] = Query("text"),
+    db: Session = Depends(get_db),
+    current_user: models.Profile = Depends(require_current_user),
+):
+    """Search term, meaning, reading, example and memo across all groups.
+
+    ``mode=hangul`` instead prefix-matches terms and meanings by initial
+    consonants ("ㅅㄱ" finds 사과) or by a partially typed syllable.
+    """
+
+    query = q.strip()
+    if not query:
+        raise HTTPException(400, "검색어를 입력하세요.")
+
+    search = word_search.search_words_hangul if mode == "hangul" else word_search.search_words
+    rows, has_more = search(db, current_user.id, query, limit=limit, offset=offset)
+    return schemas.WordSearchResponse(
+        query=query,
+        offset=offset,
+        limit=limit,
+        has_more=has_more,
+        items=[schemas.WordSearchHit.model_validate(row._mapping) for row in rows],
+    )
+
+
+@router.get("/export", response_class=StreamingResponse)
+def export_words(
+    export_format: Literal["csv", "ndjson", "xlsx", "msgpack"] | None = Query(
+        None, alias="format"
+    ),
+    group_id: int | None = None,
+    folder_id: int | None = None,
+    accept: str | None = Header(default=None),
+    db: Session = Depends(get_db),
+    current_user: models.Profile = Depends(require_current_user),
+):
+    """Stream the words of a group, a folder or the whole account.
+
+    Without ``format`` the file type follows the ``Accept`` header, falling
+    back to CSV.
+    """
+
+    if export_format is None:
+        export_format = _export_format_from_accept(accept)
+    elif export_format == "msgpack":
+        negotiate_format(MSGPACK_MEDIA_TYPE)
+
+    download_base = "words"
+    if group_id is not None:
+        group = (
+            db.query(models.Group)
+            .filter(
+                models.Group.id == group_id,
+                models.Group.profile_id == current_user.id,
+            )
+            .one_or_none()
+        )
+        if not group:
+            raise HTTPException(404, "그룹을 찾을 수 없습니다.")
+        download_base = group.name
+    elif folder_id is not None:
+        folder = (
+            db.query(models.Folder)
+            .filter(
+                models.Folder.id == folder_id,
+                models.Folder.profile_id == current_user.id,
+            )
+            .one_or_none()
+        )
+        if not folder:
+            raise HTTPException(404, "폴더를 찾을 수 없습니다.")
+        download_base = folder.name
+
+    statement = export_statement(current_user.id, group_id=group_id, folder_id=folder_id)
+    writer = EXPORT_WRITERS[export_format]
+    response = StreamingResponse(
+        writer(iter_export_batches(statement)),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+    )
+    quoted_name = quote(f"{download_base}.{export_format}")
+    response.headers[
+        "Content-Disposition"
+    ] = f"attachment; filename=\"words.{export_format}\"; filename*=UTF-8''{quoted_name}"
+    return response
+
+
+def _export_format_from_accept(accept: str | None) -> str:
+    formats_by_media_type = {
+        media_type.split(";")[0]: name for name, media_type in EXPORT_MEDIA_TYPES.items()
+    }
+    for media_type in (part.split(";")[0].strip().lower() for part in (accept or "").split(",")):
+        export_format = formats_by_media_type.get(media_type)
+        if export_format == "msgpack":
+            negotiate_format(media_type)
+        if export_format:
+            return export_format
+    return "csv"
+
+
 @router.patch("/{word_id}", response_model=schemas.WordOut)
 def update_word(
     word_id: int,
@@ -71,10 +234,14 @@ def update_word(
             models.Word.id == word_id,
             models.Group.profile_id == current_user.id,
         )
+        # Locked so the counters move from the group and star being replaced.
+        .with_for_update(of=models.Word)
         .one_or_none()
     )
     if not word:
         raise HTTPException(404, "단어를 찾을 수 없습니다.")
+    previous_group_id = word.group_id
+    previous_key = (word.group_id, word.star)
     data = payload.model_dump(exclude_unset=True)
     if "group_id" in data and data["group_id"] is not None:
         group = (
@@ -90,77 +257,141 @@ def update_word(
         word.group_id = data.pop("group_id")
     for key, value in data.items():
         setattr(word, key, value)
-    db.commit()
+    try:
+        db.flush()
+        adjust_group_counters(
+            db,
+            word_count_changes(removed=[previous_key], added=[(word.group_id, word.star)]),
+        )
+        if word.group_id != previous_group_id:
+            sync_word_stat_groups(db, [word.id])
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(400, "같은 언어의 단어가 이미 그룹에 있습니다.")
     db.refresh(word)
     return word
 
 
-@router.delete("/{word_id}", response_model=dict)
-def delete_word(
-    word_id: int,
+@router.post("/transfer", response_model=schemas.WordTransferResult)
+def transfer_words(
+    payload: schemas.WordTransferRequest,
     db: Session = Depends(get_db),
     current_user: models.Profile = Depends(require_current_user),
 ):
-    word = (
-        db.query(models.Word)
-        .join(models.Group, models.Group.id == models.Word.group_id)
+    """Move or copy many words into one group with a conflict policy."""
+
+    target_group = (
+        db.query(models.Group)
         .filter(
-            models.Word.id == word_id,
+            models.Group.id == payload.target_group_id,
             models.Group.profile_id == current_user.id,
         )
         .one_or_none()
     )
-    if not word:
-        raise HTTPException(404, "단어를 찾을 수 없습니다.")
+    if not target_group:
+        raise HTTPException(404, "대상 그룹을 찾을 수 없습니다.")
 
-    related_questions = (
-        db.query(models.QuizQuestion)
-        .filter(models.QuizQuestion.word_id == word_id)
-        .all()
+    word_ids = owned_word_ids(db, current_user.id, payload.word_ids)
+    plan = plan_transfer(
+        db, word_ids, target_group.id, payload.action, payload.on_conflict
+    )
+    apply_transfer(db, plan, payload.action)
+    db.commit()
+    return schemas.WordTransferResult(
+        action=payload.action,
+        target_group_id=payload.target_group_id,
+        transferred=len(plan.plain_ids),
+        renamed=len(plan.renames),
+        overwritten=len(plan.overwrites),
+        skipped=len(plan.skipped_ids),
+        unchanged=len(plan.unchanged_ids),
+        not_found_ids=sorted(set(payload.word_ids) - set(word_ids)),
     )
 
-    if related_questions:
-        session_adjustments: dict[int, dict[str, int]] = defaultdict(
-            lambda: {"total": 0, "answered": 0, "correct": 0}
-        )
 
-        for question in related_questions:
-            adjustments = session_adjustments[question.session_id]
-            adjustments["total"] += 1
-            if question.is_correct is not None:
-                adjustments["answered"] += 1
-                if question.is_correct:
-                    adjustments["correct"] += 1
-            db.delete(question)
-
-        if session_adjustments:
-            sessions = (
-                db.query(models.QuizSession)
-                .filter(models.QuizSession.id.in_(session_adjustments.keys()))
-                .all()
+@router.post("/fill-readings", response_model=schemas.WordReadingFillResult)
+def fill_readings(
+    payload: schemas.WordReadingFillRequest,
+    db: Session = Depends(get_db),
+    current_user: models.Profile = Depends(require_current_user),
+):
+    """Fill empty readings of Hanja words in a folder or group."""
+
+    groups = db.query(models.Group.id).filter(models.Group.profile_id == current_user.id)
+    if payload.group_id is not None:
+        groups = groups.filter(models.Group.id == payload.group_id)
+    else:
+        folder = (
+            db.query(models.Folder.id)
+            .filter(
+                models.Folder.id == payload.folder_id,
+                models.Folder.profile_id == current_user.id,
             )
+            .one_or_none()
+        )
+        if not folder:
+            raise HTTPException(404, "폴더를 찾을 수 없습니다.")
+        groups = groups.filter(models.Group.folder_id == payload.folder_id)
+    group_ids = [group_id for (group_id,) in groups]
+    if payload.group_id is not None and not group_ids:
+        raise HTTPException(404, "그룹을 찾을 수 없습니다.")
 
-            for session in sessions:
-                adjustments = session_adjustments[session.id]
-                session.total_questions = max(
-                    0, session.total_questions - adjustments["total"]
-                )
-                session.answered_questions = max(
-                    0, session.answered_questions - adjustments["answered"]
-                )
-                session.correct_questions = max(
-                    0, session.correct_questions - adjustments["correct"]
-                )
+    result = fill_hanja_readings(
+        db,
+        group_ids,
+        include_ambiguous=payload.include_ambiguous,
+        dry_run=payload.dry_run,
+    )
+    if payload.dry_run:
+        db.rollback()
+    else:
+        db.commit()
+    return schemas.WordReadingFillResult(
+        filled=result.filled,
+        skipped=result.skipped,
+        ambiguous=result.ambiguous,
+        dry_run=payload.dry_run,
+    )
 
-    db.delete(word)
+
+@router.delete("/{word_id}", response_model=dict)
+def delete_word(
+    word_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.Profile = Depends(require_current_user),
+):
+    word_ids = owned_word_ids(db, current_user.id, [word_id])
+    if not word_ids:
+        raise HTTPException(404, "단어를 찾을 수 없습니다.")
+
+    delete_words(db, word_ids)
     db.commit()
     return {"status": "deleted", "id": word_id}
 
+
+@router.post("/bulk-delete", response_model=schemas.WordBulkDeleteResult)
+def bulk_delete_words(
+    payload: schemas.WordBulkDelete,
+    db: Session = Depends(get_db),
+    current_user: models.Profile = Depends(require_current_user),
+):
+    word_ids = owned_word_ids(db, current_user.id, payload.word_ids)
+    removed_questions = delete_words(db, word_ids)
+    db.commit()
+    deleted = set(word_ids)
+    return schemas.WordBulkDeleteResult(
+        deleted_ids=word_ids,
+        not_found_ids=sorted(set(payload.word_ids) - deleted),
+        removed_questions=removed_questions,
+    )
+
 @router.post("/import", response_model=dict)
 async def import_words(
     group_id: int = Form(...),
     file: UploadFile | None = File(None),
     clipboard: str | None = Form(None),
+    dry_run: bool = Form(False),
     db: Session = Depends(get_db),
     current_user: models.Profile = Depends(require_current_user),
 ):
@@ -178,22 +409,18 @@ async def import_words(
     if not file and not clipboard:
         raise HTTPException(400, "file 또는 clipboard 중 하나를 제공하세요.")
 
-    if file:
-        content = await file.read()
-        name = (file.filename or "").lower()
-        if name.endswith(".xlsx"):
-            df = pd.read_excel(BytesIO(content))
+    try:
+        if file:
+            content = await file.read()
+            name = (file.filename or "").lower()
+            if name.endswith(".xlsx"):
+                df = read_xlsx(content)
+            else:
+                df = read_delimited(content)
         else:
-            try:
-                df = pd.read_csv(StringIO(content.decode("utf-8")), sep=None, engine="python")
-            except Exception:
-                df = pd.read_csv(StringIO(content.decode("utf-8")), sep=",")
-    else:
-        s = clipboard.strip()
-        try:
-            df = pd.read_csv(StringIO(s), sep=None, engine="python")
-        except Exception:
-            df = pd.read_csv(StringIO(s), sep="\t")
+            df = read_delimited(clipboard.strip().encode("utf-8"), default_sep="\t")
+    except Exception as exc:  # pragma: no cover - 사용자 입력 오류 처리
+        raise HTTPException(400, f"파일을 읽을 수 없습니다: {exc}")
 
     required = {"language","term","meaning"}
     cols_lower = [c.lower() for c in df.columns]
@@ -202,60 +429,24 @@ async def import_words(
     if missing:
         raise HTTPException(400, f"필수 컬럼 누락: {missing}. 필요한 컬럼: language, term, meaning")
 
-    df["group_id"] = group_id
-    inserted = 0
-    updated = 0
-
-    def parse_star(value):
-        if value is None:
-            return None
-        if isinstance(value, float) and math.isnan(value):
-            return None
-        try:
-            ivalue = int(value)
-        except (TypeError, ValueError):
-            return None
-        return max(0, min(schemas.MAX_STAR_RATING, ivalue))
-
-    for row in df.to_dict(orient="records"):
-        obj = db.query(models.Word).filter(
-            models.Word.group_id==group_id,
-            models.Word.language==row["language"],
-            models.Word.term==row["term"]
-        ).one_or_none()
-
-        star_value = parse_star(row.get("star"))
-
-        if obj:
-            for k in ["meaning","reading","pos","example","memo"]:
-                if k in row:
-                    setattr(obj, k, row.get(k))
-            if star_value is not None:
-                obj.star = star_value
-            updated += 1
-        else:
-            obj = models.Word(
-                group_id=group_id,
-                language=row["language"],
-                term=row["term"],
-                meaning=row["meaning"],
-                reading=row.get("reading"),
-                pos=row.get("pos"),
-                example=row.get("example"),
-                memo=row.get("memo"),
-                star=star_value or 0,
-            )
-            db.add(obj)
-            inserted += 1
+    plan = plan_group_import(db, group_id, normalize_group_frame(df))
+    if dry_run:
+        folder_name = group.folder.name if group.folder else ""
+        return preview_group_import(plan, folder_name, group.name).model_dump()
 
+    summary = apply_group_import(db, plan)
     db.commit()
-    return {"inserted": inserted, "updated": updated}
+    return summary
 
 
-@router.post("/import-structured", response_model=schemas.WordImportStructuredSummary)
+@router.post(
+    "/import-structured",
+    response_model=schemas.WordImportStructuredSummary | schemas.WordImportPreview,
+)
 async def import_with_structure(
     file: UploadFile = File(...),
     default_language: str = Form("기본"),
+    dry_run: bool = Form(False),
     db: Session = Depends(get_db),
     current_user: models.Profile = Depends(require_current_user),
 ):
@@ -266,69 +457,18 @@ async def import_with_structure(
     name = (file.filename or "").lower()
     def read_table(*, header: int | None = 0):
         try:
-            if name.endswith(".xlsx") or name.endswith(".xls"):
-                return pd.read_excel(BytesIO(content), header=header)
-            return pd.read_csv(StringIO(content.decode("utf-8")), header=header)
+            if name.endswith(".xlsx"):
+                return read_xlsx(content, header=header)
+            if name.endswith(".xls"):
+                return pd.read_excel(BytesIO(content), header=header, keep_default_na=False)
+            if name.endswith(".ndjson") or name.endswith(".jsonl"):
+                return pd.read_json(BytesIO(content), lines=True, dtype=False)
+            return read_delimited(content, header=header)
         except Exception as exc:  # pragma: no cover - 사용자 입력 오류 처리
             raise HTTPException(400, f"파일을 읽을 수 없습니다: {exc}")
 
-    def canonicalize(value: str | int | float | None) -> str:
-        if value is None:
-            return ""
-        if isinstance(value, float) and math.isnan(value):
-            return ""
-        return str(value).strip().lower()
-
-    alias_map = {
-        "folder": {"folder", "폴더", "폴더명", "카테고리", "folder name", "folder명"},
-        "group": {
-            "group",
-            "그룹",
-            "그룹명",
-            "day",
-            "day1",
-            "day2",
-            "day3",
-            "단계",
-            "세트",
-            "unit",
-            "lesson",
-        },
-        "term": {
-            "term",
-            "word",
-            "단어",
-            "표제어",
-            "영단어",
-            "단어(영어)",
-            "단어(외국어)",
-        },
-        "meaning": {
-            "meaning",
-            "뜻",
-            "의미",
-            "해석",
-            "뜻(한국어)",
-            "뜻풀이",
-            "translation",
-        },
-    }
-
-    def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
-        normalized: list[str] = []
-        for col in df.columns:
-            key = canonicalize(col)
-            replaced = None
-            for target, aliases in alias_map.items():
-                if key == target or key in aliases:
-                    replaced = target
-                    break
-            normalized.append(replaced or key)
-        df.columns = normalized
-        return df
-
     def try_parse_dataframe() -> pd.DataFrame:
-        df_initial = normalize_columns(read_table())
+        df_initial = canonicalize_columns(read_table())
         required = {"folder", "group", "term", "meaning"}
         missing = required - set(df_initial.columns)
         if not missing:
@@ -339,13 +479,11 @@ async def import_with_structure(
         if df_no_header is None or df_no_header.empty:
             raise HTTPException(400, f"필수 컬럼 누락: {', '.join(sorted(missing))}")
 
-        first_row = [canonicalize(v) for v in df_no_header.iloc[0].tolist()]
+        first_row = [canonical_column(v) for v in df_no_header.iloc[0].tolist()]
         header_map: dict[int, str] = {}
         for idx, value in enumerate(first_row):
-            for target, aliases in alias_map.items():
-                if value == target or value in aliases:
-                    header_map[idx] = target
-                    break
+            if value in STRUCTURED_COLUMN_ALIASES:
+                header_map[idx] = value
 
         df_candidate = df_no_header.copy()
         drop_first_row = False
@@ -366,7 +504,7 @@ async def import_with_structure(
 
         if header_map:
             df_candidate = df_candidate.rename(columns=header_map)
-        df_candidate = normalize_columns(df_candidate)
+        df_candidate = canonicalize_columns(df_candidate)
 
         if drop_first_row:
             df_candidate = df_candidate.iloc[1:]
@@ -379,130 +517,65 @@ async def import_with_structure(
 
     df = try_parse_dataframe()
 
-    def normalize(value: str | int | float | bool | None) -> str:
-        if value is None:
-            return ""
-        if isinstance(value, float) and math.isnan(value):
-            return ""
-        return str(value).strip()
+    default_language_value = normalize_cell(default_language) or "기본"
 
-    def normalize_key(value: str | int | float | bool | None) -> str:
-        return normalize(value).lower()
+    frame = normalize_structured_frame(df, default_language_value)
+    plan = plan_structured_import(db, current_user.id, frame, default_language_value)
+    if dry_run:
+        return preview_structured_import(plan)
 
-    default_language_value = normalize(default_language) or "기본"
+    summary = apply_structured_import(db, plan)
 
-    folders = (
-        db.query(models.Folder)
-        .filter(models.Folder.profile_id == current_user.id)
-        .all()
-    )
-    folder_cache: dict[tuple[str, str], models.Folder] = {}
-    for folder in folders:
-        name_key = normalize_key(folder.name)
-        language_key = normalize_key(folder.default_language)
-        folder_cache[(name_key, language_key)] = folder
-        if not language_key:
-            folder_cache.setdefault((name_key, ""), folder)
-
-    group_cache: dict[tuple[int, str], models.Group] = {}
-    word_cache: defaultdict[int, set[tuple[str, str]]] = defaultdict(set)
-
-    inserted = 0
-    skipped = 0
-    folders_created = 0
-    groups_created = 0
-
-    for row in df.to_dict(orient="records"):
-        folder_name = normalize(row.get("folder"))
-        group_name = normalize(row.get("group"))
-        term = normalize(row.get("term"))
-        meaning = normalize(row.get("meaning"))
-        language = normalize(row.get("language")) or default_language_value
-
-        if not folder_name or not group_name or not term or not meaning:
-            skipped += 1
-            continue
-
-        name_key = normalize_key(folder_name)
-        language_key = normalize_key(default_language_value)
-        folder_key = (name_key, language_key)
-        folder = folder_cache.get(folder_key)
-        if not folder and language_key:
-            fallback_key = (name_key, "")
-            folder = folder_cache.get(fallback_key)
-            if folder and not normalize(folder.default_language):
-                folder.default_language = default_language_value
-                folder_cache[folder_key] = folder
+    db.commit()
+    return summary
 
-        if not folder:
-            folder = models.Folder(
-                name=folder_name,
-                profile_id=current_user.id,
-                default_language=default_language_value,
-            )
-            db.add(folder)
-            db.flush()
-            folder_cache[folder_key] = folder
-            if not language_key:
-                folder_cache[(name_key, "")] = folder
-            folders_created += 1
-        elif default_language_value and not normalize(folder.default_language):
-            folder.default_language = default_language_value
-            folder_cache[(name_key, language_key)] = folder
-
-        group_key = (folder.id, group_name.lower())
-        group = group_cache.get(group_key)
-        if not group:
-            group = (
-                db.query(models.Group)
-                .filter(
-                    models.Group.folder_id == folder.id,
-                    models.Group.name == group_name,
-                    models.Group.profile_id == current_user.id,
-                )
-                .one_or_none()
-            )
-            if not group:
-                group = models.Group(
-                    folder_id=folder.id,
-                    name=group_name,
-                    profile_id=current_user.id,
-                )
-                db.add(group)
-                db.flush()
-                groups_created += 1
-            group_cache[group_key] = group
-
-        if group.id not in word_cache:
-            existing = (
-                db.query(models.Word.language, models.Word.term)
-                .filter(models.Word.group_id == group.id)
-                .all()
-            )
-            word_cache[group.id] = {
-                (normalize(lang).lower(), normalize(term_).lower())
-                for lang, term_ in existing
-            }
 
-        word_key = (language.lower(), term.lower())
-        if word_key in word_cache[group.id]:
-            skipped += 1
-            continue
+@router.post("/import-anki", response_model=schemas.WordImportStructuredSummary)
+def import_anki_deck(
+    file: UploadFile = File(...),
+    default_language: str = Form("기본"),
+    term_field: str | None = Form(None),
+    meaning_field: str | None = Form(None),
+    reading_field: str | None = Form(None),
+    example_field: str | None = Form(None),
+    db: Session = Depends(get_db),
+    current_user: models.Profile = Depends(require_current_user),
+):
+    """Import an Anki ``.apkg``/``.colpkg`` deck; decks become folders and groups.
 
-        word = models.Word(
-            group_id=group.id,
-            language=language,
-            term=term,
-            meaning=meaning,
-        )
-        db.add(word)
-        word_cache[group.id].add(word_key)
-        inserted += 1
+    Note fields are matched to term/meaning/reading/example by name unless the
+    ``*_field`` overrides are given. Notes are read and written in chunks, so
+    a large deck never has to fit in memory at once.
+    """
 
-    db.commit()
-    return schemas.WordImportStructuredSummary(
-        inserted=inserted,
-        skipped=skipped,
-        folders_created=folders_created,
-        groups_created=groups_created,
+    if not file.filename:
+        raise HTTPException(400, "업로드할 파일을 선택하세요.")
+
+    default_language_value = normalize_cell(default_language) or "기본"
+    overrides = {
+        "term": term_field,
+        "meaning": meaning_field,
+        "reading": reading_field,
+        "example": example_field,
+    }
+    totals = schemas.WordImportStructuredSummary(
+        inserted=0, skipped=0, folders_created=0, groups_created=0
     )
+    try:
+        with AnkiCollection(file.file) as collection:
+            for chunk in iter_anki_frames(collection, default_language_value, overrides):
+                frame = normalize_structured_frame(chunk, default_language_value)
+                plan = plan_structured_import(
+                    db, current_user.id, frame, default_language_value
+                )
+                summary = apply_structured_import(db, plan)
+                totals.inserted += summary.inserted
+                totals.skipped += summary.skipped
+                totals.folders_created += summary.folders_created
+                totals.groups_created += summary.groups_created
+    except AnkiImportError as exc:
+        db.rollback()
+        raise HTTPException(400, str(exc))
+
+    db.commit()
+    return totals
@@ -0,0 +1,166 @@
+"""Multi-sheet workbook import jobs."""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+import shutil
+import tempfile
+from threading import Lock
+from typing import Literal
+from uuid import uuid4
+
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
+
+import models
+import schemas
+from database import SessionLocal
+from utils.auth import require_current_user
+from utils.table_reader import xlsx_sheet_names
+from utils.word_import import normalize_cell
+from utils.workbook_import import SheetProgress, import_workbook
+
+WORKBOOK_JOB_TTL = timedelta(hours=1)
+
+
+@dataclass
+class WorkbookImportJob:
+    """Represents an async import of every sheet in one workbook."""
+
+    id: str
+    profile_id: int
+    path: str
+    folder_name: str
+    default_language: str
+    sheets: list[SheetProgress]
+    status: Literal["pending", "processing", "completed", "failed"] = "pending"
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    completed_at: datetime | None = None
+    summary: schemas.WordImportStructuredSummary | None = None
+    message: str | None = None
+
+
+workbook_jobs: dict[str, WorkbookImportJob] = {}
+workbook_jobs_lock = Lock()
+
+
+def _cleanup_jobs() -> None:
+    cutoff = datetime.utcnow() - WORKBOOK_JOB_TTL
+    with workbook_jobs_lock:
+        expired = [
+            job_id
+            for job_id, job in workbook_jobs.items()
+            if job.completed_at and job.completed_at < cutoff
+        ]
+        for job_id in expired:
+            workbook_jobs.pop(job_id, None)
+
+
+def _process_workbook_job(job: WorkbookImportJob) -> None:
+    job.status = "processing"
+    db = SessionLocal()
+    try:
+        job.summary = import_workbook(
+            db,
+            job.profile_id,
+            job.path,
+            job.sheets,
+            folder_name=job.folder_name,
+            default_language=job.default_language,
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+        shutil.rmtree(Path(job.path).parent, ignore_errors=True)
+    imported = sum(sheet.status == "imported" for sheet in job.sheets)
+    job.message = f"시트 {len(job.sheets)}개 중 {imported}개를 가져왔습니다."
+    job.status = "completed"
+    job.completed_at = datetime.utcnow()
+
+
+async def _run_workbook_job(job: WorkbookImportJob) -> None:
+    try:
+        await asyncio.to_thread(_process_workbook_job, job)
+    except Exception as exc:  # pragma: no cover - defensive
+        job.status = "failed"
+        job.message = f"알 수 없는 오류가 발생했습니다: {exc}"
+        job.completed_at = datetime.utcnow()
+
+
+router = APIRouter()
+
+
+@router.post("", status_code=202, response_model=schemas.WorkbookImportCreated)
+async def start_workbook_import(
+    file: UploadFile = File(...),
+    folder_name: str | None = Form(None),
+    default_language: str = Form("기본"),
+    current_user: models.Profile = Depends(require_current_user),
+) -> schemas.WorkbookImportCreated:
+    """Import each sheet of an XLSX workbook as a group.
+
+    Rows go to ``folder_name`` (the file name by default) and a group named
+    after their sheet, unless the sheet has its own folder/group columns.
+    """
+
+    filename = file.filename or ""
+    if not filename.lower().endswith(".xlsx"):
+        raise HTTPException(400, "XLSX 파일을 업로드하세요.")
+
+    directory = tempfile.mkdtemp(prefix="workbook-")
+    path = str(Path(directory) / "workbook.xlsx")
+    with open(path, "wb") as spool:
+        shutil.copyfileobj(file.file, spool)
+    try:
+        names = xlsx_sheet_names(path)
+    except Exception as exc:
+        shutil.rmtree(directory, ignore_errors=True)
+        raise HTTPException(400, f"파일을 읽을 수 없습니다: {exc}")
+
+    _cleanup_jobs()
+    job = WorkbookImportJob(
+        id=uuid4().hex,
+        profile_id=current_user.id,
+        path=path,
+        folder_name=normalize_cell(folder_name) or Path(filename).stem or "Workbook",
+        default_language=normalize_cell(default_language) or "기본",
+        sheets=[SheetProgress(name=name) for name in names],
+    )
+    with workbook_jobs_lock:
+        workbook_jobs[job.id] = job
+    asyncio.create_task(_run_workbook_job(job))
+    return schemas.WorkbookImportCreated(
+        task_id=job.id,
+        status_url=f"/words/import-workbook/{job.id}",
+        sheet_count=len(names),
+    )
+
+
+@router.get("/{task_id}", response_model=schemas.WorkbookImportStatus)
+def get_workbook_import(
+    task_id: str,
+    current_user: models.Profile = Depends(require_current_user),
+) -> schemas.WorkbookImportStatus:
+    """Return the job status with the progress of every sheet."""
+
+    _cleanup_jobs()
+    with workbook_jobs_lock:
+        job = workbook_jobs.get(task_id)
+    if job is None or job.profile_id != current_user.id:
+        raise HTTPException(404, "요청한 작업을 찾을 수 없습니다.")
+    return schemas.WorkbookImportStatus(
+        task_id=job.id,
+        status=job.status,
+        message=job.message,
+        created_at=job.created_at,
+        completed_at=job.completed_at,
+        sheets_done=sum(
+            sheet.status in ("imported", "skipped", "failed") for sheet in job.sheets
+        ),
+        sheets=[schemas.WorkbookSheetProgressOut.model_validate(sheet) for sheet in job.sheets],
+        summary=job.summary,
+    )
@@ -130,6 +130,89 @@ class WordOut(BaseModel):
         from_attributes = True
 
 
+class WeakWordOut(WordOut):
+    attempts: int
+    correct: int
+    streak: int
+    error_rate: float
+    last_correct: Optional[bool] = None
+    last_answered_at: Optional[datetime] = None
+
+
+class DueWordOut(WordOut):
+    repetitions: int
+    interval_days: float
+    ease: float
+    next_due_at: datetime
+
+
+class WordBulkDelete(BaseModel):
+    word_ids: List[int] = Field(..., min_length=1, max_length=5000, description="삭제할 단어 ID 목록")
+
+
+class WordBulkDeleteResult(BaseModel):
+    status: Literal["deleted"] = "deleted"
+    deleted_ids: List[int] = Field(default_factory=list)
+    not_found_ids: List[int] = Field(default_factory=list)
+    removed_questions: int = 0
+
+
+class WordTransferRequest(BaseModel):
+    word_ids: List[int] = Field(..., min_length=1, max_length=5000, description="옮길 단어 ID 목록")
+    target_group_id: int = Field(..., description="대상 그룹 ID")
+    action: Literal["move", "copy"] = Field(default="move", description="이동 또는 복사")
+    on_conflict: Literal["skip", "overwrite", "rename"] = Field(
+        default="skip", description="대상 그룹에 같은 단어가 있을 때의 처리 방식"
+    )
+
+
+class WordTransferResult(BaseModel):
+    action: Literal["move", "copy"]
+    target_group_id: int
+    transferred: int = Field(0, description="충돌 없이 옮기거나 복사한 단어 수")
+    renamed: int = 0
+    overwritten: int = 0
+    skipped: int = 0
+    unchanged: int = Field(0, description="이미 대상 그룹에 있던 단어 수")
+    not_found_ids: List[int] = Field(default_factory=list)
+
+
+class WordReadingFillRequest(BaseModel):
+    folder_id: Optional[int] = Field(default=None, description="읽기를 채울 폴더 ID")
+    group_id: Optional[int] = Field(default=None, description="읽기를 채울 그룹 ID")
+    include_ambiguous: bool = Field(
+        default=False, description="여러 음을 가진 한자가 들어간 단어도 채울지 여부"
+    )
+    dry_run: bool = False
+
+    @root_validator(skip_on_failure=True)
+    def validate_scope(cls, values):
+        if (values.get("folder_id") is None) == (values.get("group_id") is None):
+            raise ValueError("folder_id와 group_id 중 하나만 지정하세요.")
+        return values
+
+
+class WordReadingFillResult(BaseModel):
+    filled: int = Field(0, description="읽기를 채운 (또는 채울) 단어 수")
+    skipped: int = Field(0, description="한자가 없어 건너뛴 단어 수")
+    ambiguous: int = Field(0, description="여러 음을 가진 한자가 들어간 단어 수")
+    dry_run: bool = False
+
+
+class WordSearchHit(WordOut):
+    folder_id: int
+    folder_name: str
+    group_name: str
+
+
+class WordSearchResponse(BaseModel):
+    query: str
+    offset: int
+    limit: int
+    has_more: bool
+    items: List[WordSearchHit] = Field(default_factory=list)
+
+
 class QuizStartRequest(BaseModel):
     folder_id: Optional[int] = Field(default=None, description="시험을 볼 폴더")
     group_id: Optional[int] = Field(default=None, description="기본 그룹 ID (호환성)")
@@ -138,7 +221,9 @@ class QuizStartRequest(BaseModel):
     limit: Optional[int] = Field(default=None, gt=0, description="출제할 단어 수")
     random: bool = Field(default=True, description="문항 순서를 랜덤으로 섞을지 여부")
     direction: Literal["term_to_meaning", "meaning_to_term"] = "term_to_meaning"
-    mode: Literal["study", "exam"] = "exam"
+    mode: Literal["study", "exam", "weak"] = Field(
+        default="exam", description="weak: 최근 정답률이 낮은 단어만 출제"
+    )
     min_star: Optional[int] = Field(default=None, ge=0, le=MAX_STAR_RATING, description="별 최소 점수")
     star_values: Optional[List[int]] = Field(default=None, description="선택한 별 값 목록")
     number_start: Optional[int] = Field(
@@ -213,6 +298,17 @@ class QuizStartRequest(BaseModel):
         return values
 
 
+class QuizDueList(BaseModel):
+    items: List[DueWordOut] = Field(default_factory=list)
+    has_more: bool = False
+
+
+class QuizDueStartRequest(BaseModel):
+    limit: int = Field(default=50, gt=0, le=500, description="출제할 복습 단어 수")
+    random: bool = Field(default=True, description="문항 순서를 랜덤으로 섞을지 여부")
+    direction: Literal["term_to_meaning", "meaning_to_term"] = "term_to_meaning"
+
+
 class QuizQuestionOut(BaseModel):
     id: int
     word_id: int
@@ -226,6 +322,62 @@ class QuizQuestionOut(BaseModel):
         from_attributes = True
 
 
+class DuplicateJobCreated(BaseModel):
+    task_id: str
+    status_url: str
+
+
+class DuplicateWordOut(BaseModel):
+    id: int
+    group_id: int
+    group_name: str
+    folder_name: str
+    language: str
+    term: str
+    meaning: str
+    star: int
+    question_count: int
+
+    class Config:
+        from_attributes = True
+
+
+class DuplicateClusterOut(BaseModel):
+    kind: Literal["exact", "near"]
+    language: str
+    similarity: float
+    suggested_canonical_id: int
+    words: List[DuplicateWordOut]
+
+    class Config:
+        from_attributes = True
+
+
+class DuplicateJobStatus(BaseModel):
+    task_id: str
+    status: Literal["pending", "processing", "completed", "failed"]
+    word_count: int
+    cluster_count: int
+    message: Optional[str] = None
+    created_at: datetime
+    completed_at: Optional[datetime]
+    offset: int
+    limit: int
+    has_more: bool
+    clusters: List[DuplicateClusterOut] = Field(default_factory=list)
+
+
+class WordMergeRequest(BaseModel):
+    canonical_id: int = Field(..., description="남길 단어 ID")
+    word_ids: List[int] = Field(..., min_length=1, max_length=1000, description="합칠 단어 ID 목록")
+
+
+class WordMergeResult(BaseModel):
+    canonical_id: int
+    merged_ids: List[int]
+    moved_questions: int
+
+
 class HanjaMeaningJobCreated(BaseModel):
     task_id: str
     status_url: str
@@ -306,6 +458,12 @@ class QuizAnswerSubmit(BaseModel):
     is_correct: bool
 
 
+class QuizAnswerBatch(BaseModel):
+    answers: List[QuizAnswerSubmit] = Field(
+        ..., min_length=1, max_length=5000, description="제출 순서대로 적용할 답안 목록"
+    )
+
+
 class WordImportStructuredSummary(BaseModel):
     inserted: int
     skipped: int
@@ -313,6 +471,66 @@ class WordImportStructuredSummary(BaseModel):
     groups_created: int
 
 
+class WorkbookImportCreated(BaseModel):
+    task_id: str
+    status_url: str
+    sheet_count: int
+
+
+class WorkbookSheetProgressOut(BaseModel):
+    name: str
+    status: Literal["pending", "parsing", "imported", "skipped", "failed"]
+    rows: int
+    inserted: int
+    skipped: int
+    message: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class WorkbookImportStatus(BaseModel):
+    task_id: str
+    status: Literal["pending", "processing", "completed", "failed"]
+    message: Optional[str] = None
+    created_at: datetime
+    completed_at: Optional[datetime]
+    sheets_done: int
+    sheets: List[WorkbookSheetProgressOut] = Field(default_factory=list)
+    summary: Optional[WordImportStructuredSummary] = None
+
+
+class WordImportConflict(BaseModel):
+    folder: Optional[str] = None
+    group: Optional[str] = None
+    language: str
+    term: str
+    meaning: str
+    reason: Literal["missing_field", "duplicate_in_file", "existing_word"]
+
+
+class WordImportGroupPreview(BaseModel):
+    folder_name: str
+    group_name: str
+    group_id: Optional[int] = Field(default=None, description="새로 만들 그룹이면 비어 있음")
+    inserted: int = 0
+    updated: int = 0
+    skipped: int = 0
+
+
+class WordImportPreview(BaseModel):
+    dry_run: bool = True
+    inserted: int
+    updated: int
+    skipped: int
+    folders_created: int = 0
+    groups_created: int = 0
+    groups: List[WordImportGroupPreview] = Field(default_factory=list)
+    conflicts: List[WordImportConflict] = Field(
+        default_factory=list, description="충돌하거나 건너뛸 행의 일부 예시"
+    )
+
+
 class QuizProgress(BaseModel):
     session_id: int
     total: int
@@ -322,6 +540,20 @@ class QuizProgress(BaseModel):
     incorrect_question_ids: List[int] = Field(default_factory=list)
 
 
+class QuizProgressDelta(BaseModel):
+    session_id: int
+    total: int
+    answered: int
+    correct: int
+    remaining: int
+    incorrect_added: List[int] = Field(
+        default_factory=list, description="이번 답안으로 오답이 된 문항 ID"
+    )
+    incorrect_removed: List[int] = Field(
+        default_factory=list, description="이번 답안으로 오답에서 빠진 문항 ID"
+    )
+
+
 class QuizRetryRequest(BaseModel):
     question_ids: Optional[List[int]] = Field(default=None, description="다시 풀고 싶은 문항 ID 목록")
     random: Optional[bool] = Field(default=None, description="랜덤 여부 덮어쓰기")
@@ -246,6 +246,7 @@ function hidePlaceholder() {
 }
 
 function resetQuizState() {
+  closeAnswerSocket();
   state.quiz.active = false;
   state.quiz.completed = false;
   state.quiz.sessionId = null;
@@ -410,6 +411,7 @@ async function startExam(payload) {
       body: JSON.stringify(payload),
     });
     state.quiz.sessionId = result.session_id;
+    connectAnswerSocket(result.session_id);
     state.quiz.questions = Array.isArray(result.questions) ? result.questions : [];
     state.quiz.index = 0;
     state.quiz.progress = {
@@ -445,6 +447,81 @@ function cloneProgress(progress) {
   };
 }
 
+// Answers go over the exam WebSocket when it is open; the server acknowledges
+// them in order, ``count`` answers per frame. Anything it rejects, or that is
+// still unacknowledged when the socket closes, is resent over HTTP, which is
+// safe because re-sending a recorded answer changes nothing.
+const answerSocket = { socket: null, waiting: [] };
+
+function connectAnswerSocket(sessionId) {
+  closeAnswerSocket();
+  if (!('WebSocket' in window)) return;
+  const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
+  const socket = new WebSocket(`${protocol}//${window.location.host}/quizzes/${sessionId}/ws`);
+  answerSocket.socket = socket;
+  socket.addEventListener('message', (event) => {
+    let frame;
+    try {
+      frame = JSON.parse(event.data);
+    } catch (err) {
+      return;
+    }
+    if (typeof frame.count !== 'number') return;
+    answerSocket.waiting.splice(0, frame.count).forEach((waiter) => {
+      if (frame.type === 'progress') {
+        waiter.resolve(frame);
+      } else {
+        waiter.fallback();
+      }
+    });
+  });
+  socket.addEventListener('close', () => {
+    if (answerSocket.socket !== socket) return;
+    answerSocket.socket = null;
+    answerSocket.waiting.splice(0).forEach((waiter) => waiter.fallback());
+  });
+}
+
+function closeAnswerSocket() {
+  const { socket } = answerSocket;
+  answerSocket.socket = null;
+  if (socket) socket.close();
+  answerSocket.waiting.splice(0).forEach((waiter) => waiter.fallback());
+}
+
+function sendAnswer(sessionId, payload, flush) {
+  const post = () => api(`/quizzes/${sessionId}/answer`, {
+    method: 'POST',
+    body: JSON.stringify(payload),
+  });
+  const { socket } = answerSocket;
+  if (!socket || socket.readyState !== WebSocket.OPEN) return post();
+  return new Promise((resolve, reject) => {
+    answerSocket.waiting.push({
+      resolve,
+      fallback: () => post().then(resolve, reject),
+    });
+    socket.send(JSON.stringify({ type: 'answer', ...payload }));
+    if (flush) socket.send(JSON.stringify({ type: 'flush' }));
+  });
+}
+
+function mergeProgressDelta(progress, delta) {
+  const removed = new Set(delta.incorrect_removed || []);
+  const incorrect = (progress?.incorrect_question_ids || []).filter((id) => !removed.has(id));
+  (delta.incorrect_added || []).forEach((id) => {
+    if (!incorrect.includes(id)) incorrect.push(id);
+  });
+  return {
+    session_id: delta.session_id,
+    total: delta.total,
+    answered: delta.answered,
+    correct: delta.correct,
+    remaining: delta.remaining,
+    incorrect_question_ids: incorrect,
+  };
+}
+
 function applyOptimisticProgress(
   questionId,
   isCorrect,
@@ -548,12 +625,9 @@ function submitResult(isCorrect) {
   };
 
   state.quiz.pendingSubmissions += 1;
-  api(`/quizzes/${state.quiz.sessionId}/answer`, {
-    method: 'POST',
-    body: JSON.stringify(payload),
-  })
-    .then((progress) => {
-      state.quiz.progress = progress;
+  sendAnswer(state.quiz.sessionId, payload, wasLastQuestion)
+    .then((delta) => {
+      state.quiz.progress = mergeProgressDelta(state.quiz.progress, delta);
       if (state.quiz.completed) {
         updateSummaryFromProgress();
       } else {
@@ -601,6 +675,7 @@ async function handleRetry() {
       body: JSON.stringify({}),
     });
     state.quiz.sessionId = result.session_id;
+    connectAnswerSocket(result.session_id);
     state.quiz.questions = Array.isArray(result.questions) ? result.questions : [];
     state.quiz.index = 0;
     state.quiz.progress = {
@@ -408,13 +408,13 @@ function buildStartPayload(formData) {
     group_ids: selectedIds,
     random: formData.get('random') !== null,
     direction: formData.get('direction') || 'term_to_meaning',
-    mode: 'exam',
+    mode: formData.get('weak') !== null ? 'weak' : 'exam',
   };
   const limit = formData.get('limit');
   if (limit) payload.limit = Number(limit);
   const minStar = formData.get('min_star');
   if (minStar) payload.min_star = Number(minStar);
-  if (selectedIds.length === 1) {
+  if (selectedIds.length === 1 && payload.mode !== 'weak') {
     const start = parseRangeForRequest(state.rangeStart);
     const end = parseRangeForRequest(state.rangeEnd);
     if (start != null) payload.number_start = start;
@@ -0,0 +1,247 @@
+"""Read Anki ``.apkg``/``.colpkg`` archives as structured word sheets.
+
+Both archive types are zip files holding an SQLite collection. The upload is
+spooled to disk, the collection is extracted next to it and notes are read
+through :mod:`sqlite3` ``ANKI_CHUNK_SIZE`` at a time. Each chunk becomes a
+``folder/group/language/term/meaning/reading/example`` frame that goes through
+the same bulk path as ``POST /words/import-structured``, so memory stays
+bounded by the chunk size rather than the deck size.
+
+Decks map to folders and groups: ``"일본어::JLPT N3::Day 1"`` becomes folder
+``일본어`` and group ``JLPT N3 / Day 1``; a top-level deck is both.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import html
+import json
+from pathlib import Path
+import re
+import shutil
+import sqlite3
+import tempfile
+from typing import BinaryIO, Iterator
+import zipfile
+
+import pandas as pd
+
+ANKI_CHUNK_SIZE = 5000
+# Guards against archives that expand to unreasonable sizes.
+MAX_COLLECTION_BYTES = 2 * 1024**3
+# Newest first; ``collection.anki21b`` is zstd-compressed and unsupported.
+COLLECTION_NAMES = ("collection.anki21", "collection.anki2")
+ANKI_ROLE_FIELDS = ("term", "meaning", "reading", "example")
+# Lower-cased note field names recognised for each role when not given explicitly.
+FIELD_NAME_HINTS = {
+    "term": ("front", "word", "term", "expression", "vocab", "단어", "표현", "単語", "表面"),
+    "meaning": ("back", "meaning", "definition", "뜻", "의미", "意味", "裏面"),
+    "reading": ("reading", "pronunciation", "kana", "furigana", "pinyin", "발음", "읽기", "読み"),
+    "example": ("example", "sentence", "예문", "例文"),
+}
+_FIELD_SEPARATOR = "\x1f"
+_TAG_RE = re.compile(r"<[^>]+>")
+_BREAK_RE = re.compile(r"<br\s*/?>|</div>|</p>", re.IGNORECASE)
+_SOUND_RE = re.compile(r"\[sound:[^\]]*\]")
+_SPACE_RE = re.compile(r"[ \t\r\f\v]+")
+
+
+class AnkiImportError(ValueError):
+    """Raised when an archive is not a readable Anki collection."""
+
+
+@dataclass
+class AnkiNoteType:
+    """Positions of the mapped roles within one note type's fields."""
+
+    name: str
+    positions: dict[str, int]
+
+
+def clean_field(value: str) -> str:
+    """Turn an Anki field's HTML into plain text."""
+
+    value = _SOUND_RE.sub("", value)
+    value = _BREAK_RE.sub("\n", value)
+    value = html.unescape(_TAG_RE.sub("", value))
+    lines = (_SPACE_RE.sub(" ", line).strip() for line in value.split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def split_deck_name(name: str) -> tuple[str, str]:
+    """Return ``(folder, group)`` for an Anki deck path."""
+
+    parts = [part.strip() for part in re.split(r"::|\x1f", name) if part.strip()]
+    if not parts:
+        return "Anki", "Anki"
+    if len(parts) == 1:
+        return parts[0], parts[0]
+    return parts[0], " / ".join(parts[1:])
+
+
+def _field_positions(field_names: list[str], overrides: dict[str, str | None]) -> dict[str, int]:
+    lowered = [name.strip().lower() for name in field_names]
+    positions: dict[str, int] = {}
+    for role in ANKI_ROLE_FIELDS:
+        wanted = overrides.get(role)
+        if wanted:
+            if wanted.strip().lower() in lowered:
+                positions[role] = lowered.index(wanted.strip().lower())
+            continue
+        for index, name in enumerate(lowered):
+            if index not in positions.values() and any(
+                hint in name for hint in FIELD_NAME_HINTS[role]
+            ):
+                positions[role] = index
+                break
+    # Fall back to the first two fields, as in Anki's Basic note type.
+    for role, index in (("term", 0), ("meaning", 1)):
+        if role not in positions and index < len(field_names):
+            if index not in positions.values():
+                positions[role] = index
+    return positions
+
+
+def _has_table(connection: sqlite3.Connection, name: str) -> bool:
+    return (
+        connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+        ).fetchone()
+        is not None
+    )
+
+
+def _read_note_types(
+    connection: sqlite3.Connection, overrides: dict[str, str | None]
+) -> dict[int, AnkiNoteType]:
+    fields: dict[int, tuple[str, list[str]]] = {}
+    if _has_table(connection, "notetypes"):
+        names = dict(connection.execute("SELECT id, name FROM notetypes"))
+        for note_type_id, _ord, field_name in connection.execute(
+            "SELECT ntid, ord, name FROM fields ORDER BY ntid, ord"
+        ):
+            fields.setdefault(note_type_id, (names.get(note_type_id, ""), []))[1].append(
+                field_name
+            )
+    if not fields:
+        (models_json,) = connection.execute("SELECT models FROM col").fetchone()
+        for note_type_id, model in json.loads(models_json or "{}").items():
+            ordered = sorted(model.get("flds", []), key=lambda item: item.get("ord", 0))
+            fields[int(note_type_id)] = (
+                model.get("name", ""),
+                [item.get("name", "") for item in ordered],
+            )
+    return {
+        note_type_id: AnkiNoteType(name, _field_positions(field_names, overrides))
+        for note_type_id, (name, field_names) in fields.items()
+    }
+
+
+def _read_decks(connection: sqlite3.Connection) -> dict[int, str]:
+    if _has_table(connection, "decks"):
+        decks = dict(connection.execute("SELECT id, name FROM decks"))
+        if decks:
+            return decks
+    (decks_json,) = connection.execute("SELECT decks FROM col").fetchone()
+    return {int(deck_id): deck.get("name", "") for deck_id, deck in json.loads(decks_json or "{}").items()}
+
+
+def iter_anki_frames(
+    connection: sqlite3.Connection,
+    language: str,
+    overrides: dict[str, str | None] | None = None,
+    chunk_size: int = ANKI_CHUNK_SIZE,
+) -> Iterator[pd.DataFrame]:
+    """Yield the notes of an open collection as structured frames."""
+
+    note_types = _read_note_types(connection, overrides or {})
+    decks = {deck_id: split_deck_name(name) for deck_id, name in _read_decks(connection).items()}
+    # A note's deck is the deck of its first card. SQLite takes the bare ``did``
+    # from the row holding ``MIN(ord)``; grouping once avoids a correlated
+    # lookup per note in collections without an index on ``cards.nid``.
+    cursor = connection.execute(
+        """
+        SELECT notes.mid, notes.flds, first_card.did
+        FROM notes
+        LEFT JOIN (
+            SELECT nid, did, MIN(ord) FROM cards GROUP BY nid
+        ) AS first_card ON first_card.nid = notes.id
+        ORDER BY notes.id
+        """
+    )
+    while rows := cursor.fetchmany(chunk_size):
+        records = []
+        for note_type_id, raw_fields, deck_id in rows:
+            note_type = note_types.get(note_type_id)
+            if note_type is None:
+                continue
+            values = raw_fields.split(_FIELD_SEPARATOR)
+            folder, group = decks.get(deck_id, ("Anki", "Anki"))
+            record = {"folder": folder, "group": group, "language": language}
+            for role in ANKI_ROLE_FIELDS:
+                index = note_type.positions.get(role)
+                record[role] = clean_field(values[index]) if index is not None and index < len(values) else ""
+            records.append(record)
+        if records:
+            yield pd.DataFrame.from_records(
+                records, columns=["folder", "group", "language", *ANKI_ROLE_FIELDS]
+            )
+
+
+class AnkiCollection:
+    """Context manager that spools an uploaded archive and opens its collection."""
+
+    def __init__(self, upload: BinaryIO) -> None:
+        self._upload = upload
+        self._directory: tempfile.TemporaryDirectory | None = None
+        self.connection: sqlite3.Connection | None = None
+
+    def __enter__(self) -> sqlite3.Connection:
+        self._directory = tempfile.TemporaryDirectory(prefix="anki-")
+        directory = Path(self._directory.name)
+        archive_path = directory / "deck.zip"
+        try:
+            with archive_path.open("wb") as spool:
+                shutil.copyfileobj(self._upload, spool)
+            collection_path = self._extract_collection(archive_path, directory)
+            self.connection = sqlite3.connect(f"file:{collection_path}?mode=ro", uri=True)
+            self.connection.execute("SELECT 1 FROM notes LIMIT 1")
+        except sqlite3.DatabaseError as exc:
+            self.__exit__(None, None, None)
+            raise AnkiImportError("Anki 컬렉션을 읽을 수 없습니다.") from exc
+        except BaseException:
+            self.__exit__(None, None, None)
+            raise
+        return self.connection
+
+    def __exit__(self, *_exc_info) -> None:
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+        if self._directory is not None:
+            self._directory.cleanup()
+            self._directory = None
+
+    @staticmethod
+    def _extract_collection(archive_path: Path, directory: Path) -> Path:
+        try:
+            archive = zipfile.ZipFile(archive_path)
+        except zipfile.BadZipFile as exc:
+            raise AnkiImportError("올바른 Anki 덱 파일(.apkg/.colpkg)이 아닙니다.") from exc
+        with archive:
+            members = {info.filename: info for info in archive.infolist()}
+            # Newer exports pair ``collection.anki21b`` with a stub
+            # ``collection.anki2`` that only asks the user to update Anki.
+            if "collection.anki21b" in members and "collection.anki21" not in members:
+                raise AnkiImportError(
+                    "최신 Anki 압축 형식은 지원하지 않습니다. "
+                    "내보내기에서 '이전 Anki 버전 지원'을 선택해 주세요."
+                )
+            name = next((name for name in COLLECTION_NAMES if name in members), None)
+            if name is None:
+                raise AnkiImportError("덱 파일에 Anki 컬렉션이 없습니다.")
+            if members[name].file_size > MAX_COLLECTION_BYTES:
+                raise AnkiImportError("Anki 컬렉션이 너무 큽니다.")
+            target = directory / "collection.sqlite"
+            with archive.open(name) as source, target.open("wb") as sink:
+                shutil.copyfileobj(source, sink)
+        return target
@@ -0,0 +1,151 @@
+"""Denormalized per-group word counters.
+
+``groups.word_count`` and ``groups.star_histogram`` (``{"<star>": count}``)
+let group listings skip counting words. Write paths that add, remove, move or
+re-rate words build ``(group_id, star) -> change`` deltas from the rows they
+wrote (see :func:`word_count_changes`) and apply them with
+:func:`adjust_group_counters`, one ``SET word_count = word_count + n`` UPDATE
+per group, so concurrent writers add up instead of overwriting each other.
+Rows whose previous group or star is needed are read with
+:func:`lock_word_keys` first.
+
+:func:`refresh_group_counters` recounts from ``words``; it is only used by
+``python3 app/repair_counters.py`` and the migration that added the columns.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from typing import Iterable, Mapping
+
+from sqlalchemy import JSON, String, bindparam, case, cast, func, literal, select, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session
+
+import models
+import schemas
+
+STARS = range(schemas.MAX_STAR_RATING + 1)
+
+
+def refresh_group_counters(db: Session, group_ids: Iterable[int | None] | None = None) -> int:
+    """Recompute the counters of ``group_ids`` (every group when ``None``).
+
+    Pending ORM changes are flushed first so they are counted. Returns the
+    number of groups written.
+    """
+
+    db.flush()
+    statement = select(models.Word.group_id, models.Word.star, func.count()).group_by(
+        models.Word.group_id, models.Word.star
+    )
+    if group_ids is None:
+        targets = set(db.scalars(select(models.Group.id)))
+    else:
+        targets = {group_id for group_id in group_ids if group_id is not None}
+        statement = statement.where(models.Word.group_id.in_(targets))
+    if not targets:
+        return 0
+
+    histograms: dict[int, dict[str, int]] = {group_id: {} for group_id in targets}
+    for group_id, star, count in db.execute(statement):
+        if group_id in histograms:
+            histograms[group_id][str(star)] = count
+    db.execute(
+        update(models.Group),
+        [
+            {
+                "id": group_id,
+                "word_count": sum(histogram.values()),
+                "star_histogram": histogram,
+            }
+            for group_id, histogram in histograms.items()
+        ],
+    )
+    return len(histograms)
+
+
+WordKey = tuple[int | None, int | None]
+
+
+def word_count_changes(
+    removed: Iterable[WordKey] = (), added: Iterable[WordKey] = ()
+) -> Counter:
+    """Return counter deltas for words ``removed`` from and ``added`` to groups.
+
+    Both take ``(group_id, star)`` pairs, one per word.
+    """
+
+    changes: Counter = Counter()
+    for sign, keys in ((-1, removed), (1, added)):
+        for group_id, star in keys:
+            if group_id is not None:
+                changes[(group_id, int(star or 0))] += sign
+    return changes
+
+
+def lock_word_keys(db: Session, word_ids: Iterable[int]) -> dict[int, tuple[int, int]]:
+    """Return ``{word_id: (group_id, star)}``, locking the rows until commit.
+
+    The lock keeps another transaction from changing the group or star between
+    this read and the write the caller derives its counter deltas from.
+    """
+
+    word_ids = set(word_ids)
+    if not word_ids:
+        return {}
+    word = models.Word
+    return {
+        word_id: (group_id, star)
+        for word_id, group_id, star in db.execute(
+            select(word.id, word.group_id, word.star)
+            .where(word.id.in_(word_ids))
+            .with_for_update()
+        )
+    }
+
+
+def _shifted_histogram(dialect: str):
+    histogram = models.Group.__table__.c.star_histogram
+    pairs = []
+    for star in STARS:
+        count = func.coalesce(histogram[str(star)].as_integer(), 0) + bindparam(f"star_{star}")
+        # Empty buckets become null and are dropped, as a recount leaves them out.
+        pairs += [literal(str(star), String), case((count > 0, count))]
+    if dialect == "postgresql":
+        merged = cast(histogram, JSONB).op("||")(func.jsonb_build_object(*pairs))
+        return cast(func.jsonb_strip_nulls(merged), JSON)
+    # RFC 7396 merge patch: null members are removed.
+    return func.json_patch(histogram, func.json_object(*pairs))
+
+
+def adjust_group_counters(db: Session, changes: Mapping[tuple[int, int], int]) -> int:
+    """Add ``(group_id, star) -> change`` deltas to the counters in place.
+
+    Every group goes through the same UPDATE, executed once with one parameter
+    set per group. Returns the number of groups written.
+    """
+
+    by_group: dict[int, dict[int, int]] = {}
+    for (group_id, star), change in changes.items():
+        if change:
+            by_group.setdefault(group_id, {})[star] = change
+    if not by_group:
+        return 0
+    groups = models.Group.__table__
+    db.execute(
+        update(groups)
+        .where(groups.c.id == bindparam("target_id"))
+        .values(
+            word_count=groups.c.word_count + bindparam("added"),
+            star_histogram=_shifted_histogram(db.get_bind().dialect.name),
+        ),
+        [
+            {
+                "target_id": group_id,
+                "added": sum(stars.values()),
+                **{f"star_{star}": stars.get(star, 0) for star in STARS},
+            }
+            for group_id, stars in sorted(by_group.items())
+        ],
+    )
+    return len(by_group)
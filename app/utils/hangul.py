@@ -0,0 +1,78 @@
+"""Hangul decomposition helpers for initial-consonant and partial-syllable search.
+
+Both keys are lower-cased and drop whitespace so that ``"ㅅㄱ"`` matches
+``"사과"`` and ``"사 과"`` alike. Compound vowels and final consonants are
+split into the keys a user types them with, which lets a half-composed query
+such as ``"삭"`` (ㅅㅏㄱ) prefix-match ``"사과"`` (ㅅㅏㄱㅗㅏ).
+"""
+
+from __future__ import annotations
+
+import unicodedata
+
+__all__ = ["hangul_chosung", "hangul_jamo", "is_chosung_query"]
+
+_SYLLABLE_BASE = 0xAC00
+_SYLLABLE_LAST = 0xD7A3
+_JUNGSUNG_COUNT = 21
+_JONGSUNG_COUNT = 28
+
+CHOSUNG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSUNG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSUNG = (
+    "",
+    "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ",
+    "ㄿ", "ㅀ", "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ",
+)
+_COMPOUND_JAMO = {
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ",
+    "ㄽ": "ㄹㅅ", "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ",
+    "ㅢ": "ㅡㅣ",
+}
+_CHOSUNG_SET = frozenset(CHOSUNG)
+
+
+def _prepare(value: str) -> str:
+    return "".join(unicodedata.normalize("NFC", value).casefold().split())
+
+
+def hangul_chosung(value: str | None) -> str | None:
+    """Return the initial consonants of every syllable, keeping other characters."""
+
+    if value is None:
+        return None
+    parts: list[str] = []
+    for char in _prepare(value):
+        code = ord(char)
+        if _SYLLABLE_BASE <= code <= _SYLLABLE_LAST:
+            parts.append(CHOSUNG[(code - _SYLLABLE_BASE) // (_JUNGSUNG_COUNT * _JONGSUNG_COUNT)])
+        else:
+            parts.append(char)
+    return "".join(parts)
+
+
+def hangul_jamo(value: str | None) -> str | None:
+    """Return ``value`` with every syllable split into its keystroke jamo."""
+
+    if value is None:
+        return None
+    parts: list[str] = []
+    for char in _prepare(value):
+        code = ord(char)
+        if _SYLLABLE_BASE <= code <= _SYLLABLE_LAST:
+            offset = code - _SYLLABLE_BASE
+            initial, rest = divmod(offset, _JUNGSUNG_COUNT * _JONGSUNG_COUNT)
+            medial, final = divmod(rest, _JONGSUNG_COUNT)
+            for jamo in (CHOSUNG[initial], JUNGSUNG[medial], JONGSUNG[final]):
+                parts.append(_COMPOUND_JAMO.get(jamo, jamo))
+        else:
+            parts.append(_COMPOUND_JAMO.get(char, char))
+    return "".join(parts)
+
+
+def is_chosung_query(value: str) -> bool:
+    """Return whether ``value`` consists only of initial consonants (ㄱ to ㅎ)."""
+
+    prepared = _prepare(value)
+    return bool(prepared) and all(char in _CHOSUNG_SET for char in prepared)
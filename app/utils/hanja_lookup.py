@@ -7,6 +7,8 @@ import re
 from typing import Iterable
 
 import hanja
+from hanja.hangul import dooeum
+from hanja.table import hanja_table
 import requests
 
 _WIKTIONARY_API_URL = "https://ko.wiktionary.org/w/api.php"
@@ -20,6 +22,13 @@ _PAREN_PATTERN = re.compile(r"\([^)]*\)")
 _TEMPLATE_PATTERN = re.compile(r"\{\{[^{}]*\}\}")
 _LINK_PATTERN = re.compile(r"\[\[(?:[^\]|]*\|)?([^\]|]+)\]\]")
 _REF_PATTERN = re.compile(r"<ref[^>]*>.*?</ref>", re.DOTALL)
+# Characters whose Korean reading depends on the word (樂 락/악/요, 金 금/김, ...).
+# ``hanja`` only knows one reading for each, so readings built from them are
+# reported as ambiguous instead of being trusted.
+POLYPHONIC_HANJA = frozenset(
+    "樂金車行率不北便復更度讀說惡易宿省殺識切參狀見降洞塞數暴則畫布索拓沈茶句龜乾否什葉串"
+    "糖辰刺射奈丹宅合拾屬徵差咽告"
+)
 
 
 def contains_hanja(text: str | None) -> bool:
@@ -165,6 +174,41 @@ def _translate_character(char: str) -> str:
     return translated
 
 
+@lru_cache(maxsize=1)
+def _initial_readings() -> dict[str, str]:
+    # Word-initial forms with 두음법칙 applied, computed once for the whole table.
+    return {char: dooeum(" ", reading) for char, reading in hanja_table.items()}
+
+
+def hanja_reading(term: str | None) -> tuple[str, bool]:
+    """Return the Hangul reading of ``term`` and whether it is ambiguous.
+
+    Produces the same text as ``hanja.translate(term, "substitution")`` from a
+    per-character table. The reading is empty when ``term`` has no Hanja.
+    """
+
+    if not term or not contains_hanja(term):
+        return "", False
+    initial = _initial_readings()
+    pieces: list[str] = []
+    previous = " "
+    ambiguous = False
+    for char in term:
+        reading = hanja_table.get(char)
+        if reading is None:
+            current = char
+        elif not previous.isalnum():
+            current = initial[char]
+        elif reading in ("렬", "률"):
+            current = dooeum(previous, reading)
+        else:
+            current = reading
+        ambiguous = ambiguous or char in POLYPHONIC_HANJA
+        pieces.append(current)
+        previous = current
+    return "".join(pieces), ambiguous
+
+
 def _is_redundant_translation(original: str, translated: str) -> bool:
     stripped_original = _PAREN_PATTERN.sub("", original).strip()
     stripped_translated = _PAREN_PATTERN.sub("", translated).strip()
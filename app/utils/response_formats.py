@@ -0,0 +1,109 @@
+"""Content negotiation for compact list responses.
+
+Large lists default to the usual array of JSON objects. Clients that send
+``Accept: application/vnd.rememberword.columnar+json`` instead receive one
+array per field::
+
+    {"count": 2, "columns": {"id": [1, 2], "term": ["apple", "pear"]}}
+
+and ``Accept: application/msgpack`` returns the same structure encoded with
+MessagePack. Columnar payloads are built straight from result tuples, without
+a Pydantic model per row. ``msgpack`` is optional; without it MessagePack
+requests are answered with 406.
+"""
+from __future__ import annotations
+
+import json
+from typing import Any, Iterable, Iterator, Literal, Sequence
+
+from fastapi import HTTPException, Response
+
+try:  # pragma: no cover - exercised only when msgpack is missing
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+ResponseFormat = Literal["json", "columnar", "msgpack"]
+
+JSON_MEDIA_TYPE = "application/json"
+COLUMNAR_MEDIA_TYPE = "application/vnd.rememberword.columnar+json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+_MSGPACK_ALIASES = {MSGPACK_MEDIA_TYPE, "application/x-msgpack", "application/vnd.msgpack"}
+_JSON_ALIASES = {JSON_MEDIA_TYPE, "application/*", "*/*"}
+# OpenAPI ``responses`` entry for endpoints that support the compact forms.
+COMPACT_RESPONSES = {
+    200: {
+        "content": {
+            COLUMNAR_MEDIA_TYPE: {},
+            MSGPACK_MEDIA_TYPE: {},
+        }
+    },
+    406: {"description": "MessagePack을 요청했지만 서버에 msgpack이 없습니다."},
+}
+
+
+def _accepted_media_types(accept: str) -> Iterator[str]:
+    """Yield the media types of an ``Accept`` header, highest quality first."""
+
+    ranked: list[tuple[float, int, str]] = []
+    for position, part in enumerate(accept.split(",")):
+        media_type, *params = (piece.strip() for piece in part.split(";"))
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if media_type and quality > 0:
+            ranked.append((-quality, position, media_type.lower()))
+    for _, _, media_type in sorted(ranked):
+        yield media_type
+
+
+def negotiate_format(accept: str | None) -> ResponseFormat:
+    """Pick the response format for an ``Accept`` header (JSON when unspecified)."""
+
+    msgpack_requested = False
+    for media_type in _accepted_media_types(accept or ""):
+        if media_type == COLUMNAR_MEDIA_TYPE:
+            return "columnar"
+        if media_type in _MSGPACK_ALIASES:
+            if msgpack is not None:
+                return "msgpack"
+            msgpack_requested = True
+        elif media_type in _JSON_ALIASES:
+            return "json"
+    if msgpack_requested:
+        raise HTTPException(406, "MessagePack 응답을 지원하지 않습니다. msgpack 패키지를 설치하세요.")
+    return "json"
+
+
+def columnar(columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> dict[str, Any]:
+    """Transpose result ``rows`` into ``{"count", "columns": {name: values}}``."""
+
+    rows = rows if isinstance(rows, list) else list(rows)
+    values = zip(*rows) if rows else ((),) * len(columns)
+    return {
+        "count": len(rows),
+        "columns": {name: list(column) for name, column in zip(columns, values)},
+    }
+
+
+def encode_msgpack(payload: Any) -> bytes:
+    if msgpack is None:  # pragma: no cover - guarded by negotiate_format
+        raise HTTPException(406, "MessagePack 응답을 지원하지 않습니다. msgpack 패키지를 설치하세요.")
+    return msgpack.packb(payload, use_bin_type=True)
+
+
+def render_compact(payload: dict[str, Any], response_format: ResponseFormat) -> Response:
+    """Serialize a columnar ``payload`` for a non-default ``response_format``."""
+
+    if response_format == "msgpack":
+        response = Response(encode_msgpack(payload), media_type=MSGPACK_MEDIA_TYPE)
+    else:
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+        response = Response(body.encode("utf-8"), media_type=COLUMNAR_MEDIA_TYPE)
+    response.headers["Vary"] = "Accept"
+    return response
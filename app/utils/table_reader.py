@@ -0,0 +1,190 @@
+"""Fast parsing of uploaded word sheets.
+
+Delimited text is parsed by pandas' C engine, or by pyarrow's multi-threaded
+CSV reader when pyarrow is installed. Neither can guess the delimiter, so it
+is sniffed from the first ``SNIFF_SAMPLE_BYTES`` only instead of handing the
+whole file to the pure-Python ``sep=None`` parser. XLSX workbooks are
+streamed row by row through openpyxl's read-only mode.
+
+Every reader returns string cells with empty cells as ``""``, so words such as
+``NA`` or ``null`` are kept verbatim.
+"""
+from __future__ import annotations
+
+import csv
+from io import BytesIO
+import math
+from typing import Literal
+
+import pandas as pd
+
+try:  # pragma: no cover - exercised only when pyarrow is installed
+    import pyarrow  # noqa: F401
+
+    CSV_ENGINE: Literal["pyarrow", "c"] = "pyarrow"
+except ImportError:  # pragma: no cover
+    CSV_ENGINE = "c"
+
+SNIFF_SAMPLE_BYTES = 64 * 1024
+SNIFF_DELIMITERS = ",\t;|"
+# Header spellings recognised for the columns of a structured sheet.
+STRUCTURED_COLUMN_ALIASES = {
+    "folder": {"folder", "폴더", "폴더명", "카테고리", "folder name", "folder명"},
+    "group": {
+        "group",
+        "그룹",
+        "그룹명",
+        "day",
+        "day1",
+        "day2",
+        "day3",
+        "단계",
+        "세트",
+        "unit",
+        "lesson",
+    },
+    "term": {
+        "term",
+        "word",
+        "단어",
+        "표제어",
+        "영단어",
+        "단어(영어)",
+        "단어(외국어)",
+    },
+    "meaning": {
+        "meaning",
+        "뜻",
+        "의미",
+        "해석",
+        "뜻(한국어)",
+        "뜻풀이",
+        "translation",
+    },
+}
+
+
+def canonical_column(value: str | int | float | None) -> str:
+    """Return the structured column a header names, or the lower-cased header."""
+
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ""
+    key = str(value).strip().lower()
+    for target, aliases in STRUCTURED_COLUMN_ALIASES.items():
+        if key == target or key in aliases:
+            return target
+    return key
+
+
+def canonicalize_columns(df: pd.DataFrame) -> pd.DataFrame:
+    df.columns = [canonical_column(column) for column in df.columns]
+    return df
+
+
+def sniff_delimiter(content: bytes, default: str = ",") -> str:
+    """Guess the delimiter from the first complete lines of ``content``.
+
+    The sniffer gives up on ragged rows, so the header line then decides: the
+    candidate it contains most often wins.
+    """
+
+    sample = content[:SNIFF_SAMPLE_BYTES]
+    if len(content) > len(sample) and b"\n" in sample:
+        sample = sample[: sample.rindex(b"\n")]
+    text = sample.decode("utf-8-sig", errors="ignore")
+    try:
+        return csv.Sniffer().sniff(text, delimiters=SNIFF_DELIMITERS).delimiter
+    except csv.Error:
+        header = text.splitlines()[0] if text else ""
+        counts = {delimiter: header.count(delimiter) for delimiter in SNIFF_DELIMITERS}
+        best = max(counts, key=counts.get)
+        return best if counts[best] else default
+
+
+def read_delimited(
+    content: bytes,
+    *,
+    sep: str | None = None,
+    default_sep: str = ",",
+    header: int | None = 0,
+) -> pd.DataFrame:
+    """Parse CSV/TSV ``content``; ``sep=None`` sniffs it from a sample."""
+
+    if sep is None:
+        sep = sniff_delimiter(content, default_sep)
+    options = {"sep": sep, "header": header, "dtype": str, "keep_default_na": False}
+    if CSV_ENGINE == "pyarrow":
+        try:
+            return pd.read_csv(BytesIO(content), engine="pyarrow", **options)
+        except Exception:  # pragma: no cover - ragged rows and other quirks
+            pass
+    return pd.read_csv(BytesIO(content), engine="c", encoding="utf-8-sig", **options)
+
+
+def _cell(value):
+    if value is None:
+        return ""
+    # Match ``pd.read_excel``, which reports whole-number floats as integers.
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _sheet_frame(worksheet, header: int | None) -> pd.DataFrame:
+    rows = worksheet.iter_rows(values_only=True)
+    columns = None
+    if header is not None:
+        for _ in range(header):
+            next(rows, None)
+        columns = ["" if value is None else str(value) for value in next(rows, ())]
+    records = [
+        [_cell(value) for value in row]
+        for row in rows
+        if any(value not in (None, "") for value in row)
+    ]
+    frame = pd.DataFrame(records, dtype=object)
+    if columns is not None:
+        # Rows may be shorter or longer than the header; pad or trim them to it.
+        frame = frame.reindex(columns=range(len(columns)), fill_value="")
+        frame.columns = columns
+    return frame.fillna("")
+
+
+def _open_workbook(source: bytes | str):
+    from openpyxl import load_workbook
+
+    if isinstance(source, bytes):
+        source = BytesIO(source)
+    return load_workbook(source, read_only=True, data_only=True)
+
+
+def read_xlsx(content: bytes, *, header: int | None = 0) -> pd.DataFrame:
+    """Read the first sheet of an XLSX workbook without loading it whole."""
+
+    workbook = _open_workbook(content)
+    try:
+        return _sheet_frame(workbook.worksheets[0], header)
+    finally:
+        workbook.close()
+
+
+def xlsx_sheet_names(path: str) -> list[str]:
+    workbook = _open_workbook(path)
+    try:
+        return list(workbook.sheetnames)
+    finally:
+        workbook.close()
+
+
+def read_xlsx_sheet(path: str, sheet_name: str) -> pd.DataFrame:
+    """Read one sheet of the workbook at ``path`` with structured column names.
+
+    Each call opens the workbook on its own, so sheets can be read in
+    separate processes.
+    """
+
+    workbook = _open_workbook(path)
+    try:
+        return canonicalize_columns(_sheet_frame(workbook[sheet_name], 0))
+    finally:
+        workbook.close()
@@ -0,0 +1,105 @@
+"""Set-based deletion of words and of the quiz questions that reference them.
+
+Deleting a word removes its quiz questions, so every affected session loses
+those questions from its ``total/answered/correct`` counters. The adjustments
+are aggregated per session in SQL and applied with a single ``UPDATE ... FROM``
+before the questions and words are removed with one ``DELETE`` each. A
+session left without questions from one of the words' groups no longer lists
+that group in ``quiz_session_groups``.
+"""
+from __future__ import annotations
+
+from typing import Iterable
+
+from sqlalchemy import case, delete, exists, func, select, update
+from sqlalchemy.orm import Session
+
+import models
+from utils.group_counters import adjust_group_counters, word_count_changes
+
+
+def owned_word_ids(db: Session, profile_id: int, word_ids: Iterable[int]) -> list[int]:
+    """Return the subset of ``word_ids`` that belongs to ``profile_id``."""
+
+    return list(
+        db.scalars(
+            select(models.Word.id)
+            .join(models.Group, models.Group.id == models.Word.group_id)
+            .where(models.Word.id.in_(set(word_ids)), models.Group.profile_id == profile_id)
+            .order_by(models.Word.id)
+        )
+    )
+
+
+def _decrement(column, amount):
+    # ``max(0, column - amount)`` without relying on GREATEST or scalar MAX.
+    return case((column > amount, column - amount), else_=0)
+
+
+def delete_words(db: Session, word_ids: list[int]) -> int:
+    """Delete ``word_ids`` and repair the counters of sessions that asked them.
+
+    Ownership must already be checked (see :func:`owned_word_ids`). Returns the
+    number of quiz questions removed along with the words.
+    """
+
+    if not word_ids:
+        return 0
+
+    questions = models.QuizQuestion
+    adjustments = (
+        select(
+            questions.session_id.label("session_id"),
+            func.count().label("total"),
+            func.count(questions.is_correct).label("answered"),
+            func.sum(case((questions.is_correct.is_(True), 1), else_=0)).label("correct"),
+        )
+        .where(questions.word_id.in_(word_ids))
+        .group_by(questions.session_id)
+        .subquery()
+    )
+    sessions = models.QuizSession
+    db.execute(
+        update(sessions)
+        .where(sessions.id == adjustments.c.session_id)
+        .values(
+            total_questions=_decrement(sessions.total_questions, adjustments.c.total),
+            answered_questions=_decrement(sessions.answered_questions, adjustments.c.answered),
+            correct_questions=_decrement(sessions.correct_questions, adjustments.c.correct),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    removed = db.execute(
+        delete(questions)
+        .where(questions.word_id.in_(word_ids))
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.execute(
+        delete(models.WordStat)
+        .where(models.WordStat.word_id.in_(word_ids))
+        .execution_options(synchronize_session=False)
+    )
+    deleted = db.execute(
+        delete(models.Word)
+        .where(models.Word.id.in_(word_ids))
+        .returning(models.Word.group_id, models.Word.star)
+        .execution_options(synchronize_session=False)
+    ).all()
+    group_ids = {group_id for group_id, _ in deleted}
+    links = models.QuizSessionGroup
+    db.execute(
+        delete(links)
+        .where(
+            links.group_id.in_(group_ids),
+            ~exists()
+            .where(
+                questions.session_id == links.session_id,
+                questions.word_id == models.Word.id,
+                models.Word.group_id == links.group_id,
+            )
+            .correlate(links),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    adjust_group_counters(db, word_count_changes(removed=deleted))
+    return removed
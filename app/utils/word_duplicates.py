@@ -0,0 +1,310 @@
+"""Exact and near-duplicate detection across one account's words.
+
+Exact duplicates share a language and a case-insensitive term. Near duplicates
+are words of the same language whose ``term + meaning`` text has a character
+shingle Jaccard similarity of at least :data:`NEAR_DUPLICATE_THRESHOLD`.
+
+Comparing every pair is quadratic, so candidates come from MinHash signatures
+bucketed with locality-sensitive hashing (LSH): two texts land in the same
+bucket of some band with a probability that rises steeply with their
+similarity. Only those candidates are verified against the exact Jaccard
+score, which keeps the analysis roughly linear in the number of words.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import re
+from typing import Iterable, Sequence
+import zlib
+
+import numpy as np
+from sqlalchemy import delete, func, insert, literal, select, update
+from sqlalchemy.orm import Session
+
+import models
+from utils.group_counters import adjust_group_counters, lock_word_keys, word_count_changes
+from utils.word_stats import fold_word_stats
+
+SHINGLE_SIZE = 3
+MINHASH_PERMUTATIONS = 64
+# 16 bands of 4 rows: pairs around 0.5 similarity become candidates half the time.
+LSH_BANDS = 16
+NEAR_DUPLICATE_THRESHOLD = 0.6
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_BUCKET_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+# Bound the (shingles x permutations) matrix built per chunk.
+_SIGNATURE_CHUNK = 20_000
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(value: str | None) -> str:
+    return _WHITESPACE_RE.sub(" ", (value or "").casefold()).strip()
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set[str]:
+    """Return the character ``size``-grams of ``text`` (the text itself if shorter)."""
+
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[index : index + size] for index in range(len(text) - size + 1)}
+
+
+def jaccard(left: set[str], right: set[str]) -> float:
+    if not left and not right:
+        return 1.0
+    return len(left & right) / len(left | right)
+
+
+def minhash_signatures(
+    shingle_sets: Sequence[set[str]],
+    permutations: int = MINHASH_PERMUTATIONS,
+    seed: int = 1,
+) -> np.ndarray:
+    """Return a ``(len(shingle_sets), permutations)`` MinHash signature matrix.
+
+    Each permutation is a universal hash ``(a * x + b) mod p`` applied to the
+    CRC32 of every shingle; the signature keeps the minimum per set.
+    """
+
+    generator = np.random.default_rng(seed)
+    a = generator.integers(1, _MERSENNE_PRIME, size=permutations, dtype=np.uint64)
+    b = generator.integers(0, _MERSENNE_PRIME, size=permutations, dtype=np.uint64)
+    signatures = np.full((len(shingle_sets), permutations), _MAX_HASH, dtype=np.uint64)
+
+    start = 0
+    while start < len(shingle_sets):
+        hashes: list[int] = []
+        offsets: list[int] = []
+        rows: list[int] = []
+        stop = start
+        while stop < len(shingle_sets) and len(hashes) < _SIGNATURE_CHUNK:
+            values = shingle_sets[stop]
+            if values:
+                offsets.append(len(hashes))
+                rows.append(stop)
+                hashes.extend(zlib.crc32(value.encode("utf-8")) for value in values)
+            stop += 1
+        if hashes:
+            column = np.asarray(hashes, dtype=np.uint64)[:, None]
+            # uint64 multiplication wraps around; that is fine for hashing.
+            permuted = ((column * a + b) % _MERSENNE_PRIME) & _MAX_HASH
+            signatures[rows] = np.minimum.reduceat(permuted, offsets, axis=0)
+        start = stop
+    return signatures
+
+
+def lsh_candidate_pairs(signatures: np.ndarray, bands: int = LSH_BANDS) -> set[tuple[int, int]]:
+    """Return index pairs that share a bucket in at least one band.
+
+    Within a bucket every member is paired with the first one and with its
+    predecessor rather than with every other member, so a bucket of ``k``
+    identical texts yields ``O(k)`` candidates instead of ``O(k^2)``.
+    """
+
+    rows_per_band = signatures.shape[1] // bands
+    pairs: set[tuple[int, int]] = set()
+    for band in range(bands):
+        block = signatures[:, band * rows_per_band : (band + 1) * rows_per_band]
+        # Fold the band into one bucket key; a rare collision only adds a
+        # candidate that fails verification.
+        keys = np.zeros(len(block), dtype=np.uint64)
+        for column in block.T:
+            keys = keys * _BUCKET_MULTIPLIER + column
+        order = np.argsort(keys, kind="stable")
+        ordered = keys[order]
+        repeats = np.flatnonzero(ordered[1:] == ordered[:-1]) + 1
+        if not len(repeats):
+            continue
+        run_starts = np.flatnonzero(np.r_[True, ordered[1:] != ordered[:-1]])
+        firsts = order[run_starts[np.searchsorted(run_starts, repeats, side="right") - 1]]
+        pairs.update(zip(order[repeats - 1].tolist(), order[repeats].tolist()))
+        pairs.update(zip(firsts.tolist(), order[repeats].tolist()))
+    return {(min(pair), max(pair)) for pair in pairs if pair[0] != pair[1]}
+
+
+class _DisjointSet:
+    def __init__(self, size: int) -> None:
+        self.parent = list(range(size))
+
+    def find(self, index: int) -> int:
+        while self.parent[index] != index:
+            self.parent[index] = self.parent[self.parent[index]]
+            index = self.parent[index]
+        return index
+
+    def union(self, left: int, right: int) -> None:
+        left, right = self.find(left), self.find(right)
+        if left != right:
+            self.parent[max(left, right)] = min(left, right)
+
+
+@dataclass
+class DuplicateWord:
+    id: int
+    group_id: int
+    group_name: str
+    folder_name: str
+    language: str
+    term: str
+    meaning: str
+    star: int
+    question_count: int
+
+
+@dataclass
+class DuplicateCluster:
+    kind: str
+    language: str
+    similarity: float
+    suggested_canonical_id: int
+    words: list[DuplicateWord] = field(default_factory=list)
+
+
+def find_duplicate_clusters(
+    words: Sequence[DuplicateWord], threshold: float = NEAR_DUPLICATE_THRESHOLD
+) -> list[DuplicateCluster]:
+    """Group ``words`` into exact and near-duplicate clusters, largest first."""
+
+    keys = [(word.language, normalize_text(word.term)) for word in words]
+    texts = [normalize_text(f"{word.term} {word.meaning}") for word in words]
+    shingle_sets = [shingles(text) for text in texts]
+
+    clusters = _DisjointSet(len(words))
+    first_by_key: dict[tuple[str, str], int] = {}
+    for index, key in enumerate(keys):
+        clusters.union(first_by_key.setdefault(key, index), index)
+
+    verified: list[tuple[int, float]] = []
+    signatures = minhash_signatures(shingle_sets)
+    for left, right in sorted(lsh_candidate_pairs(signatures)):
+        if words[left].language != words[right].language or keys[left] == keys[right]:
+            continue
+        score = jaccard(shingle_sets[left], shingle_sets[right])
+        if score >= threshold:
+            clusters.union(left, right)
+            verified.append((left, score))
+
+    lowest_similarity: dict[int, float] = {}
+    for index, score in verified:
+        root = clusters.find(index)
+        lowest_similarity[root] = min(lowest_similarity.get(root, 1.0), score)
+
+    members: dict[int, list[int]] = {}
+    for index in range(len(words)):
+        members.setdefault(clusters.find(index), []).append(index)
+
+    result: list[DuplicateCluster] = []
+    for root, indexes in members.items():
+        if len(indexes) < 2:
+            continue
+        cluster_words = [words[index] for index in indexes]
+        exact = len({keys[index] for index in indexes}) == 1
+        canonical = max(cluster_words, key=lambda word: (word.question_count, -word.id))
+        similarity = 1.0 if exact else lowest_similarity.get(root, threshold)
+        result.append(
+            DuplicateCluster(
+                kind="exact" if exact else "near",
+                language=cluster_words[0].language,
+                similarity=round(similarity, 3),
+                suggested_canonical_id=canonical.id,
+                words=cluster_words,
+            )
+        )
+    result.sort(key=lambda cluster: (-len(cluster.words), cluster.words[0].id))
+    return result
+
+
+def load_profile_words(db: Session, profile_id: int) -> list[DuplicateWord]:
+    """Load every word of ``profile_id`` with its quiz question count."""
+
+    question_counts = (
+        select(models.QuizQuestion.word_id, func.count().label("question_count"))
+        .group_by(models.QuizQuestion.word_id)
+        .subquery()
+    )
+    rows = db.execute(
+        select(
+            models.Word.id,
+            models.Word.group_id,
+            models.Group.name,
+            models.Folder.name,
+            models.Word.language,
+            models.Word.term,
+            models.Word.meaning,
+            models.Word.star,
+            func.coalesce(question_counts.c.question_count, 0),
+        )
+        .join(models.Group, models.Group.id == models.Word.group_id)
+        .join(models.Folder, models.Folder.id == models.Group.folder_id)
+        .outerjoin(question_counts, question_counts.c.word_id == models.Word.id)
+        .where(models.Group.profile_id == profile_id)
+        .order_by(models.Word.id)
+    )
+    return [DuplicateWord(*row) for row in rows]
+
+
+def merge_words(db: Session, canonical_id: int, duplicate_ids: Iterable[int]) -> int:
+    """Fold ``duplicate_ids`` into ``canonical_id`` and delete them.
+
+    Quiz questions are re-pointed to the canonical word, so session counters
+    and exam history are unchanged; sessions that asked a duplicate are
+    linked to the canonical word's group so history still lists them there.
+    A session may then hold two questions for one word, whose answers
+    :func:`~utils.word_stats.record_word_answers` folds per word. The
+    canonical word keeps its own fields but takes the highest star rating of
+    the merged words. Ownership must already be checked. Returns the number
+    of re-pointed questions.
+    """
+
+    duplicate_ids = [word_id for word_id in set(duplicate_ids) if word_id != canonical_id]
+    if not duplicate_ids:
+        return 0
+
+    keys = lock_word_keys(db, [canonical_id, *duplicate_ids])
+    top_star = max(star for _, star in keys.values())
+    db.execute(
+        update(models.Word)
+        .where(models.Word.id == canonical_id)
+        .values(star=top_star)
+        .execution_options(synchronize_session=False)
+    )
+    moved = db.execute(
+        update(models.QuizQuestion)
+        .where(models.QuizQuestion.word_id.in_(duplicate_ids))
+        .values(word_id=canonical_id)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    canonical_group_id = keys[canonical_id][0]
+    question = models.QuizQuestion
+    link = models.QuizSessionGroup
+    db.execute(
+        insert(link).from_select(
+            ["session_id", "group_id", "position"],
+            select(question.session_id, literal(canonical_group_id), func.min(question.position))
+            .where(
+                question.word_id == canonical_id,
+                ~select(link.session_id)
+                .where(
+                    link.session_id == question.session_id,
+                    link.group_id == canonical_group_id,
+                )
+                .exists(),
+            )
+            .group_by(question.session_id),
+        )
+    )
+    fold_word_stats(db, {duplicate_id: canonical_id for duplicate_id in duplicate_ids})
+    db.execute(
+        delete(models.Word)
+        .where(models.Word.id.in_(duplicate_ids))
+        .execution_options(synchronize_session=False)
+    )
+    adjust_group_counters(
+        db,
+        word_count_changes(
+            removed=keys.values(), added=[(canonical_group_id, top_star)]
+        ),
+    )
+    return moved
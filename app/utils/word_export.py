@@ -0,0 +1,153 @@
+"""Streaming serializers for exporting a user's words.
+
+Rows are read with ``yield_per`` on a server-side cursor and written out one
+batch at a time, so memory use does not grow with the size of the export. The
+column layout matches what ``POST /words/import-structured`` reads back.
+"""
+from __future__ import annotations
+
+import csv
+from io import StringIO
+import json
+import tempfile
+from typing import Iterator, Sequence
+
+from openpyxl import Workbook
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from sqlalchemy import Select, select
+
+from database import SessionLocal
+import models
+from utils.response_formats import MSGPACK_MEDIA_TYPE, columnar, encode_msgpack
+
+EXPORT_COLUMNS = (
+    "folder",
+    "group",
+    "language",
+    "term",
+    "meaning",
+    "reading",
+    "pos",
+    "example",
+    "memo",
+    "star",
+)
+EXPORT_BATCH_SIZE = 1000
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "msgpack": MSGPACK_MEDIA_TYPE,
+}
+_XLSX_CHUNK_SIZE = 64 * 1024
+
+
+def export_statement(
+    profile_id: int, *, group_id: int | None = None, folder_id: int | None = None
+) -> Select:
+    """Return the SELECT for every word of ``profile_id`` within the given scope."""
+
+    statement = (
+        select(
+            models.Folder.name,
+            models.Group.name,
+            models.Word.language,
+            models.Word.term,
+            models.Word.meaning,
+            models.Word.reading,
+            models.Word.pos,
+            models.Word.example,
+            models.Word.memo,
+            models.Word.star,
+        )
+        .join(models.Group, models.Group.id == models.Word.group_id)
+        .join(models.Folder, models.Folder.id == models.Group.folder_id)
+        .where(models.Group.profile_id == profile_id)
+        .order_by(models.Folder.id, models.Group.id, models.Word.id)
+    )
+    if group_id is not None:
+        statement = statement.where(models.Group.id == group_id)
+    if folder_id is not None:
+        statement = statement.where(models.Group.folder_id == folder_id)
+    return statement
+
+
+def iter_export_batches(statement: Select) -> Iterator[Sequence[tuple]]:
+    """Yield batches of export rows from a dedicated session.
+
+    The request-scoped session may already be closed while the response body
+    is still streaming, so the generator owns its own session.
+    """
+
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            statement.execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE)
+        )
+        for partition in result.partitions():
+            yield partition
+    finally:
+        db.close()
+
+
+def stream_csv(batches: Iterator[Sequence[tuple]]) -> Iterator[bytes]:
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for batch in batches:
+        writer.writerows(batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def stream_ndjson(batches: Iterator[Sequence[tuple]]) -> Iterator[bytes]:
+    for batch in batches:
+        lines = [
+            json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False) for row in batch
+        ]
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def stream_msgpack(batches: Iterator[Sequence[tuple]]) -> Iterator[bytes]:
+    """Write one columnar MessagePack map per batch; readers unpack them in sequence."""
+
+    for batch in batches:
+        yield encode_msgpack(columnar(EXPORT_COLUMNS, batch))
+
+
+def _xlsx_value(value):
+    if isinstance(value, str):
+        return ILLEGAL_CHARACTERS_RE.sub("", value)
+    return value
+
+
+def stream_xlsx(batches: Iterator[Sequence[tuple]]) -> Iterator[bytes]:
+    """Write rows through openpyxl's write-only mode and stream the saved file.
+
+    Write-only worksheets spill rows to temporary files as they are appended;
+    the finished archive is spooled to disk and read back in chunks.
+    """
+
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet("words")
+    worksheet.append(EXPORT_COLUMNS)
+    for batch in batches:
+        for row in batch:
+            worksheet.append([_xlsx_value(value) for value in row])
+
+    with tempfile.TemporaryFile() as spool:
+        workbook.save(spool)
+        spool.seek(0)
+        while chunk := spool.read(_XLSX_CHUNK_SIZE):
+            yield chunk
+
+
+EXPORT_WRITERS = {
+    "csv": stream_csv,
+    "ndjson": stream_ndjson,
+    "xlsx": stream_xlsx,
+    "msgpack": stream_msgpack,
+}
@@ -0,0 +1,530 @@
+"""Bulk helpers shared by the word import endpoints.
+
+Uploaded sheets are normalized column-wise with pandas, de-duplicated with
+``drop_duplicates`` and filtered against the keys already stored in the
+database with an anti-join, so only the surviving rows are turned into
+INSERT/UPDATE parameters.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import math
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+
+import models
+import schemas
+from utils.group_counters import adjust_group_counters, lock_word_keys, word_count_changes
+from utils.hangul import hangul_chosung, hangul_jamo
+
+FolderKey = str
+GroupKey = tuple[FolderKey, str]
+
+STRUCTURED_COLUMNS = ("folder", "group", "language", "term", "meaning")
+OPTIONAL_WORD_FIELDS = ("reading", "pos", "example", "memo")
+WORD_KEY_COLUMNS = ["language_key", "term_key"]
+STRUCTURED_KEY_COLUMNS = ["folder_key", "group_key", *WORD_KEY_COLUMNS]
+IMPORT_PREVIEW_SAMPLE_LIMIT = 50
+
+
+def normalize_cell(value: str | int | float | bool | None) -> str:
+    """Return ``value`` as a stripped string, treating ``None``/NaN as empty."""
+
+    if value is None:
+        return ""
+    if isinstance(value, float) and math.isnan(value):
+        return ""
+    return str(value).strip()
+
+
+def normalize_key(value: str | int | float | bool | None) -> str:
+    return normalize_cell(value).lower()
+
+
+def normalize_text_columns(df: pd.DataFrame, columns) -> pd.DataFrame:
+    """Return ``columns`` of ``df`` as stripped strings with NaN mapped to ``""``.
+
+    Columns that are missing from ``df`` come back as empty strings. When a
+    header appears twice the right-most column wins, like it did when rows were
+    converted to dictionaries.
+    """
+
+    if df.columns.duplicated().any():
+        df = df.loc[:, ~df.columns.duplicated(keep="last")]
+    result = pd.DataFrame(index=df.index)
+    for column in columns:
+        if column not in df.columns:
+            result[column] = ""
+            continue
+        series = df[column]
+        result[column] = (
+            series.astype(object).where(series.notna(), "").astype(str).str.strip()
+        )
+    return result
+
+
+def clamp_star_column(series: pd.Series) -> pd.Series:
+    """Parse a ``star`` column, clamping to the valid range and keeping NaN."""
+
+    numbers = pd.to_numeric(series, errors="coerce")
+    clamped = numbers.clip(lower=0, upper=schemas.MAX_STAR_RATING)
+    return np.trunc(clamped).astype("Int64")
+
+
+def _add_key_columns(frame: pd.DataFrame, columns) -> pd.DataFrame:
+    for column in columns:
+        frame[f"{column}_key"] = frame[column].str.lower()
+    return frame
+
+
+def _records(frame: pd.DataFrame, columns) -> list[dict]:
+    subset = frame[list(columns)]
+    return subset.astype(object).where(subset.notna(), None).to_dict(orient="records")
+
+
+def _normalize_word_frame(df: pd.DataFrame, columns) -> pd.DataFrame:
+    """Normalize ``columns`` plus whichever optional word fields ``df`` carries."""
+
+    present = [column for column in OPTIONAL_WORD_FIELDS if column in df.columns]
+    frame = normalize_text_columns(df, (*columns, *present))
+    if "star" in df.columns:
+        star = df["star"]
+        if isinstance(star, pd.DataFrame):
+            star = star.iloc[:, -1]
+        frame["star"] = clamp_star_column(star)
+    return frame
+
+
+def _insert_records(frame: pd.DataFrame) -> list[dict]:
+    """Return INSERT parameters for a frame that already carries ``group_id``."""
+
+    frame = frame.copy()
+    columns = ["group_id", "language", "term", "meaning"]
+    for column in OPTIONAL_WORD_FIELDS:
+        if column in frame.columns:
+            frame[column] = frame[column].mask(frame[column] == "", None)
+            columns.append(column)
+    if "star" in frame.columns:
+        frame["star"] = frame["star"].fillna(0)
+        columns.append("star")
+    return _records(frame, columns)
+
+
+@dataclass
+class GroupImportPlan:
+    """Rows of a single-group import split into inserts and updates."""
+
+    group_id: int
+    inserts: pd.DataFrame
+    updates: pd.DataFrame
+    update_fields: list[str]
+    has_star: bool
+    skipped_rows: pd.DataFrame = field(default_factory=pd.DataFrame)
+
+    @property
+    def skipped(self) -> int:
+        return len(self.skipped_rows)
+
+
+def normalize_group_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Normalize a ``language/term/meaning`` sheet for :func:`plan_group_import`."""
+
+    frame = _normalize_word_frame(df, ("language", "term", "meaning"))
+    frame["language"] = frame["language"].mask(frame["language"] == "", "기본")
+    # Words of one group are matched on their exact language and term, so
+    # "Apple" and "apple" stay two words.
+    frame["language_key"] = frame["language"]
+    frame["term_key"] = frame["term"]
+    return frame
+
+
+def plan_group_import(db: Session, group_id: int, frame: pd.DataFrame) -> GroupImportPlan:
+    """Split ``frame`` into new and existing words of ``group_id`` in one query."""
+
+    valid = (frame["term"] != "") & (frame["meaning"] != "")
+    skipped = [frame[~valid].assign(reason="missing_field")]
+    frame = frame[valid]
+    # Later rows win, matching the behaviour of updating the same word twice.
+    superseded = frame.duplicated(WORD_KEY_COLUMNS, keep="last")
+    skipped.append(frame[superseded].assign(reason="duplicate_in_file"))
+    frame = frame[~superseded]
+
+    existing = pd.DataFrame(
+        db.query(models.Word.id, models.Word.language, models.Word.term)
+        .filter(models.Word.group_id == group_id)
+        .order_by(models.Word.id)
+        .all(),
+        columns=["id", "language", "term"],
+    )
+    existing = existing.assign(
+        language_key=existing["language"].astype(str),
+        term_key=existing["term"].astype(str),
+    ).drop_duplicates(WORD_KEY_COLUMNS)[["id", *WORD_KEY_COLUMNS]]
+
+    merged = frame.merge(existing, on=WORD_KEY_COLUMNS, how="left", indicator=True)
+    update_fields = [
+        column for column in ("meaning", *OPTIONAL_WORD_FIELDS) if column in frame.columns
+    ]
+    return GroupImportPlan(
+        group_id=group_id,
+        inserts=merged[merged["_merge"] == "left_only"],
+        updates=merged[merged["_merge"] == "both"],
+        update_fields=update_fields,
+        has_star="star" in frame.columns,
+        skipped_rows=pd.concat(skipped),
+    )
+
+
+def apply_group_import(db: Session, plan: GroupImportPlan) -> dict[str, int]:
+    """Write ``plan`` with one bulk INSERT and at most two bulk UPDATEs."""
+
+    optional = [column for column in OPTIONAL_WORD_FIELDS if column in plan.update_fields]
+    removed: list[tuple[int, int]] = []
+    added: list[tuple[int, int]] = []
+    if not plan.inserts.empty:
+        records = _insert_records(plan.inserts.assign(group_id=plan.group_id))
+        db.execute(insert(models.Word), records)
+        added += [(plan.group_id, record.get("star") or 0) for record in records]
+
+    if not plan.updates.empty:
+        updates = plan.updates.copy()
+        updates["id"] = updates["id"].astype(int)
+        for column in optional:
+            updates[column] = updates[column].mask(updates[column] == "", None)
+        # Bulk UPDATEs bypass the ORM hook that refreshes the Hangul search keys.
+        updates["meaning_chosung"] = updates["meaning"].map(hangul_chosung)
+        updates["meaning_jamo"] = updates["meaning"].map(hangul_jamo)
+        columns = ["id", *plan.update_fields, "meaning_chosung", "meaning_jamo"]
+        if plan.has_star:
+            with_star = updates["star"].notna()
+            if with_star.any():
+                records = _records(updates[with_star], [*columns, "star"])
+                previous = lock_word_keys(db, [record["id"] for record in records])
+                db.execute(update(models.Word), records)
+                removed += [previous[record["id"]] for record in records]
+                added += [(plan.group_id, record["star"]) for record in records]
+            updates = updates[~with_star]
+        if not updates.empty:
+            db.execute(update(models.Word), _records(updates, columns))
+
+    adjust_group_counters(db, word_count_changes(removed=removed, added=added))
+
+    return {
+        "inserted": len(plan.inserts),
+        "updated": len(plan.updates),
+        "skipped": plan.skipped,
+    }
+
+
+@dataclass
+class StructuredImportPlan:
+    """Everything needed to apply a structured import without further lookups.
+
+    Folders are keyed by their normalized name because the language key is the
+    same for every row of one import. Groups are keyed by the folder key and the
+    lower-cased group name, keeping the first spelling seen in the sheet.
+    """
+
+    profile_id: int
+    default_language: str
+    folder_ids: dict[FolderKey, int] = field(default_factory=dict)
+    folders_to_create: dict[FolderKey, str] = field(default_factory=dict)
+    folders_to_backfill: set[int] = field(default_factory=set)
+    group_ids: dict[GroupKey, int] = field(default_factory=dict)
+    groups_to_create: dict[GroupKey, str] = field(default_factory=dict)
+    folder_names: dict[FolderKey, str] = field(default_factory=dict)
+    group_names: dict[GroupKey, str] = field(default_factory=dict)
+    words: pd.DataFrame = field(default_factory=pd.DataFrame)
+    skipped_rows: pd.DataFrame = field(default_factory=pd.DataFrame)
+
+    @property
+    def skipped(self) -> int:
+        return len(self.skipped_rows)
+
+
+def normalize_structured_frame(df: pd.DataFrame, default_language: str) -> pd.DataFrame:
+    """Normalize a ``folder/group/term/meaning`` sheet for :func:`plan_structured_import`.
+
+    Optional word fields (reading, pos, example, memo and star) are kept when the
+    sheet has them, so exported files can be imported again without losses.
+    """
+
+    frame = _normalize_word_frame(df, STRUCTURED_COLUMNS)
+    frame["language"] = frame["language"].mask(frame["language"] == "", default_language)
+    return _add_key_columns(frame, STRUCTURED_COLUMNS[:4])
+
+
+def plan_structured_import(
+    db: Session,
+    profile_id: int,
+    frame: pd.DataFrame,
+    default_language: str,
+) -> StructuredImportPlan:
+    """Resolve folders, groups and existing words for ``frame`` in three queries."""
+
+    plan = StructuredImportPlan(profile_id=profile_id, default_language=default_language)
+    language_key = default_language.lower()
+
+    valid = (frame[["folder", "group", "term", "meaning"]] != "").all(axis=1)
+    skipped = [frame[~valid].assign(reason="missing_field")]
+    frame = frame[valid]
+    duplicated = frame.duplicated(STRUCTURED_KEY_COLUMNS)
+    skipped.append(frame[duplicated].assign(reason="duplicate_in_file"))
+    frame = frame[~duplicated]
+    plan.words = frame
+
+    if frame.empty:
+        plan.skipped_rows = pd.concat(skipped)
+        return plan
+
+    folder_index: dict[tuple[str, str], tuple[int, str]] = {}
+    for folder_id, name, folder_language in (
+        db.query(models.Folder.id, models.Folder.name, models.Folder.default_language)
+        .filter(models.Folder.profile_id == profile_id)
+        .order_by(models.Folder.id)
+    ):
+        folder_index[(normalize_key(name), normalize_key(folder_language))] = (
+            folder_id,
+            normalize_cell(folder_language),
+        )
+
+    first_folders = frame.drop_duplicates("folder_key")
+    for name_key, name in zip(first_folders["folder_key"], first_folders["folder"]):
+        plan.folder_names[name_key] = name
+        match = folder_index.get((name_key, language_key))
+        if not match and language_key:
+            match = folder_index.get((name_key, ""))
+        if match:
+            folder_id, folder_language = match
+            plan.folder_ids[name_key] = folder_id
+            if not folder_language:
+                plan.folders_to_backfill.add(folder_id)
+        else:
+            plan.folders_to_create[name_key] = name
+
+    existing_groups: dict[tuple[int, str], int] = {}
+    if plan.folder_ids:
+        for group_id, folder_id, name in (
+            db.query(models.Group.id, models.Group.folder_id, models.Group.name)
+            .filter(
+                models.Group.profile_id == profile_id,
+                models.Group.folder_id.in_(set(plan.folder_ids.values())),
+            )
+            .order_by(models.Group.id)
+        ):
+            existing_groups.setdefault((folder_id, name), group_id)
+
+    first_groups = frame.drop_duplicates(["folder_key", "group_key"])
+    for folder_key, group_key, name in zip(
+        first_groups["folder_key"], first_groups["group_key"], first_groups["group"]
+    ):
+        plan.group_names[(folder_key, group_key)] = name
+        folder_id = plan.folder_ids.get(folder_key)
+        group_id = existing_groups.get((folder_id, name)) if folder_id else None
+        if group_id:
+            plan.group_ids[(folder_key, group_key)] = group_id
+        else:
+            plan.groups_to_create[(folder_key, group_key)] = name
+
+    if plan.group_ids:
+        group_frame = pd.DataFrame(
+            [(*key, group_id) for key, group_id in plan.group_ids.items()],
+            columns=["folder_key", "group_key", "group_id"],
+        )
+        existing = pd.DataFrame(
+            db.query(models.Word.group_id, models.Word.language, models.Word.term)
+            .filter(models.Word.group_id.in_(plan.group_ids.values()))
+            .all(),
+            columns=["group_id", "language", "term"],
+        )
+        existing = (
+            existing.assign(
+                language_key=existing["language"].astype(str).str.strip().str.lower(),
+                term_key=existing["term"].astype(str).str.strip().str.lower(),
+            )
+            .merge(group_frame, on="group_id")[STRUCTURED_KEY_COLUMNS]
+            .drop_duplicates()
+        )
+        merged = frame.merge(existing, on=STRUCTURED_KEY_COLUMNS, how="left", indicator=True)
+        surviving = merged["_merge"] == "left_only"
+        skipped.append(merged[~surviving].drop(columns="_merge").assign(reason="existing_word"))
+        plan.words = merged[surviving].drop(columns="_merge")
+
+    plan.skipped_rows = pd.concat(skipped)
+    return plan
+
+
+def apply_structured_import(
+    db: Session, plan: StructuredImportPlan
+) -> schemas.WordImportStructuredSummary:
+    """Write ``plan`` with one multi-row statement per table.
+
+    The caller owns the transaction and is expected to commit afterwards.
+    """
+
+    folder_ids = dict(plan.folder_ids)
+    if plan.folders_to_create:
+        # RETURNING order is only guaranteed with a per-row fallback on some
+        # backends, so map the new ids back through the (unique) names instead.
+        created = db.execute(
+            insert(models.Folder).returning(models.Folder.id, models.Folder.name),
+            [
+                {
+                    "name": name,
+                    "profile_id": plan.profile_id,
+                    "default_language": plan.default_language,
+                }
+                for name in plan.folders_to_create.values()
+            ],
+        ).all()
+        folder_ids.update((name.lower(), folder_id) for folder_id, name in created)
+
+    if plan.folders_to_backfill:
+        db.query(models.Folder).filter(
+            models.Folder.id.in_(plan.folders_to_backfill)
+        ).update({"default_language": plan.default_language}, synchronize_session=False)
+
+    group_ids = dict(plan.group_ids)
+    if plan.groups_to_create:
+        key_by_folder_id = {folder_id: key for key, folder_id in folder_ids.items()}
+        created = db.execute(
+            insert(models.Group).returning(
+                models.Group.id, models.Group.folder_id, models.Group.name
+            ),
+            [
+                {
+                    "folder_id": folder_ids[group_key[0]],
+                    "name": name,
+                    "profile_id": plan.profile_id,
+                }
+                for group_key, name in plan.groups_to_create.items()
+            ],
+        ).all()
+        group_ids.update(
+            ((key_by_folder_id[folder_id], name.lower()), group_id)
+            for group_id, folder_id, name in created
+        )
+
+    if not plan.words.empty:
+        group_frame = pd.DataFrame(
+            [(*key, group_id) for key, group_id in group_ids.items()],
+            columns=["folder_key", "group_key", "group_id"],
+        )
+        words = plan.words.merge(group_frame, on=["folder_key", "group_key"])
+        records = _insert_records(words)
+        db.execute(insert(models.Word), records)
+        adjust_group_counters(
+            db,
+            word_count_changes(
+                added=[(record["group_id"], record.get("star")) for record in records]
+            ),
+        )
+
+    return schemas.WordImportStructuredSummary(
+        inserted=len(plan.words),
+        skipped=plan.skipped,
+        folders_created=len(plan.folders_to_create),
+        groups_created=len(plan.groups_to_create),
+    )
+
+
+def _conflict_sample(rows: pd.DataFrame, limit: int) -> list[schemas.WordImportConflict]:
+    if rows.empty or limit <= 0:
+        return []
+    sample = rows.head(limit)
+    columns = [
+        column
+        for column in ("folder", "group", "language", "term", "meaning", "reason")
+        if column in sample.columns
+    ]
+    return [schemas.WordImportConflict(**record) for record in _records(sample, columns)]
+
+
+def preview_group_import(
+    plan: GroupImportPlan,
+    folder_name: str,
+    group_name: str,
+    sample_limit: int = IMPORT_PREVIEW_SAMPLE_LIMIT,
+) -> schemas.WordImportPreview:
+    """Describe what :func:`apply_group_import` would write for ``plan``."""
+
+    conflicts = pd.concat(
+        [
+            plan.updates.drop(columns=["_merge", "id"]).assign(reason="existing_word"),
+            plan.skipped_rows,
+        ]
+    ).assign(folder=folder_name, group=group_name)
+    return schemas.WordImportPreview(
+        inserted=len(plan.inserts),
+        updated=len(plan.updates),
+        skipped=plan.skipped,
+        groups=[
+            schemas.WordImportGroupPreview(
+                folder_name=folder_name,
+                group_name=group_name,
+                group_id=plan.group_id,
+                inserted=len(plan.inserts),
+                updated=len(plan.updates),
+                skipped=plan.skipped,
+            )
+        ],
+        conflicts=_conflict_sample(conflicts, sample_limit),
+    )
+
+
+def preview_structured_import(
+    plan: StructuredImportPlan,
+    sample_limit: int = IMPORT_PREVIEW_SAMPLE_LIMIT,
+) -> schemas.WordImportPreview:
+    """Describe what :func:`apply_structured_import` would write for ``plan``.
+
+    Counts are aggregated with ``groupby`` over the planned and skipped rows, so
+    the preview costs no more than planning itself. Rows without a folder or
+    group name only appear in the totals.
+    """
+
+    group_columns = ["folder_key", "group_key"]
+    skipped_rows = plan.skipped_rows
+    attributable = skipped_rows[
+        (skipped_rows["folder_key"] != "") & (skipped_rows["group_key"] != "")
+    ]
+    inserted = plan.words.groupby(group_columns).size()
+    skipped = attributable.groupby(group_columns).size()
+
+    groups = [
+        schemas.WordImportGroupPreview(
+            folder_name=plan.folder_names.get(group_key[0], group_key[0]),
+            group_name=name,
+            group_id=plan.group_ids.get(group_key),
+            inserted=int(inserted.get(group_key, 0)),
+            skipped=int(skipped.get(group_key, 0)),
+        )
+        for group_key, name in plan.group_names.items()
+    ]
+    # Groups whose rows were all incomplete are never planned, but their
+    # skipped rows still belong to a named group in the sheet.
+    first_rows = attributable.drop_duplicates(group_columns).set_index(group_columns)
+    for group_key, count in skipped.items():
+        if group_key in plan.group_names:
+            continue
+        first = first_rows.loc[group_key]
+        groups.append(
+            schemas.WordImportGroupPreview(
+                folder_name=first["folder"],
+                group_name=first["group"],
+                skipped=int(count),
+            )
+        )
+
+    return schemas.WordImportPreview(
+        inserted=len(plan.words),
+        updated=0,
+        skipped=plan.skipped,
+        folders_created=len(plan.folders_to_create),
+        groups_created=len(plan.groups_to_create),
+        groups=groups,
+        conflicts=_conflict_sample(skipped_rows, sample_limit),
+    )
@@ -0,0 +1,75 @@
+"""Fill missing ``reading`` values of Hanja words in bulk.
+
+Words without a reading are read ``READING_FILL_CHUNK_SIZE`` at a time by id,
+their readings are built with :func:`utils.hanja_lookup.hanja_reading` and each
+chunk is written with one executemany ``UPDATE`` keyed by primary key.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Session
+
+import models
+from utils.hanja_lookup import hanja_reading
+
+READING_FILL_CHUNK_SIZE = 1000
+
+
+@dataclass
+class ReadingFillResult:
+    filled: int = 0
+    skipped: int = 0
+    ambiguous: int = 0
+
+
+def fill_hanja_readings(
+    db: Session,
+    group_ids: list[int],
+    *,
+    include_ambiguous: bool = False,
+    dry_run: bool = False,
+    chunk_size: int = READING_FILL_CHUNK_SIZE,
+) -> ReadingFillResult:
+    """Fill empty readings of the words in ``group_ids``.
+
+    Words whose term has no Hanja are skipped. Readings that contain a
+    polyphonic character are counted as ambiguous and only written when
+    ``include_ambiguous`` is set. The caller commits.
+    """
+
+    result = ReadingFillResult()
+    if not group_ids:
+        return result
+    word = models.Word
+    last_id = 0
+    while True:
+        rows = db.execute(
+            select(word.id, word.term)
+            .where(
+                word.group_id.in_(group_ids),
+                or_(word.reading.is_(None), word.reading == ""),
+                word.id > last_id,
+            )
+            .order_by(word.id)
+            .limit(chunk_size)
+        ).all()
+        if not rows:
+            return result
+        last_id = rows[-1].id
+
+        updates = []
+        for word_id, term in rows:
+            reading, ambiguous = hanja_reading(term)
+            if not reading:
+                result.skipped += 1
+                continue
+            if ambiguous:
+                result.ambiguous += 1
+                if not include_ambiguous:
+                    continue
+            updates.append({"id": word_id, "reading": reading})
+        result.filled += len(updates)
+        if updates and not dry_run:
+            db.execute(update(models.Word), updates)
@@ -0,0 +1,289 @@
+"""Indexed full-text search over a user's words.
+
+Postgres matches substrings through a ``pg_trgm`` GIN index over the searchable
+columns. SQLite keeps an FTS5 shadow table (``words_fts``) with the trigram
+tokenizer; triggers on ``words`` keep it in sync for every write path,
+including bulk imports, cascaded deletes and raw SQL updates. Queries shorter
+than a trigram are served by the Hangul prefix search below instead, which
+matches the start of a term or meaning in any script.
+
+Hangul searches go through precomputed initial-consonant (``*_chosung``) and
+keystroke (``*_jamo``) columns instead, matched by prefix on plain B-tree
+indexes; see :mod:`utils.hangul`.
+"""
+from __future__ import annotations
+
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from utils.hangul import hangul_chosung, hangul_jamo, is_chosung_query
+
+LOGGER = logging.getLogger(__name__)
+
+SEARCH_FIELDS = ("term", "meaning", "reading", "example", "memo")
+# bm25 weights for SEARCH_FIELDS: a hit on the term matters most.
+_FTS_WEIGHTS = "10.0, 4.0, 4.0, 1.0, 1.0"
+# The trigram tokenizer cannot build a phrase from fewer than three characters.
+_FTS_MIN_QUERY_LENGTH = 3
+
+_PG_DOCUMENT_SQL = " || ' ' || ".join(
+    f"coalesce(words.{field}, '')" for field in SEARCH_FIELDS
+)
+
+_FTS_COLUMNS = ", ".join(SEARCH_FIELDS)
+_FTS_NEW_VALUES = ", ".join(f"new.{field}" for field in SEARCH_FIELDS)
+_FTS_OLD_VALUES = ", ".join(f"old.{field}" for field in SEARCH_FIELDS)
+_SQLITE_TRIGGERS = {
+    "words_fts_ai": f"""
+        CREATE TRIGGER words_fts_ai AFTER INSERT ON words BEGIN
+            INSERT INTO words_fts(rowid, {_FTS_COLUMNS}) VALUES (new.id, {_FTS_NEW_VALUES});
+        END
+    """,
+    "words_fts_ad": f"""
+        CREATE TRIGGER words_fts_ad AFTER DELETE ON words BEGIN
+            INSERT INTO words_fts(words_fts, rowid, {_FTS_COLUMNS})
+            VALUES ('delete', old.id, {_FTS_OLD_VALUES});
+        END
+    """,
+    "words_fts_au": f"""
+        CREATE TRIGGER words_fts_au AFTER UPDATE OF {_FTS_COLUMNS} ON words BEGIN
+            INSERT INTO words_fts(words_fts, rowid, {_FTS_COLUMNS})
+            VALUES ('delete', old.id, {_FTS_OLD_VALUES});
+            INSERT INTO words_fts(rowid, {_FTS_COLUMNS}) VALUES (new.id, {_FTS_NEW_VALUES});
+        END
+    """,
+}
+
+# Source columns per table that carry ``<source>_chosung``/``<source>_jamo`` keys.
+HANGUL_SEARCH_COLUMNS = {
+    "folders": ("name",),
+    "groups": ("name",),
+    "words": ("term", "meaning"),
+}
+# Every key ends below this code point, so ``key < prefix + _PREFIX_UPPER_BOUND``
+# closes a prefix range.
+_PREFIX_UPPER_BOUND = "\U0010ffff"
+
+_HIT_COLUMNS = """
+    words.id, words.group_id, groups.name AS group_name, folders.id AS folder_id,
+    folders.name AS folder_name, words.language, words.term, words.meaning,
+    words.reading, words.pos, words.example, words.memo, words.star
+"""
+
+
+def ensure_search_index(connection: Connection) -> None:
+    """Create the search index for the connected backend if it is missing."""
+
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        _ensure_sqlite_index(connection)
+    elif dialect == "postgresql":
+        _ensure_postgres_index(connection)
+
+
+def _ensure_sqlite_index(connection: Connection) -> None:
+    existing = {
+        row[0]
+        for row in connection.execute(
+            text(
+                "SELECT name FROM sqlite_master "
+                "WHERE type IN ('table', 'trigger') AND name LIKE 'words_fts%'"
+            )
+        )
+    }
+    if "words_fts" not in existing:
+        connection.execute(
+            text(
+                f"CREATE VIRTUAL TABLE words_fts USING fts5({_FTS_COLUMNS}, "
+                "content='words', content_rowid='id', tokenize='trigram')"
+            )
+        )
+    missing_triggers = [name for name in _SQLITE_TRIGGERS if name not in existing]
+    if not missing_triggers:
+        return
+    for name in missing_triggers:
+        connection.execute(text(_SQLITE_TRIGGERS[name]))
+    # Triggers disappear with the words table; whatever changed in between is
+    # unknown, so rebuild the shadow table from its content table.
+    connection.execute(text("INSERT INTO words_fts(words_fts) VALUES ('rebuild')"))
+
+
+def _ensure_postgres_index(connection: Connection) -> None:
+    savepoint = connection.begin_nested()
+    try:
+        connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        connection.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS idx_words_search_trgm ON words "
+                f"USING gin (({_PG_DOCUMENT_SQL}) gin_trgm_ops)"
+            )
+        )
+    except DBAPIError as exc:  # pragma: no cover - depends on database privileges
+        savepoint.rollback()
+        LOGGER.warning("pg_trgm search index unavailable, search will scan: %s", exc)
+    else:
+        savepoint.commit()
+
+
+def ensure_hangul_index(connection: Connection) -> None:
+    """Index the Hangul search keys and fill them in for rows that predate them."""
+
+    dialect = connection.dialect.name
+    # Postgres only uses a B-tree for ``LIKE 'prefix%'`` with the pattern opclass.
+    opclass = " text_pattern_ops" if dialect == "postgresql" else ""
+    for table, sources in HANGUL_SEARCH_COLUMNS.items():
+        key_columns = [
+            f"{source}_{suffix}" for source in sources for suffix in ("chosung", "jamo")
+        ]
+        for column in key_columns:
+            connection.execute(
+                text(
+                    f"CREATE INDEX IF NOT EXISTS idx_{table}_{column} "
+                    f"ON {table} ({column}{opclass})"
+                )
+            )
+
+        missing = connection.execute(
+            text(
+                f"SELECT id, {', '.join(sources)} FROM {table} "
+                f"WHERE {key_columns[1]} IS NULL"
+            )
+        ).all()
+        if not missing:
+            continue
+        assignments = ", ".join(f"{column} = :{column}" for column in key_columns)
+        params = []
+        for row in missing:
+            values = {"row_id": row.id}
+            for source in sources:
+                value = getattr(row, source)
+                values[f"{source}_chosung"] = hangul_chosung(value)
+                values[f"{source}_jamo"] = hangul_jamo(value)
+            params.append(values)
+        connection.execute(
+            text(f"UPDATE {table} SET {assignments} WHERE id = :row_id"), params
+        )
+
+
+def hangul_prefix_condition(
+    dialect: str, table: str, source: str, query: str
+) -> tuple[str, dict[str, str]]:
+    """Return a prefix filter on the Hangul key of ``table.source`` and its params.
+
+    Queries made of initial consonants only (``"ㅅㄱ"``) are matched against the
+    ``_chosung`` key; anything else is decomposed and matched against ``_jamo``.
+    """
+
+    if is_chosung_query(query):
+        column, key = f"{table}.{source}_chosung", hangul_chosung(query)
+    else:
+        column, key = f"{table}.{source}_jamo", hangul_jamo(query)
+    name = f"{table}_{source}_key"
+    if dialect == "postgresql":
+        return f"{column} LIKE :{name}", {name: _like_pattern(key)[1:]}
+    # SQLite ignores indexes for LIKE unless it is case sensitive, so use a range.
+    return (
+        f"({column} >= :{name} AND {column} < :{name}_end)",
+        {name: key, f"{name}_end": key + _PREFIX_UPPER_BOUND},
+    )
+
+
+def _like_pattern(query: str) -> str:
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def search_words(
+    db: Session, profile_id: int, query: str, *, limit: int, offset: int
+) -> tuple[list, bool]:
+    """Return ``limit`` ranked hits after ``offset`` and whether more exist."""
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite" and len(query) < _FTS_MIN_QUERY_LENGTH:
+        # FTS5 cannot match one or two characters, and a LIKE '%q%' would scan
+        # every word; the ``_jamo`` keys are case-folded for every script.
+        return search_words_hangul(db, profile_id, query, limit=limit, offset=offset)
+    params = {
+        "profile_id": profile_id,
+        "lowered": query.lower(),
+        "pattern": _like_pattern(query),
+        "prefix": _like_pattern(query)[1:],
+        "limit": limit + 1,
+        "offset": offset,
+    }
+    if dialect == "postgresql":
+        term_prefix = "words.term ILIKE :prefix"
+    else:
+        term_prefix = "lower(words.term) LIKE lower(:prefix) ESCAPE '\\'"
+    term_rank = f"""
+        CASE
+            WHEN lower(words.term) = :lowered THEN 0
+            WHEN {term_prefix} THEN 1
+            ELSE 2
+        END
+    """
+
+    if dialect == "sqlite" and len(query) >= _FTS_MIN_QUERY_LENGTH:
+        params["match"] = '"' + query.replace('"', '""') + '"'
+        statement = f"""
+            SELECT {_HIT_COLUMNS}
+            FROM words_fts
+            JOIN words ON words.id = words_fts.rowid
+            JOIN groups ON groups.id = words.group_id
+            JOIN folders ON folders.id = groups.folder_id
+            WHERE words_fts MATCH :match AND groups.profile_id = :profile_id
+            ORDER BY {term_rank}, bm25(words_fts, {_FTS_WEIGHTS}), words.id
+            LIMIT :limit OFFSET :offset
+        """
+    else:
+        if dialect == "postgresql":
+            condition = f"({_PG_DOCUMENT_SQL}) ILIKE :pattern"
+        else:
+            condition = " OR ".join(
+                f"lower(words.{field}) LIKE lower(:pattern) ESCAPE '\\'"
+                for field in SEARCH_FIELDS
+            )
+        statement = f"""
+            SELECT {_HIT_COLUMNS}
+            FROM words
+            JOIN groups ON groups.id = words.group_id
+            JOIN folders ON folders.id = groups.folder_id
+            WHERE groups.profile_id = :profile_id AND ({condition})
+            ORDER BY {term_rank}, length(words.term), words.id
+            LIMIT :limit OFFSET :offset
+        """
+    rows = db.execute(text(statement), params).all()
+    return rows[:limit], len(rows) > limit
+
+
+def search_words_hangul(
+    db: Session, profile_id: int, query: str, *, limit: int, offset: int
+) -> tuple[list, bool]:
+    """Prefix-match terms and meanings by initial consonants or partial syllables."""
+
+    dialect = db.get_bind().dialect.name
+    term_condition, params = hangul_prefix_condition(dialect, "words", "term", query)
+    meaning_condition, meaning_params = hangul_prefix_condition(
+        dialect, "words", "meaning", query
+    )
+    params.update(meaning_params, profile_id=profile_id, limit=limit + 1, offset=offset)
+    # SQLite would otherwise walk every group of the profile and all of its
+    # words; CROSS JOIN makes it start from the key indexes on ``words``.
+    join = "CROSS JOIN" if dialect == "sqlite" else "JOIN"
+    statement = f"""
+        SELECT {_HIT_COLUMNS}
+        FROM words
+        {join} groups ON groups.id = words.group_id
+        JOIN folders ON folders.id = groups.folder_id
+        WHERE groups.profile_id = :profile_id
+          AND ({term_condition} OR {meaning_condition})
+        ORDER BY CASE WHEN {term_condition} THEN 0 ELSE 1 END,
+                 length(words.term), words.id
+        LIMIT :limit OFFSET :offset
+    """
+    rows = db.execute(text(statement), params).all()
+    return rows[:limit], len(rows) > limit
@@ -0,0 +1,403 @@
+"""Per-word answer statistics.
+
+``word_stats`` holds one row per answered word: how many of its quiz questions
+were answered, how many correctly, the current run of correct answers, and
+the latest result. ``error_rate`` is stored next to a copy of the word's
+``group_id`` so a group's weakest words come straight off an index.
+``recent_error`` is the same rate as an exponential moving average: each
+answer moves it ``RECENT_ERROR_WEIGHT`` of the way towards 1 (wrong) or 0
+(right), so a word answered wrong long ago but right lately ranks as less weak.
+
+The same rows carry an SM-2 schedule per word and owner: ``repetitions``,
+``interval_days``, ``ease`` and ``next_due_at``, indexed by
+``(profile_id, next_due_at)`` for :func:`select_due_words`. A correct exam
+answer moves the next review out to 1 day, then 6 days, then
+``interval * ease``. A wrong one starts over at 1 day and lowers ease by
+``LAPSE_EASE_PENALTY``, never below ``MIN_EASE``.
+
+Quiz answers update the rows in their own transaction through
+:func:`record_word_answers`. Paths that delete, merge or move words keep them
+in step with :func:`fold_word_stats`, :func:`sync_word_stat_groups` or a plain
+DELETE, and :func:`backfill_word_stats` rebuilds the table from
+``quiz_questions``.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Iterable, Mapping
+
+from sqlalchemy import (
+    DateTime,
+    Float,
+    String,
+    bindparam,
+    case,
+    cast,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+import models
+
+_DIALECT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+FIRST_INTERVAL_DAYS = 1.0
+SECOND_INTERVAL_DAYS = 6.0
+MIN_EASE = 1.3
+LAPSE_EASE_PENALTY = 0.2
+RECENT_ERROR_WEIGHT = 0.3
+# Taken from the latest row when two words' stats are folded together.
+_LATEST_COLUMNS = (
+    "streak",
+    "recent_error",
+    "last_correct",
+    "last_answered_at",
+    "repetitions",
+    "interval_days",
+    "ease",
+    "next_due_at",
+)
+
+
+def _error_rate(attempts, correct):
+    return case(
+        (attempts > 0, cast(attempts - correct, Float) / attempts),
+        else_=0.0,
+    )
+
+
+def _after_days(dialect: str, moment: datetime, days):
+    """``moment`` plus a fractional number of ``days`` as a SQL expression."""
+
+    if dialect == "postgresql":
+        return bindparam("moment", moment, type_=DateTime) + func.make_interval(
+            0, 0, 0, 0, 0, 0, days * 86400
+        )
+    # SQLite date modifiers take fractional days: datetime(?, '+6.0 days').
+    return func.datetime(
+        bindparam("moment", moment, type_=DateTime),
+        literal("+") + cast(days, String) + literal(" days"),
+        type_=DateTime,
+    )
+
+
+def record_word_answers(
+    db: Session, results: Iterable[tuple[int, bool, bool]], *, schedule: bool = False
+) -> None:
+    """Count ``(word_id, is_correct, first_answer)`` results into ``word_stats``.
+
+    A first answer to a question is a new attempt; a re-answer only changes
+    the result of that attempt. Rows are created on demand and updated with
+    ``SET x = x + n`` so concurrent answers for one word are not lost. With
+    ``schedule`` first answers are also reviews for the SM-2 schedule; a
+    re-answer leaves the schedule alone so one question is one review.
+
+    A session can hold two questions for one word after duplicates were
+    merged, so results are folded per word first: their attempts add up and
+    the last result stands for the word.
+    """
+
+    added: dict[int, int] = {}
+    gained: dict[int, int] = {}
+    latest: dict[int, bool] = {}
+    reviewed_now: dict[int, bool] = {}
+    for word_id, is_correct, first in results:
+        added[word_id] = added.get(word_id, 0) + (1 if first else 0)
+        change = (1 if is_correct else 0) if first else (1 if is_correct else -1)
+        gained[word_id] = gained.get(word_id, 0) + change
+        latest[word_id] = is_correct
+        reviewed_now[word_id] = reviewed_now.get(word_id, False) or first
+    if not latest:
+        return
+    word_ids = list(latest)
+    stats = models.WordStat
+    dialect_insert = _DIALECT_INSERTS.get(db.get_bind().dialect.name)
+    missing = (
+        select(models.Word.id, models.Word.group_id, models.Group.profile_id)
+        .join(models.Group, models.Group.id == models.Word.group_id)
+        .where(models.Word.id.in_(word_ids))
+    )
+    columns = [stats.word_id, stats.group_id, stats.profile_id]
+    if dialect_insert is not None:
+        db.execute(
+            dialect_insert(stats)
+            .from_select(columns, missing)
+            .on_conflict_do_nothing(index_elements=[stats.word_id])
+        )
+    else:
+        db.execute(
+            insert(stats).from_select(
+                columns, missing.where(~models.Word.id.in_(select(stats.word_id)))
+            )
+        )
+
+    attempts = stats.attempts + case(added, value=stats.word_id, else_=0)
+    correct = stats.correct + case(gained, value=stats.word_id, else_=0)
+    result = case(latest, value=stats.word_id)
+    missed = case(
+        {word_id: 0.0 if is_correct else 1.0 for word_id, is_correct in latest.items()},
+        value=stats.word_id,
+    )
+    is_first = case(reviewed_now, value=stats.word_id)
+    # A re-answer swaps the result of the latest answer, whose share of the
+    # average is exactly RECENT_ERROR_WEIGHT.
+    swapped = stats.recent_error + RECENT_ERROR_WEIGHT * (2 * missed - 1)
+    recent_error = case(
+        (stats.attempts <= case((is_first, 0), else_=1), missed),
+        (is_first, stats.recent_error * (1 - RECENT_ERROR_WEIGHT) + RECENT_ERROR_WEIGHT * missed),
+        (swapped < 0, 0.0),
+        (swapped > 1, 1.0),
+        else_=swapped,
+    )
+    now = datetime.utcnow()
+    values = {
+        "attempts": attempts,
+        "correct": correct,
+        "streak": case((result, stats.streak + 1), else_=0),
+        "last_correct": result,
+        "last_answered_at": now,
+        "error_rate": _error_rate(attempts, correct),
+        "recent_error": recent_error,
+    }
+    if schedule:
+        lowered = stats.ease - LAPSE_EASE_PENALTY
+        interval = case(
+            (
+                result,
+                case(
+                    (stats.repetitions == 0, FIRST_INTERVAL_DAYS),
+                    (stats.repetitions == 1, SECOND_INTERVAL_DAYS),
+                    else_=stats.interval_days * stats.ease,
+                ),
+            ),
+            else_=FIRST_INTERVAL_DAYS,
+        )
+        reviewed = {
+            "repetitions": case((result, stats.repetitions + 1), else_=0),
+            "interval_days": interval,
+            "ease": case((result, stats.ease), (lowered < MIN_EASE, MIN_EASE), else_=lowered),
+            "next_due_at": _after_days(db.get_bind().dialect.name, now, interval),
+        }
+        values.update(
+            {
+                name: case((is_first, value), else_=getattr(stats, name))
+                for name, value in reviewed.items()
+            }
+        )
+    db.execute(
+        update(stats)
+        .where(stats.word_id.in_(word_ids))
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def select_due_words(
+    db: Session, profile_id: int, limit: int, now: datetime | None = None
+) -> list[tuple[models.Word, models.WordStat]]:
+    """Return up to ``limit`` of the profile's words due by ``now``, most overdue first.
+
+    Reads ``idx_word_stats_profile_due`` from its start, so the cost follows
+    ``limit`` rather than how many words are scheduled.
+    """
+
+    stats = models.WordStat
+    return (
+        db.query(models.Word, stats)
+        .join(stats, stats.word_id == models.Word.id)
+        .filter(
+            stats.profile_id == profile_id,
+            stats.next_due_at <= (now or datetime.utcnow()),
+        )
+        .order_by(stats.next_due_at)
+        .limit(limit)
+        .all()
+    )
+
+
+def weak_word_query(columns: Iterable, group_ids: Iterable[int]):
+    """Select ``columns`` for the words of ``group_ids`` ever missed, weakest first.
+
+    Filters and orders on ``idx_word_stats_group_recent``; callers add their
+    own conditions and limit to the returned ``Select``.
+    """
+
+    stats = models.WordStat
+    return (
+        select(*columns)
+        .join(stats, stats.word_id == models.Word.id)
+        .where(stats.group_id.in_(list(group_ids)), stats.recent_error > 0)
+        .order_by(stats.recent_error.desc(), stats.word_id.desc())
+    )
+
+
+def sync_word_stat_groups(db: Session, word_ids: Iterable[int]) -> None:
+    """Copy the current ``group_id`` of moved words onto their stats."""
+
+    word_ids = list(word_ids)
+    if not word_ids:
+        return
+    db.flush()
+    stats = models.WordStat
+    db.execute(
+        update(stats)
+        .where(stats.word_id.in_(word_ids))
+        .values(
+            group_id=select(models.Word.group_id)
+            .where(models.Word.id == stats.word_id)
+            .scalar_subquery()
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def fold_word_stats(db: Session, targets: Mapping[int, int]) -> None:
+    """Add the stats of each source word in ``targets`` to its target word.
+
+    Used before source words are deleted because their quiz questions were
+    re-pointed to the target. Attempts and correct answers are summed; the
+    streak and latest result come from whichever word was answered last.
+    """
+
+    if not targets:
+        return
+    stats = models.WordStat
+    involved = {*targets, *targets.values()}
+    rows = db.execute(select(stats).where(stats.word_id.in_(involved))).scalars().all()
+    if not rows:
+        return
+    merged: dict[int, dict] = {}
+    for row in sorted(rows, key=lambda row: row.last_answered_at or datetime.min):
+        target = targets.get(row.word_id, row.word_id)
+        entry = merged.setdefault(target, {"word_id": target, "attempts": 0, "correct": 0})
+        entry["attempts"] += row.attempts
+        entry["correct"] += row.correct
+        entry.update({name: getattr(row, name) for name in _LATEST_COLUMNS})
+    owners = {
+        word_id: (group_id, profile_id)
+        for word_id, group_id, profile_id in db.execute(
+            select(models.Word.id, models.Word.group_id, models.Group.profile_id)
+            .join(models.Group, models.Group.id == models.Word.group_id)
+            .where(models.Word.id.in_(merged))
+        )
+    }
+    db.execute(
+        delete(stats)
+        .where(stats.word_id.in_(involved))
+        .execution_options(synchronize_session=False)
+    )
+    db.execute(
+        insert(stats),
+        [
+            {
+                **entry,
+                "group_id": owners[word_id][0],
+                "profile_id": owners[word_id][1],
+                "error_rate": (
+                    (entry["attempts"] - entry["correct"]) / entry["attempts"]
+                    if entry["attempts"]
+                    else 0.0
+                ),
+            }
+            for word_id, entry in merged.items()
+        ],
+    )
+
+
+def backfill_word_stats(connection) -> None:
+    """Build ``word_stats`` from every answered quiz question.
+
+    Question ids stand in for answer order, so the streak is the number of
+    answers after a word's last wrong one and the latest result is whether its
+    last answer was that wrong one. The schedule is seeded from graded
+    answers only, by :func:`schedule_graded_history`. ``recent_error`` starts at the plain error rate, as the order of answers
+    before this table existed carries no weights.
+    """
+
+    connection.execute(
+        text(
+            """
+            WITH answers AS (
+                SELECT word_id,
+                       COUNT(*) AS attempts,
+                       SUM(CASE WHEN is_correct THEN 1 ELSE 0 END) AS correct,
+                       MAX(id) AS last_id,
+                       MAX(CASE WHEN is_correct THEN NULL ELSE id END) AS last_wrong_id,
+                       MAX(created_at) AS last_answered_at
+                FROM quiz_questions
+                WHERE is_correct IS NOT NULL
+                GROUP BY word_id
+            ),
+            streaks AS (
+                SELECT quiz_questions.word_id, COUNT(*) AS streak
+                FROM quiz_questions
+                JOIN answers ON answers.word_id = quiz_questions.word_id
+                WHERE quiz_questions.is_correct IS NOT NULL
+                  AND quiz_questions.id > COALESCE(answers.last_wrong_id, 0)
+                GROUP BY quiz_questions.word_id
+            )
+            INSERT INTO word_stats (
+                word_id, group_id, attempts, correct, streak,
+                last_correct, last_answered_at, error_rate,
+                profile_id, repetitions, interval_days, ease, next_due_at,
+                recent_error
+            )
+            SELECT words.id, words.group_id, answers.attempts, answers.correct,
+                   COALESCE(streaks.streak, 0),
+                   answers.last_wrong_id IS NULL OR answers.last_wrong_id < answers.last_id,
+                   answers.last_answered_at,
+                   CAST(answers.attempts - answers.correct AS FLOAT) / answers.attempts,
+                   groups.profile_id, 0, 0, 2.5, NULL,
+                   CAST(answers.attempts - answers.correct AS FLOAT) / answers.attempts
+            FROM answers
+            JOIN words ON words.id = answers.word_id
+            JOIN groups ON groups.id = words.group_id
+            LEFT JOIN streaks ON streaks.word_id = answers.word_id
+            """
+        )
+    )
+    schedule_graded_history(connection)
+
+
+def schedule_graded_history(connection) -> None:
+    """Seed the schedule of words answered in graded quizzes before it existed.
+
+    Only first-pass exam and weak-mode answers are reviews, so words with
+    nothing but study or retry answers stay unscheduled. A graded word starts
+    as if it had just lapsed: due :data:`FIRST_INTERVAL_DAYS` after its last
+    graded answer, which spreads old history out instead of making it all due
+    at once.
+    """
+
+    if connection.dialect.name == "postgresql":
+        due = "graded.last_answered_at + make_interval(secs => :offset)"
+        offset = FIRST_INTERVAL_DAYS * 86400
+    else:
+        due = "datetime(graded.last_answered_at, :offset)"
+        offset = f"+{FIRST_INTERVAL_DAYS} days"
+    connection.execute(
+        text(
+            f"""
+            UPDATE word_stats
+            SET repetitions = 0, interval_days = :days, next_due_at = {due}
+            FROM (
+                SELECT quiz_questions.word_id,
+                       MAX(quiz_questions.created_at) AS last_answered_at
+                FROM quiz_questions
+                JOIN quiz_sessions ON quiz_sessions.id = quiz_questions.session_id
+                WHERE quiz_questions.is_correct IS NOT NULL
+                  AND quiz_sessions.mode IN ('exam', 'weak')
+                  AND NOT quiz_sessions.is_retry
+                GROUP BY quiz_questions.word_id
+            ) AS graded
+            WHERE graded.word_id = word_stats.word_id
+            """
+        ).bindparams(days=FIRST_INTERVAL_DAYS, offset=offset)
+    )
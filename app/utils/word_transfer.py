@@ -0,0 +1,243 @@
+"""Bulk move and copy of words between groups.
+
+Words whose ``(language, term)`` is free in the target group are moved with one
+``UPDATE`` or copied with one ``INSERT ... SELECT``. Words that collide with
+the target (or with an earlier word of the same request) follow the conflict
+policy:
+
+``skip``
+    leave the word where it is.
+``overwrite``
+    copy the word's fields onto the word already in the target group. When
+    moving, quiz questions of the source word are re-pointed to that target
+    word before the source is removed, so exam history stays valid. Only the
+    first source (by id) overwrites a given target word; later ones are
+    skipped.
+``rename``
+    give the word the first free ``"term (n)"`` in the target group.
+
+Moving keeps word ids, so quiz questions of moved words need no change; only
+the group copied onto their ``word_stats`` rows follows them.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Literal
+
+from sqlalchemy import bindparam, delete, insert, literal, select, update
+from sqlalchemy.orm import Session
+
+import models
+from utils.group_counters import adjust_group_counters, lock_word_keys, word_count_changes
+from utils.hangul import hangul_chosung, hangul_jamo
+from utils.word_stats import fold_word_stats, sync_word_stat_groups
+
+TransferAction = Literal["move", "copy"]
+ConflictPolicy = Literal["skip", "overwrite", "rename"]
+
+# Fields copied onto the existing word when overwriting.
+OVERWRITE_FIELDS = ("meaning", "reading", "pos", "example", "memo", "star")
+# Columns carried over by a copy besides ``group_id``.
+COPY_COLUMNS = (
+    "language",
+    "term",
+    *OVERWRITE_FIELDS,
+    "term_chosung",
+    "term_jamo",
+    "meaning_chosung",
+    "meaning_jamo",
+)
+_RENAMED_COLUMNS = ("term", "term_chosung", "term_jamo")
+
+
+@dataclass
+class TransferPlan:
+    """Source words of one request sorted by how they reach the target group."""
+
+    target_group_id: int
+    plain_ids: list[int] = field(default_factory=list)
+    renames: dict[int, str] = field(default_factory=dict)
+    # source word id -> id of the target word it overwrites
+    overwrites: dict[int, int] = field(default_factory=dict)
+    skipped_ids: list[int] = field(default_factory=list)
+    unchanged_ids: list[int] = field(default_factory=list)
+    source_group_ids: set[int] = field(default_factory=set)
+
+
+def _free_name(term: str, taken: set[str]) -> str:
+    suffix = 2
+    while f"{term} ({suffix})" in taken:
+        suffix += 1
+    return f"{term} ({suffix})"
+
+
+def plan_transfer(
+    db: Session,
+    word_ids: list[int],
+    target_group_id: int,
+    action: TransferAction,
+    on_conflict: ConflictPolicy,
+) -> TransferPlan:
+    """Classify ``word_ids`` against the words already in the target group."""
+
+    plan = TransferPlan(target_group_id=target_group_id)
+    sources = db.execute(
+        select(models.Word.id, models.Word.group_id, models.Word.language, models.Word.term)
+        .where(models.Word.id.in_(word_ids))
+        .order_by(models.Word.id)
+    ).all()
+    existing = {
+        (language, term): word_id
+        for word_id, language, term in db.execute(
+            select(models.Word.id, models.Word.language, models.Word.term).where(
+                models.Word.group_id == target_group_id
+            )
+        )
+    }
+    overwritten: set[int] = set()
+    taken_terms: dict[str, set[str]] = {}
+    for language, term in existing:
+        taken_terms.setdefault(language, set()).add(term)
+
+    for word_id, group_id, language, term in sources:
+        plan.source_group_ids.add(group_id)
+        if action == "move" and group_id == target_group_id:
+            plan.unchanged_ids.append(word_id)
+            continue
+        taken = taken_terms.setdefault(language, set())
+        if term not in taken:
+            plan.plain_ids.append(word_id)
+            taken.add(term)
+            continue
+        holder = existing.get((language, term))
+        if on_conflict == "rename":
+            name = _free_name(term, taken)
+            plan.renames[word_id] = name
+            taken.add(name)
+        elif (
+            on_conflict == "overwrite"
+            and holder is not None
+            and holder != word_id
+            and holder not in overwritten
+        ):
+            plan.overwrites[word_id] = holder
+            overwritten.add(holder)
+        else:
+            # Collisions inside the request have no stored word left to overwrite.
+            plan.skipped_ids.append(word_id)
+    return plan
+
+
+def _apply_overwrites(db: Session, plan: TransferPlan, action: TransferAction) -> None:
+    source_columns = [getattr(models.Word, name) for name in OVERWRITE_FIELDS]
+    rows = db.execute(
+        select(models.Word.id, *source_columns)
+        .where(models.Word.id.in_(plan.overwrites))
+        .order_by(models.Word.id)
+    ).all()
+    db.execute(
+        update(models.Word),
+        [
+            {
+                "id": plan.overwrites[row.id],
+                **{name: getattr(row, name) for name in OVERWRITE_FIELDS},
+                "meaning_chosung": hangul_chosung(row.meaning),
+                "meaning_jamo": hangul_jamo(row.meaning),
+            }
+            for row in rows
+        ],
+    )
+    if action != "move":
+        return
+    questions = models.QuizQuestion.__table__
+    db.execute(
+        update(questions)
+        .where(questions.c.word_id == bindparam("source_id"))
+        .values(word_id=bindparam("target_id")),
+        [
+            {"source_id": source_id, "target_id": target_id}
+            for source_id, target_id in plan.overwrites.items()
+        ],
+    )
+    fold_word_stats(db, plan.overwrites)
+    db.execute(
+        delete(models.Word)
+        .where(models.Word.id.in_(plan.overwrites))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def apply_transfer(db: Session, plan: TransferPlan, action: TransferAction) -> None:
+    """Write ``plan`` into the target group."""
+
+    target = plan.target_group_id
+    carried = [*plan.plain_ids, *plan.renames]
+    keys = lock_word_keys(db, [*carried, *plan.overwrites, *plan.overwrites.values()])
+    if plan.plain_ids:
+        if action == "move":
+            db.execute(
+                update(models.Word)
+                .where(models.Word.id.in_(plan.plain_ids))
+                .values(group_id=target)
+                .execution_options(synchronize_session=False)
+            )
+        else:
+            columns = [getattr(models.Word, name) for name in COPY_COLUMNS]
+            db.execute(
+                insert(models.Word).from_select(
+                    ["group_id", *COPY_COLUMNS],
+                    select(literal(target), *columns)
+                    .where(models.Word.id.in_(plan.plain_ids))
+                    .order_by(models.Word.id),
+                )
+            )
+
+    if plan.renames:
+        renamed = {
+            word_id: {
+                "term": term,
+                "term_chosung": hangul_chosung(term),
+                "term_jamo": hangul_jamo(term),
+            }
+            for word_id, term in plan.renames.items()
+        }
+        if action == "move":
+            db.execute(
+                update(models.Word),
+                [
+                    {"id": word_id, "group_id": target, **values}
+                    for word_id, values in renamed.items()
+                ],
+            )
+        else:
+            copy_fields = [name for name in COPY_COLUMNS if name not in _RENAMED_COLUMNS]
+            rows = db.execute(
+                select(models.Word.id, *[getattr(models.Word, name) for name in copy_fields])
+                .where(models.Word.id.in_(plan.renames))
+                .order_by(models.Word.id)
+            ).all()
+            db.execute(
+                insert(models.Word),
+                [
+                    {
+                        "group_id": target,
+                        **{name: getattr(row, name) for name in copy_fields},
+                        **renamed[row.id],
+                    }
+                    for row in rows
+                ],
+            )
+
+    if plan.overwrites:
+        _apply_overwrites(db, plan, action)
+    if action == "move":
+        sync_word_stat_groups(db, [*plan.plain_ids, *plan.renames])
+
+    # Each carried word lands in the target with its star; an overwritten
+    # word takes its source's star; moving also takes the sources away.
+    sources = [word_id for word_id in [*carried, *plan.overwrites] if word_id in keys]
+    removed = [keys[holder] for holder in plan.overwrites.values() if holder in keys]
+    added = [(target, keys[word_id][1]) for word_id in sources]
+    if action == "move":
+        removed += [keys[word_id] for word_id in sources]
+    adjust_group_counters(db, word_count_changes(removed=removed, added=added))
@@ -0,0 +1,135 @@
+"""Import every sheet of an XLSX workbook.
+
+Textbooks often ship as one workbook with a sheet per unit. Each sheet becomes
+a group named after the sheet inside one folder, unless the sheet has its own
+``folder``/``group`` columns, in which case those win row by row.
+
+openpyxl spends most of an import parsing cells, so sheets are parsed in a
+process pool (:func:`utils.table_reader.read_xlsx_sheet` opens the workbook in
+each worker). Writes stay in the calling thread and go through the structured
+bulk path one sheet at a time, in the order the sheets finish parsing.
+"""
+from __future__ import annotations
+
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+import multiprocessing
+import os
+from typing import Literal
+
+import pandas as pd
+from sqlalchemy.orm import Session
+
+import schemas
+from utils.table_reader import read_xlsx_sheet
+from utils.word_import import (
+    apply_structured_import,
+    normalize_structured_frame,
+    plan_structured_import,
+)
+
+SHEET_REQUIRED_COLUMNS = {"term", "meaning"}
+# Spawning a worker costs about a second of imports, so smaller workbooks are
+# parsed in the calling thread.
+PARALLEL_PARSE_MIN_BYTES = 1024 * 1024
+
+
+@dataclass
+class SheetProgress:
+    name: str
+    status: Literal["pending", "parsing", "imported", "skipped", "failed"] = "pending"
+    rows: int = 0
+    inserted: int = 0
+    skipped: int = 0
+    message: str | None = None
+
+
+def sheet_words(
+    frame: pd.DataFrame, folder_name: str, sheet_name: str, default_language: str
+) -> pd.DataFrame:
+    """Fill missing folder/group cells of a sheet and normalize it."""
+
+    frame = frame.loc[:, ~frame.columns.duplicated(keep="last")].copy()
+    for column, fallback in (("folder", folder_name), ("group", sheet_name)):
+        if column not in frame.columns:
+            frame[column] = fallback
+            continue
+        values = frame[column].astype(str).str.strip()
+        frame[column] = values.mask(values == "", fallback)
+    return normalize_structured_frame(frame, default_language)
+
+
+def _parse_workers(path: str, sheet_count: int, max_workers: int | None) -> int:
+    if os.path.getsize(path) < PARALLEL_PARSE_MIN_BYTES:
+        return 1
+    workers = max_workers or os.cpu_count() or 1
+    return max(1, min(workers, sheet_count))
+
+
+def import_workbook(
+    db: Session,
+    profile_id: int,
+    path: str,
+    sheets: list[SheetProgress],
+    *,
+    folder_name: str,
+    default_language: str,
+    max_workers: int | None = None,
+) -> schemas.WordImportStructuredSummary:
+    """Import the ``sheets`` of the workbook at ``path``, updating their progress.
+
+    A sheet that cannot be read or lacks term/meaning columns is marked and
+    skipped; the others are still imported. The caller commits.
+    """
+
+    totals = schemas.WordImportStructuredSummary(
+        inserted=0, skipped=0, folders_created=0, groups_created=0
+    )
+
+    def write(sheet: SheetProgress, parsed: Future) -> None:
+        try:
+            frame = parsed.result()
+        except Exception as exc:
+            sheet.status = "failed"
+            sheet.message = f"시트를 읽을 수 없습니다: {exc}"
+            return
+        missing = SHEET_REQUIRED_COLUMNS - set(frame.columns)
+        if missing:
+            sheet.status = "skipped"
+            sheet.message = f"필수 컬럼 누락: {', '.join(sorted(missing))}"
+            return
+        words = sheet_words(frame, folder_name, sheet.name, default_language)
+        summary = apply_structured_import(
+            db, plan_structured_import(db, profile_id, words, default_language)
+        )
+        sheet.rows = len(words)
+        sheet.inserted = summary.inserted
+        sheet.skipped = summary.skipped
+        sheet.status = "imported"
+        totals.inserted += summary.inserted
+        totals.skipped += summary.skipped
+        totals.folders_created += summary.folders_created
+        totals.groups_created += summary.groups_created
+
+    workers = _parse_workers(path, len(sheets), max_workers)
+    if workers == 1:
+        for sheet in sheets:
+            sheet.status = "parsing"
+            parsed: Future = Future()
+            try:
+                parsed.set_result(read_xlsx_sheet(path, sheet.name))
+            except Exception as exc:
+                parsed.set_exception(exc)
+            write(sheet, parsed)
+        return totals
+
+    # ``spawn`` keeps the workers free of the server's threads and connections.
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = {}
+        for sheet in sheets:
+            sheet.status = "parsing"
+            futures[pool.submit(read_xlsx_sheet, path, sheet.name)] = sheet
+        for future in as_completed(futures):
+            write(futures[future], future)
+    return totals
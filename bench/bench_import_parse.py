@@ -0,0 +1,89 @@
+"""Compare the word import parsers on a large generated sheet.
+
+Run with ``python bench/bench_import_parse.py [megabytes]`` (default 100). The
+baseline is what ``POST /words/import`` did before: ``pd.read_csv`` with
+``sep=None`` on the Python engine. The fast path sniffs a sample and parses
+with pyarrow when it is installed, otherwise with the C engine (see
+:mod:`utils.table_reader`). XLSX is compared at a tenth of the size, since
+workbooks that large are rare.
+"""
+from __future__ import annotations
+
+from io import BytesIO, StringIO
+import os
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+APP_PATH = Path(__file__).resolve().parents[1] / "app"
+if str(APP_PATH) not in sys.path:
+    sys.path.insert(0, str(APP_PATH))
+os.environ.setdefault("DB_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+
+from openpyxl import Workbook  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from utils import table_reader  # noqa: E402
+
+HEADER = "language\tterm\tmeaning\treading\texample\tstar\n"
+
+
+def build_csv(megabytes: float) -> bytes:
+    lines = [HEADER]
+    size = len(HEADER)
+    index = 0
+    while size < megabytes * 1024 * 1024:
+        line = f"en\tword{index}\t단어 {index}의 뜻, 설명\t\tThis is word {index}.\t{index % 6}\n"
+        lines.append(line)
+        size += len(line.encode("utf-8"))
+        index += 1
+    return "".join(lines).encode("utf-8")
+
+
+def build_xlsx(rows: int) -> bytes:
+    # A regular workbook uses shared strings and records its dimension, like Excel.
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(HEADER.strip().split("\t"))
+    for index in range(rows):
+        sheet.append(["en", f"word{index}", f"단어 {index}의 뜻", None, f"word {index}.", index % 6])
+    buffer = BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def timed(label: str, func, content: bytes) -> float:
+    started = time.perf_counter()
+    frame = func(content)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<24} {elapsed:8.2f} s  rows={len(frame)}")
+    return elapsed
+
+
+def python_engine(content: bytes) -> pd.DataFrame:
+    return pd.read_csv(StringIO(content.decode("utf-8")), sep=None, engine="python")
+
+
+def main() -> None:
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 100.0
+    content = build_csv(megabytes)
+    print(f"csv: {len(content) / 1024 / 1024:.1f} MiB")
+    baseline = timed("python engine, sep=None", python_engine, content)
+    engines = ["c"] + (["pyarrow"] if table_reader.CSV_ENGINE == "pyarrow" else [])
+    for engine in engines:
+        table_reader.CSV_ENGINE = engine
+        elapsed = timed(f"sniff + {engine}", table_reader.read_delimited, content)
+        print(f"{'':<24} {baseline / elapsed:8.1f}x faster")
+
+    rows = sum(1 for _ in BytesIO(content)) // 10
+    workbook = build_xlsx(rows)
+    print(f"xlsx: {len(workbook) / 1024 / 1024:.1f} MiB, {rows} rows")
+    # Both go through openpyxl's per-cell parser, which dominates the time.
+    baseline = timed("pd.read_excel", lambda data: pd.read_excel(BytesIO(data)), workbook)
+    elapsed = timed("read-only stream", table_reader.read_xlsx, workbook)
+    print(f"{'':<24} {baseline / elapsed:8.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
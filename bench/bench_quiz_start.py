@@ -0,0 +1,128 @@
+"""Compare quiz start latency with per-question flushes and one bulk INSERT.
+
+Run with ``python bench/bench_quiz_start.py``; set ``DB_URL`` to benchmark
+against PostgreSQL, where every flush is a network round trip. The baseline
+replays what ``POST /quizzes/start`` did before: load ``Word`` objects, then
+add and flush one ``QuizQuestion`` at a time. The current path is
+:func:`routers.quizzes.start_quiz` itself.
+"""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import random
+import sys
+import tempfile
+import time
+
+APP_PATH = Path(__file__).resolve().parents[1] / "app"
+if str(APP_PATH) not in sys.path:
+    sys.path.insert(0, str(APP_PATH))
+os.environ.setdefault("DB_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+
+from sqlalchemy import insert  # noqa: E402
+
+import database  # noqa: E402
+import models  # noqa: E402
+import schemas  # noqa: E402
+from routers.quizzes import start_quiz  # noqa: E402
+
+SIZES = (50, 500, 5000)
+
+
+def per_question_flush(db, profile, group_id: int) -> None:
+    words = db.query(models.Word).filter(models.Word.group_id == group_id).all()
+    random.shuffle(words)
+    session = models.QuizSession(
+        profile_id=profile.id,
+        group_id=group_id,
+        direction="term_to_meaning",
+        mode="exam",
+        randomize=True,
+        total_questions=len(words),
+    )
+    db.add(session)
+    db.flush()
+    created = []
+    for position, word in enumerate(words, start=1):
+        question = models.QuizQuestion(
+            session_id=session.id,
+            word_id=word.id,
+            position=position,
+            prompt_text=word.term,
+            answer_text=word.meaning,
+        )
+        db.add(question)
+        db.flush()
+        created.append((question, word))
+    db.commit()
+    [
+        schemas.QuizQuestionOut(
+            id=question.id,
+            word_id=question.word_id,
+            position=question.position,
+            prompt=question.prompt_text,
+            answer=question.answer_text,
+            star=word.star,
+            reading=word.reading,
+        )
+        for question, word in created
+    ]
+
+
+def bulk_insert(db, profile, group_id: int) -> None:
+    start_quiz(
+        schemas.QuizStartRequest(group_ids=[group_id]),
+        accept=None,
+        db=db,
+        current_user=profile,
+    )
+
+
+def best_of(func, profile_id: int, group_id: int, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        # A fresh session per run, as each request gets one.
+        db = database.SessionLocal()
+        try:
+            profile = db.get(models.Profile, profile_id)
+            started = time.perf_counter()
+            func(db, profile, group_id)
+            best = min(best, time.perf_counter() - started)
+        finally:
+            db.close()
+    return best
+
+
+def main() -> None:
+    database.ensure_schema()
+    db = database.SessionLocal()
+    profile = models.Profile(username=f"bench-{time.time_ns()}", name="Bench")
+    folder = models.Folder(name="Bench", profile=profile)
+    db.add(folder)
+    db.commit()
+    print(f"{'words':>6} {'per-flush':>12} {'bulk':>12} {'speedup':>8}")
+    for size in SIZES:
+        group = models.Group(name=f"{size} words", folder=folder, profile=profile)
+        db.add(group)
+        db.flush()
+        db.execute(
+            insert(models.Word),
+            [
+                {"group_id": group.id, "language": "en", "term": f"w{i}", "meaning": f"뜻 {i}"}
+                for i in range(size)
+            ],
+        )
+        db.commit()
+        group_id = group.id
+        baseline = best_of(per_question_flush, profile.id, group_id)
+        current = best_of(bulk_insert, profile.id, group_id)
+        print(
+            f"{size:>6} {baseline * 1000:>9.1f} ms {current * 1000:>9.1f} ms "
+            f"{baseline / current:>7.1f}x"
+        )
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
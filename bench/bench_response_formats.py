@@ -0,0 +1,90 @@
+"""Compare payload size and serialization time of the word list formats.
+
+Run with ``python bench/bench_response_formats.py [rows]``. The JSON baseline
+mirrors what ``GET /words`` does by default: one ``WordOut`` per row,
+dumped and rendered as FastAPI does for a ``response_model``. The compact forms transpose the same result tuples
+(see :mod:`utils.response_formats`).
+"""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+APP_PATH = Path(__file__).resolve().parents[1] / "app"
+if str(APP_PATH) not in sys.path:
+    sys.path.insert(0, str(APP_PATH))
+os.environ.setdefault("DB_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+import schemas  # noqa: E402
+from utils.response_formats import columnar, msgpack, render_compact  # noqa: E402
+
+COLUMNS = tuple(schemas.WordOut.model_fields)
+WORD_LIST = TypeAdapter(list[schemas.WordOut])
+
+
+def build_rows(rows: int) -> list[tuple]:
+    return [
+        (
+            index,
+            1,
+            "en",
+            f"word{index}",
+            f"단어 {index}의 뜻",
+            None,
+            "noun" if index % 3 else None,
+            None,
+            None,
+            index % 6,
+        )
+        for index in range(rows)
+    ]
+
+
+def pydantic_json(rows: list[tuple]) -> bytes:
+    # What FastAPI does for ``response_model``: validate, dump to JSON types, render.
+    validated = WORD_LIST.validate_python([dict(zip(COLUMNS, row)) for row in rows])
+    return JSONResponse(WORD_LIST.dump_python(validated, mode="json")).body
+
+
+def columnar_json(rows: list[tuple]) -> bytes:
+    return render_compact(columnar(COLUMNS, rows), "columnar").body
+
+
+def columnar_msgpack(rows: list[tuple]) -> bytes:
+    return render_compact(columnar(COLUMNS, rows), "msgpack").body
+
+
+def timed(label: str, func, rows: list[tuple], repeat: int = 3) -> tuple[float, int]:
+    best = float("inf")
+    body = b""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = func(rows)
+        best = min(best, time.perf_counter() - started)
+    print(f"{label:<18} {best * 1000:10.1f} ms {len(body) / 1024:10.1f} KiB")
+    return best, len(body)
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    rows = build_rows(count)
+    print(f"rows={count}")
+    base_time, base_size = timed("objects (json)", pydantic_json, rows)
+    variants = [("columnar json", columnar_json)]
+    if msgpack is not None:
+        variants.append(("columnar msgpack", columnar_msgpack))
+    else:
+        print("msgpack is not installed; skipping the MessagePack variant")
+    for label, func in variants:
+        elapsed, size = timed(label, func, rows)
+        print(f"{'':<18} {base_time / elapsed:9.1f}x faster {base_size / size:6.1f}x smaller")
+
+
+if __name__ == "__main__":
+    main()
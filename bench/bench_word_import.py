@@ -0,0 +1,174 @@
+"""Compare the per-row import path with the column-wise bulk engine.
+
+Run with ``python bench/bench_word_import.py [rows]``. Each variant imports the
+same synthetic sheet into a fresh SQLite database, once through a copy of the
+old row-by-row loop and once through :mod:`utils.word_import`.
+"""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+APP_PATH = Path(__file__).resolve().parents[1] / "app"
+if str(APP_PATH) not in sys.path:
+    sys.path.insert(0, str(APP_PATH))
+os.environ.setdefault("DB_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+
+import database  # noqa: E402
+import models  # noqa: E402
+from utils.word_import import (  # noqa: E402
+    apply_group_import,
+    apply_structured_import,
+    normalize_cell,
+    normalize_group_frame,
+    normalize_structured_frame,
+    plan_group_import,
+    plan_structured_import,
+)
+
+
+def build_frame(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    terms = rng.integers(0, rows // 2, size=rows)
+    return pd.DataFrame(
+        {
+            "folder": [f" Folder{value % 5} " for value in terms],
+            "group": [f"Day{value % 40}" for value in terms],
+            "language": ["en"] * rows,
+            "term": [f"Word{value}" if value % 97 else None for value in terms],
+            "meaning": [f"meaning {value}" for value in terms],
+        }
+    )
+
+
+def fresh_session():
+    models.Base.metadata.drop_all(bind=database.engine)
+    models.Base.metadata.create_all(bind=database.engine)
+    db = database.SessionLocal()
+    profile = models.Profile(username="bench", name="bench")
+    folder = models.Folder(name="Bench", profile=profile)
+    group = models.Group(name="Day", folder=folder, profile=profile)
+    db.add_all([profile, folder, group])
+    db.commit()
+    return db, profile.id, group.id
+
+
+def legacy_structured(db, profile_id: int, _group_id: int, df: pd.DataFrame) -> None:
+    folders: dict[str, models.Folder] = {}
+    groups: dict[tuple[int, str], models.Group] = {}
+    words: dict[int, set[tuple[str, str]]] = {}
+    for row in df.to_dict(orient="records"):
+        folder_name = normalize_cell(row.get("folder"))
+        group_name = normalize_cell(row.get("group"))
+        term = normalize_cell(row.get("term"))
+        meaning = normalize_cell(row.get("meaning"))
+        language = normalize_cell(row.get("language")) or "기본"
+        if not folder_name or not group_name or not term or not meaning:
+            continue
+        folder = folders.get(folder_name.lower())
+        if not folder:
+            folder = models.Folder(name=folder_name, profile_id=profile_id)
+            db.add(folder)
+            db.flush()
+            folders[folder_name.lower()] = folder
+        group = groups.get((folder.id, group_name.lower()))
+        if not group:
+            group = (
+                db.query(models.Group)
+                .filter(models.Group.folder_id == folder.id, models.Group.name == group_name)
+                .one_or_none()
+            )
+            if not group:
+                group = models.Group(folder_id=folder.id, name=group_name, profile_id=profile_id)
+                db.add(group)
+                db.flush()
+            groups[(folder.id, group_name.lower())] = group
+        if group.id not in words:
+            words[group.id] = {
+                (lang.lower(), value.lower())
+                for lang, value in db.query(models.Word.language, models.Word.term).filter(
+                    models.Word.group_id == group.id
+                )
+            }
+        key = (language.lower(), term.lower())
+        if key in words[group.id]:
+            continue
+        db.add(models.Word(group_id=group.id, language=language, term=term, meaning=meaning))
+        words[group.id].add(key)
+    db.commit()
+
+
+def bulk_structured(db, profile_id: int, _group_id: int, df: pd.DataFrame) -> None:
+    frame = normalize_structured_frame(df, "기본")
+    apply_structured_import(db, plan_structured_import(db, profile_id, frame, "기본"))
+    db.commit()
+
+
+def legacy_group(db, _profile_id: int, group_id: int, df: pd.DataFrame) -> None:
+    for row in df.to_dict(orient="records"):
+        if not isinstance(row["term"], str):
+            continue
+        word = (
+            db.query(models.Word)
+            .filter(
+                models.Word.group_id == group_id,
+                models.Word.language == row["language"],
+                models.Word.term == row["term"],
+            )
+            .one_or_none()
+        )
+        if word:
+            word.meaning = row["meaning"]
+        else:
+            db.add(
+                models.Word(
+                    group_id=group_id,
+                    language=row["language"],
+                    term=row["term"],
+                    meaning=row["meaning"],
+                )
+            )
+            # The old loop relied on autoflush being off; flush so in-file
+            # duplicates become updates instead of unique-key violations.
+            db.flush()
+    db.commit()
+
+
+def bulk_group(db, _profile_id: int, group_id: int, df: pd.DataFrame) -> None:
+    apply_group_import(db, plan_group_import(db, group_id, normalize_group_frame(df)))
+    db.commit()
+
+
+def timed(label: str, func, df: pd.DataFrame) -> float:
+    db, profile_id, group_id = fresh_session()
+    try:
+        started = time.perf_counter()
+        func(db, profile_id, group_id, df)
+        elapsed = time.perf_counter() - started
+    finally:
+        db.close()
+    print(f"{label:<22} {elapsed * 1000:10.1f} ms")
+    return elapsed
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    df = build_frame(rows)
+    print(f"rows={rows}")
+    for name, legacy, bulk in (
+        ("import-structured", legacy_structured, bulk_structured),
+        ("import", legacy_group, bulk_group),
+    ):
+        slow = timed(f"{name} per-row", legacy, df)
+        fast = timed(f"{name} bulk", bulk, df)
+        print(f"{name:<22} {slow / fast:10.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
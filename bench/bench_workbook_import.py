@@ -0,0 +1,84 @@
+"""Measure how multi-sheet workbook imports scale with parse workers.
+
+Run with ``python bench/bench_workbook_import.py [sheets] [rows_per_sheet]``
+(default 8 sheets of 20000 rows). The whole import runs against a throwaway
+SQLite database once per worker count, up to ``os.cpu_count()``, each time
+for a fresh profile so every run inserts the same rows.
+"""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+APP_PATH = Path(__file__).resolve().parents[1] / "app"
+if str(APP_PATH) not in sys.path:
+    sys.path.insert(0, str(APP_PATH))
+os.environ.setdefault("DB_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+
+from openpyxl import Workbook  # noqa: E402
+
+import database  # noqa: E402
+import models  # noqa: E402
+from utils import workbook_import  # noqa: E402
+from utils.workbook_import import SheetProgress, import_workbook  # noqa: E402
+
+
+def build_workbook(path: Path, sheets: int, rows: int) -> None:
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    for number in range(sheets):
+        sheet = workbook.create_sheet(f"Unit {number + 1}")
+        sheet.append(["language", "term", "meaning", "example", "star"])
+        for index in range(rows):
+            sheet.append(["en", f"u{number}w{index}", f"뜻 {index}", f"word {index}.", index % 6])
+    workbook.save(path)
+
+
+def run(path: str, sheet_names: list[str], workers: int) -> float:
+    db = database.SessionLocal()
+    try:
+        profile = models.Profile(username=f"bench-{workers}", name="Bench")
+        db.add(profile)
+        db.commit()
+        sheets = [SheetProgress(name=name) for name in sheet_names]
+        started = time.perf_counter()
+        summary = import_workbook(
+            db,
+            profile.id,
+            path,
+            sheets,
+            folder_name="Bench",
+            default_language="en",
+            max_workers=workers,
+        )
+        db.commit()
+        elapsed = time.perf_counter() - started
+    finally:
+        db.close()
+    print(f"workers={workers:<3} {elapsed:8.2f} s  inserted={summary.inserted}")
+    return elapsed
+
+
+def main() -> None:
+    sheets = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    database.ensure_schema()
+    workbook_import.PARALLEL_PARSE_MIN_BYTES = 0
+    path = Path(tempfile.mkdtemp()) / "bench.xlsx"
+    build_workbook(path, sheets, rows)
+    names = [f"Unit {number + 1}" for number in range(sheets)]
+    print(f"{sheets} sheets x {rows} rows, {os.cpu_count()} CPUs")
+
+    counts = sorted({1, *(2**power for power in range(1, 6)), os.cpu_count() or 1})
+    baseline = None
+    for workers in (count for count in counts if count <= (os.cpu_count() or 1)):
+        elapsed = run(str(path), names, workers)
+        baseline = baseline or elapsed
+        print(f"{'':<11} {baseline / elapsed:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Shared fixtures for tests that need the application modules."""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import sys
+import tempfile
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+APP_PATH = PROJECT_ROOT / "app"
+if str(APP_PATH) not in sys.path:
+    sys.path.insert(0, str(APP_PATH))
+
+# ``database`` builds its engine at import time, so point it at a throwaway
+# SQLite file before any test module imports the application.
+_DB_DIR = tempfile.mkdtemp(prefix="remember-word-tests-")
+os.environ.setdefault("DB_URL", f"sqlite:///{_DB_DIR}/test.db")
+
+
+@pytest.fixture
+def db():
+    """Yield a session bound to a freshly created schema."""
+
+    import database  # noqa: WPS433 - imported lazily after DB_URL is set
+    import models
+
+    models.Base.metadata.drop_all(bind=database.engine)
+    database.ensure_schema()
+    session = database.SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def profile(db):
+    import models
+
+    user = models.Profile(username="tester", name="Tester")
+    db.add(user)
+    db.commit()
+    return user
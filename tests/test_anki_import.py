@@ -0,0 +1,147 @@
+"""Tests for reading Anki decks as structured word imports."""
+from __future__ import annotations
+
+from io import BytesIO
+import json
+from pathlib import Path
+import sqlite3
+import zipfile
+
+import pytest
+
+import models
+from utils.anki_import import (
+    AnkiCollection,
+    AnkiImportError,
+    clean_field,
+    iter_anki_frames,
+    split_deck_name,
+)
+from utils.word_import import (
+    apply_structured_import,
+    normalize_structured_frame,
+    plan_structured_import,
+)
+
+MODELS = {
+    "10": {"name": "Basic", "flds": [{"name": "Back", "ord": 1}, {"name": "Front", "ord": 0}]},
+    "20": {
+        "name": "Japanese",
+        "flds": [
+            {"name": "Expression", "ord": 0},
+            {"name": "Reading", "ord": 1},
+            {"name": "Meaning", "ord": 2},
+            {"name": "Example", "ord": 3},
+        ],
+    },
+}
+DECKS = {"1": {"name": "Default"}, "2": {"name": "일본어::JLPT N3::Day 1"}}
+NOTES = [
+    (1, 10, "apple\x1f<b>사과</b>&nbsp;[sound:apple.mp3]", 1),
+    (2, 20, "猫\x1fねこ\x1f고양이\x1f猫が<br>好き", 2),
+    (3, 20, "犬\x1fいぬ\x1f개\x1f", 2),
+]
+
+
+def _legacy_apkg(tmp_path: Path) -> bytes:
+    collection = tmp_path / "collection.anki2"
+    connection = sqlite3.connect(collection)
+    connection.executescript(
+        """
+        CREATE TABLE col (id INTEGER PRIMARY KEY, models TEXT, decks TEXT);
+        CREATE TABLE notes (id INTEGER PRIMARY KEY, mid INTEGER, flds TEXT);
+        CREATE TABLE cards (id INTEGER PRIMARY KEY, nid INTEGER, did INTEGER, ord INTEGER);
+        """
+    )
+    connection.execute(
+        "INSERT INTO col VALUES (1, ?, ?)", (json.dumps(MODELS), json.dumps(DECKS))
+    )
+    for note_id, model_id, fields, deck_id in NOTES:
+        connection.execute("INSERT INTO notes VALUES (?, ?, ?)", (note_id, model_id, fields))
+        connection.execute(
+            "INSERT INTO cards (nid, did, ord) VALUES (?, ?, 0)", (note_id, deck_id)
+        )
+    connection.commit()
+    connection.close()
+
+    archive = BytesIO()
+    with zipfile.ZipFile(archive, "w") as bundle:
+        bundle.write(collection, "collection.anki2")
+        bundle.writestr("media", "{}")
+    return archive.getvalue()
+
+
+def test_clean_field_strips_markup() -> None:
+    assert clean_field("<div>a&amp;b</div><div> c  d </div>[sound:x.mp3]") == "a&b\nc d"
+
+
+def test_split_deck_name() -> None:
+    assert split_deck_name("Default") == ("Default", "Default")
+    assert split_deck_name("일본어::JLPT N3::Day 1") == ("일본어", "JLPT N3 / Day 1")
+    assert split_deck_name("일본어\x1fDay 2") == ("일본어", "Day 2")
+
+
+def test_frames_map_fields_and_decks(tmp_path) -> None:
+    with AnkiCollection(BytesIO(_legacy_apkg(tmp_path))) as collection:
+        frames = list(iter_anki_frames(collection, "ja", chunk_size=2))
+
+    assert [len(frame) for frame in frames] == [2, 1]
+    records = [record for frame in frames for record in frame.to_dict("records")]
+    assert records[0] == {
+        "folder": "Default",
+        "group": "Default",
+        "language": "ja",
+        "term": "apple",
+        "meaning": "사과",
+        "reading": "",
+        "example": "",
+    }
+    assert records[1]["folder"] == "일본어"
+    assert records[1]["group"] == "JLPT N3 / Day 1"
+    assert (records[1]["term"], records[1]["reading"], records[1]["meaning"]) == (
+        "猫",
+        "ねこ",
+        "고양이",
+    )
+    assert records[1]["example"] == "猫が\n好き"
+
+
+def test_field_overrides(tmp_path) -> None:
+    with AnkiCollection(BytesIO(_legacy_apkg(tmp_path))) as collection:
+        (frame,) = iter_anki_frames(collection, "ja", {"term": "Reading"})
+
+    assert frame["term"].tolist()[1:] == ["ねこ", "いぬ"]
+
+
+def test_import_writes_words_in_chunks(db, profile, tmp_path) -> None:
+    with AnkiCollection(BytesIO(_legacy_apkg(tmp_path))) as collection:
+        for chunk in iter_anki_frames(collection, "ja", chunk_size=1):
+            frame = normalize_structured_frame(chunk, "ja")
+            apply_structured_import(db, plan_structured_import(db, profile.id, frame, "ja"))
+    db.commit()
+
+    group = db.query(models.Group).filter_by(name="JLPT N3 / Day 1").one()
+    assert group.folder.name == "일본어"
+    assert group.word_count == 2
+    assert {word.term: word.reading for word in group.words} == {"猫": "ねこ", "犬": "いぬ"}
+    assert db.query(models.Folder).count() == 2
+
+
+def test_rejects_non_anki_archives(tmp_path) -> None:
+    with pytest.raises(AnkiImportError):
+        with AnkiCollection(BytesIO(b"not a zip")):
+            pass
+
+    # The stub legacy collection Anki adds next to the compressed one.
+    with sqlite3.connect(tmp_path / "stub.anki2") as stub:
+        stub.execute("CREATE TABLE col (id INTEGER PRIMARY KEY)")
+    stub.close()
+    sqlite_stub = (tmp_path / "stub.anki2").read_bytes()
+    archive = BytesIO()
+    with zipfile.ZipFile(archive, "w") as bundle:
+        bundle.writestr("collection.anki21b", b"zstd")
+        bundle.writestr("collection.anki2", sqlite_stub)
+    archive.seek(0)
+    with pytest.raises(AnkiImportError, match="지원하지 않습니다"):
+        with AnkiCollection(archive):
+            pass
@@ -0,0 +1,104 @@
+"""Tests for the denormalized per-group word counters."""
+from __future__ import annotations
+
+import pandas as pd
+from sqlalchemy import event
+
+import database
+import models
+import schemas
+from routers.words import create_word, update_word
+from utils.group_counters import refresh_group_counters
+from utils.word_duplicates import merge_words
+from utils.word_delete import delete_words
+from utils.word_import import apply_group_import, normalize_group_frame, plan_group_import
+from utils.word_transfer import apply_transfer, plan_transfer
+
+
+def _counters(db, group_id: int) -> tuple[int, dict[str, int]]:
+    db.expire_all()
+    group = db.get(models.Group, group_id)
+    return group.word_count, group.star_histogram
+
+
+def test_counters_follow_imports_transfers_and_deletes(db, profile) -> None:
+    folder = models.Folder(name="Folder", profile_id=profile.id)
+    first = models.Group(folder=folder, name="Day1", profile_id=profile.id)
+    second = models.Group(folder=folder, name="Day2", profile_id=profile.id)
+    db.add_all([folder, first, second])
+    db.commit()
+    first_id, second_id = first.id, second.id
+    assert _counters(db, first_id) == (0, {})
+
+    sheet = pd.DataFrame(
+        {"term": ["a", "b", "c"], "meaning": ["1", "2", "3"], "star": [0, 2, 2]}
+    )
+    apply_group_import(db, plan_group_import(db, first_id, normalize_group_frame(sheet)))
+    db.commit()
+    assert _counters(db, first_id) == (3, {"0": 1, "2": 2})
+
+    word_ids = [word_id for (word_id,) in db.query(models.Word.id).order_by(models.Word.id)]
+    plan = plan_transfer(db, word_ids[:2], second_id, "move", "skip")
+    apply_transfer(db, plan, "move")
+    db.commit()
+    assert _counters(db, first_id) == (1, {"2": 1})
+    assert _counters(db, second_id) == (2, {"0": 1, "2": 1})
+
+    delete_words(db, word_ids[1:])
+    db.commit()
+    assert _counters(db, first_id) == (0, {})
+    assert _counters(db, second_id) == (1, {"0": 1})
+
+
+def test_single_word_writes_apply_deltas(db, profile) -> None:
+    folder = models.Folder(name="Folder", profile_id=profile.id)
+    first = models.Group(folder=folder, name="Day1", profile_id=profile.id)
+    second = models.Group(folder=folder, name="Day2", profile_id=profile.id)
+    db.add_all([folder, first, second])
+    db.commit()
+    first_id, second_id = first.id, second.id
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, *args) -> None:
+        statements.append(statement)
+
+    event.listen(database.engine, "before_cursor_execute", record)
+    try:
+        word_ids = [
+            create_word(
+                schemas.WordCreate(group_id=first_id, term=term, meaning="뜻", star=star),
+                db=db,
+                current_user=profile,
+            )["id"]
+            for term, star in [("a", 1), ("b", 1), ("c", 3)]
+        ]
+        update_word(word_ids[0], schemas.WordUpdate(star=3), db=db, current_user=profile)
+        update_word(
+            word_ids[1], schemas.WordUpdate(group_id=second_id), db=db, current_user=profile
+        )
+    finally:
+        event.remove(database.engine, "before_cursor_execute", record)
+
+    # No write recounts a group.
+    assert not any("GROUP BY" in statement for statement in statements)
+    assert _counters(db, first_id) == (2, {"3": 2})
+    assert _counters(db, second_id) == (1, {"1": 1})
+
+    merge_words(db, word_ids[1], [word_ids[0]])
+    db.commit()
+    assert _counters(db, first_id) == (1, {"3": 1})
+    assert _counters(db, second_id) == (1, {"3": 1})
+
+
+def test_refresh_without_ids_repairs_every_group(db, profile) -> None:
+    folder = models.Folder(name="Folder", profile_id=profile.id)
+    group = models.Group(folder=folder, name="Day1", profile_id=profile.id)
+    group.words = [models.Word(term="a", meaning="1", star=3)]
+    db.add_all([folder, group])
+    db.commit()
+    db.query(models.Group).update({"word_count": 99, "star_histogram": {}})
+    db.commit()
+
+    assert refresh_group_counters(db) == 1
+    db.commit()
+    assert _counters(db, group.id) == (1, {"3": 1})
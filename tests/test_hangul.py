@@ -0,0 +1,50 @@
+"""Tests for the Hangul search key helpers."""
+from __future__ import annotations
+
+import pytest
+
+from utils.hangul import hangul_chosung, hangul_jamo, is_chosung_query
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("사과", "ㅅㄱ"),
+        ("사 과", "ㅅㄱ"),
+        ("Apple 사과", "appleㅅㄱ"),
+        ("ㅅ과", "ㅅㄱ"),
+        ("", ""),
+        (None, None),
+    ],
+)
+def test_hangul_chosung(value, expected) -> None:
+    assert hangul_chosung(value) == expected
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("사과", "ㅅㅏㄱㅗㅏ"),
+        ("닭", "ㄷㅏㄹㄱ"),
+        ("의자", "ㅇㅡㅣㅈㅏ"),
+        ("ㅘ", "ㅗㅏ"),
+        # NFD input composes to the same key.
+        ("사과", "ㅅㅏㄱㅗㅏ"),
+        (None, None),
+    ],
+)
+def test_hangul_jamo(value, expected) -> None:
+    assert hangul_jamo(value) == expected
+
+
+def test_half_composed_syllable_prefixes_the_full_word() -> None:
+    assert hangul_jamo("사과").startswith(hangul_jamo("삭"))
+    assert hangul_jamo("사과").startswith(hangul_jamo("사고"))
+
+
+def test_is_chosung_query() -> None:
+    assert is_chosung_query("ㅅㄱ")
+    assert is_chosung_query("ㅅ ㄱ")
+    assert not is_chosung_query("ㅅ과")
+    assert not is_chosung_query("ㅏ")
+    assert not is_chosung_query("  ")
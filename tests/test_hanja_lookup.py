@@ -49,3 +49,17 @@ def test_lookup_meaning_falls_back_to_translation(monkeypatch: pytest.MonkeyPatc
 
     result = hanja_lookup.lookup_meaning("親舊")
     assert result == "친구"
+
+
+@pytest.mark.parametrize("term", ["大學校", "李 先烈", "勝率", "漢字 쓰기", "女子"])
+def test_hanja_reading_matches_substitution(term: str) -> None:
+    reading, _ = hanja_lookup.hanja_reading(term)
+
+    assert reading == hanja_lookup.hanja.translate(term, "substitution")
+
+
+def test_hanja_reading_flags_polyphonic_characters() -> None:
+    # ``hanja`` reads 樂 as 락 everywhere, which is why it is flagged.
+    assert hanja_lookup.hanja_reading("音樂") == ("음락", True)
+    assert hanja_lookup.hanja_reading("學生") == ("학생", False)
+    assert hanja_lookup.hanja_reading("apple") == ("", False)
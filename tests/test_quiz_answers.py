@@ -0,0 +1,213 @@
+"""Tests for recording quiz answers one at a time and in batches."""
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+import random
+import threading
+
+from fastapi import HTTPException
+import pytest
+
+import database
+import models
+import schemas
+from routers.quizzes import (
+    get_progress,
+    retry_incorrect,
+    start_quiz,
+    submit_answer,
+    submit_answers,
+)
+from utils.group_counters import refresh_group_counters
+
+THREADS = 8
+ANSWERS = [
+    (0, False),
+    (1, True),
+    (2, False),
+    (0, True),  # re-answered: right after wrong
+    (1, False),  # re-answered: wrong after right
+    (3, True),
+]
+
+
+@pytest.fixture
+def group(db, profile):
+    folder = models.Folder(name="English", profile_id=profile.id)
+    group = models.Group(folder=folder, name="Day1", profile_id=profile.id)
+    group.words = [
+        models.Word(term=f"word{index}", meaning=f"뜻{index}", star=index) for index in range(5)
+    ]
+    db.add(folder)
+    # The words bypass the write paths, so count them once like the repair script.
+    db.flush()
+    refresh_group_counters(db, [group.id])
+    db.commit()
+    return group
+
+
+def _start(db, profile, group):
+    payload = schemas.QuizStartRequest(group_ids=[group.id], random=False)
+    return start_quiz(payload, accept=None, db=db, current_user=profile)
+
+
+def _answers(started) -> list[schemas.QuizAnswerSubmit]:
+    return [
+        schemas.QuizAnswerSubmit(
+            question_id=started.questions[index].id, answer="?", is_correct=is_correct
+        )
+        for index, is_correct in ANSWERS
+    ]
+
+
+def _snapshot(db, group):
+    db.expire_all()
+    stars = [word.star for word in sorted(group.words, key=lambda word: word.id)]
+    return stars, group.star_histogram
+
+
+@pytest.mark.parametrize("batched", [False, True])
+def test_batch_matches_single_answers(db, profile, group, batched) -> None:
+    started = _start(db, profile, group)
+    answers = _answers(started)
+
+    incorrect: set[int] = set()
+    if batched:
+        deltas = [
+            submit_answers(
+                started.session_id,
+                schemas.QuizAnswerBatch(answers=answers),
+                db=db,
+                current_user=profile,
+            )
+        ]
+    else:
+        deltas = [
+            submit_answer(started.session_id, answer, db=db, current_user=profile)
+            for answer in answers
+        ]
+    for delta in deltas:
+        assert not set(delta.incorrect_added) & set(delta.incorrect_removed)
+        incorrect = (incorrect - set(delta.incorrect_removed)) | set(delta.incorrect_added)
+
+    progress = get_progress(started.session_id, db=db, current_user=profile)
+    assert (progress.answered, progress.correct, progress.remaining) == (4, 2, 1)
+    assert (deltas[-1].answered, deltas[-1].correct, deltas[-1].remaining) == (4, 2, 1)
+    expected = [started.questions[1].id, started.questions[2].id]
+    assert progress.incorrect_question_ids == expected
+    assert sorted(incorrect) == expected
+    # Only first answers that were wrong raise a star; word4 is already at 5.
+    assert _snapshot(db, group) == ([1, 1, 3, 3, 4], {"1": 2, "3": 2, "4": 1})
+    stored = db.get(models.QuizQuestion, started.questions[1].id)
+    assert (stored.user_answer, stored.is_correct) == ("?", False)
+
+
+def test_batch_completes_session_without_stars_on_retry(db, profile, group) -> None:
+    started = _start(db, profile, group)
+    wrong = [
+        schemas.QuizAnswerSubmit(question_id=question.id, is_correct=False)
+        for question in started.questions
+    ]
+    submit_answers(
+        started.session_id,
+        schemas.QuizAnswerBatch(answers=wrong),
+        db=db,
+        current_user=profile,
+    )
+    assert db.get(models.QuizSession, started.session_id).is_completed
+    before = _snapshot(db, group)
+
+    retried = retry_incorrect(
+        started.session_id, schemas.QuizRetryRequest(random=False), db=db, current_user=profile
+    )
+    progress = submit_answers(
+        retried.session_id,
+        schemas.QuizAnswerBatch(
+            answers=[
+                schemas.QuizAnswerSubmit(question_id=question.id, is_correct=False)
+                for question in retried.questions
+            ]
+        ),
+        db=db,
+        current_user=profile,
+    )
+
+    assert progress.answered == progress.total == 5
+    assert _snapshot(db, group) == before
+
+
+def test_batch_rejects_foreign_questions(db, profile, group) -> None:
+    first = _start(db, profile, group)
+    second = _start(db, profile, group)
+    answers = [
+        schemas.QuizAnswerSubmit(question_id=first.questions[0].id, is_correct=False),
+        schemas.QuizAnswerSubmit(question_id=second.questions[0].id, is_correct=False),
+    ]
+
+    with pytest.raises(HTTPException) as error:
+        submit_answers(
+            first.session_id,
+            schemas.QuizAnswerBatch(answers=answers),
+            db=db,
+            current_user=profile,
+        )
+
+    assert error.value.status_code == 404
+    db.rollback()
+    assert db.get(models.QuizSession, first.session_id).answered_questions == 0
+    assert db.get(models.QuizQuestion, first.questions[0].id).is_correct is None
+
+
+def test_concurrent_answers_count_each_transition_once(db, profile) -> None:
+    folder = models.Folder(name="Hammer", profile_id=profile.id)
+    group = models.Group(folder=folder, name="Day1", profile_id=profile.id)
+    group.words = [models.Word(term=f"w{index}", meaning=f"뜻{index}") for index in range(30)]
+    db.add(folder)
+    db.commit()
+    started = _start(db, profile, group)
+    profile_id = profile.id
+    question_ids = [question.id for question in started.questions]
+    expected = {question_id: index % 3 != 0 for index, question_id in enumerate(question_ids)}
+    barrier = threading.Barrier(THREADS, timeout=10)
+
+    def hammer(seed: int, answer_for) -> None:
+        order = random.Random(seed).sample(question_ids, len(question_ids))
+        local = database.SessionLocal()
+        try:
+            user = local.get(models.Profile, profile_id)
+            barrier.wait()
+            for question_id in order:
+                submit_answer(
+                    started.session_id,
+                    schemas.QuizAnswerSubmit(
+                        question_id=question_id, is_correct=answer_for(seed, question_id)
+                    ),
+                    db=local,
+                    current_user=user,
+                )
+        finally:
+            local.close()
+
+    def run(answer_for) -> None:
+        with ThreadPoolExecutor(THREADS) as pool:
+            for future in [pool.submit(hammer, seed, answer_for) for seed in range(THREADS)]:
+                future.result()
+
+    # Every thread double-taps the same answers.
+    run(lambda seed, question_id: expected[question_id])
+    db.expire_all()
+    session = db.get(models.QuizSession, started.session_id)
+    assert (session.answered_questions, session.correct_questions) == (30, 20)
+    assert session.is_completed
+    assert sorted(word.star for word in group.words) == [0] * 20 + [1] * 10
+    stats = db.query(models.WordStat).all()
+    assert [(stat.attempts, stat.correct) for stat in stats].count((1, 1)) == 20
+    assert sum(stat.attempts for stat in stats) == 30
+
+    # Conflicting re-answers: the counter must follow whichever answer won.
+    run(lambda seed, question_id: (seed + question_id) % 2 == 0)
+    db.expire_all()
+    stored = db.query(models.QuizQuestion).filter_by(session_id=started.session_id).all()
+    assert session.answered_questions == 30
+    assert session.correct_questions == sum(question.is_correct for question in stored)
+    assert sorted(word.star for word in group.words) == [0] * 20 + [1] * 10
@@ -0,0 +1,91 @@
+"""Tests for the groups recorded per quiz session and the history built on them."""
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import event, text
+
+import database
+import models
+import schemas
+from routers.quizzes import list_history, retry_incorrect, start_quiz
+
+
+@pytest.fixture
+def groups(db, profile):
+    folder = models.Folder(name="English", profile_id=profile.id)
+    day1 = models.Group(folder=folder, name="Day1", profile_id=profile.id)
+    day2 = models.Group(folder=folder, name="Day2", profile_id=profile.id)
+    day1.words = [models.Word(term=f"a{index}", meaning="뜻") for index in range(3)]
+    day2.words = [models.Word(term=f"b{index}", meaning="뜻") for index in range(2)]
+    db.add(folder)
+    db.commit()
+    return day1, day2
+
+
+def _start(db, profile, group_ids):
+    payload = schemas.QuizStartRequest(group_ids=group_ids, random=False)
+    return start_quiz(payload, accept=None, db=db, current_user=profile)
+
+
+def _links(db, session_id: int) -> list[tuple[int, int]]:
+    return [
+        (link.group_id, link.position)
+        for link in db.query(models.QuizSessionGroup)
+        .filter_by(session_id=session_id)
+        .order_by(models.QuizSessionGroup.position)
+    ]
+
+
+def test_start_and_retry_record_session_groups(db, profile, groups) -> None:
+    day1, day2 = groups
+    started = _start(db, profile, [day2.id, day1.id])
+    assert _links(db, started.session_id) == [(day2.id, 1), (day1.id, 3)]
+
+    db.query(models.QuizQuestion).filter(
+        models.QuizQuestion.id == started.questions[-1].id
+    ).update({"is_correct": False})
+    db.commit()
+    retried = retry_incorrect(
+        started.session_id, schemas.QuizRetryRequest(), db=db, current_user=profile
+    )
+    assert _links(db, retried.session_id) == [(day1.id, 1)]
+
+
+def test_history_reads_session_groups(db, profile, groups) -> None:
+    day1, day2 = groups
+    started = _start(db, profile, [day1.id, day2.id])
+    db.query(models.QuizSession).update({"is_completed": True})
+    db.commit()
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, *args) -> None:
+        statements.append(statement)
+
+    event.listen(database.engine, "before_cursor_execute", record)
+    try:
+        history = list_history(limit=20, db=db, current_user=profile)
+    finally:
+        event.remove(database.engine, "before_cursor_execute", record)
+
+    assert [(item.session_id, item.folder_name) for item in history] == [
+        (started.session_id, "English")
+    ]
+    assert history[0].group_ids == [day1.id, day2.id]
+    assert history[0].group_names == ["Day1", "Day2"]
+    assert not any("quiz_questions" in statement for statement in statements)
+
+    db.delete(day2)
+    db.commit()
+    assert db.query(models.QuizSessionGroup).filter_by(group_id=day2.id).count() == 0
+
+
+def test_backfill_session_groups(db, profile, groups) -> None:
+    day1, day2 = groups
+    started = _start(db, profile, [day2.id, day1.id])
+    with database.engine.begin() as connection:
+        connection.execute(text("DROP TABLE quiz_session_groups"))
+
+    database.ensure_schema()
+
+    db.expire_all()
+    assert _links(db, started.session_id) == [(day2.id, 1), (day1.id, 3)]
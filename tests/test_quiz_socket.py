@@ -0,0 +1,112 @@
+"""Tests for the live exam WebSocket channel."""
+from __future__ import annotations
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+import pytest
+from starlette.middleware.sessions import SessionMiddleware
+from starlette.websockets import WebSocketDisconnect
+
+import models
+import schemas
+from routers import quizzes
+from routers.quizzes import start_quiz
+
+
+@pytest.fixture
+def started(db, profile):
+    folder = models.Folder(name="English", profile_id=profile.id)
+    group = models.Group(folder=folder, name="Day1", profile_id=profile.id)
+    group.words = [models.Word(term=f"word{index}", meaning=f"뜻{index}") for index in range(4)]
+    db.add(folder)
+    db.commit()
+    payload = schemas.QuizStartRequest(group_ids=[group.id], random=False)
+    return start_quiz(payload, accept=None, db=db, current_user=profile)
+
+
+@pytest.fixture
+def client(db, profile, monkeypatch):
+    # Only explicit flushes and disconnects write, so frames are predictable.
+    monkeypatch.setattr(quizzes, "SOCKET_BATCH_SECONDS", 60)
+    app = FastAPI()
+    app.add_middleware(SessionMiddleware, secret_key="test")
+    app.include_router(quizzes.router, prefix="/quizzes")
+
+    @app.post("/login/{user_id}")
+    def login(user_id: int, request: Request) -> None:
+        request.session["user_id"] = user_id
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def _answer(question, is_correct: bool) -> dict:
+    return {"type": "answer", "question_id": question.id, "is_correct": is_correct}
+
+
+def test_socket_batches_answers(db, profile, started, client) -> None:
+    first, second, third, _ = started.questions
+    client.post(f"/login/{profile.id}")
+
+    with client.websocket_connect(f"/quizzes/{started.session_id}/ws") as socket:
+        socket.send_json(_answer(first, False))
+        socket.send_json(_answer(second, True))
+        socket.send_json(_answer(first, True))
+        socket.send_json({"type": "flush"})
+        progress = socket.receive_json()
+        socket.send_text("not json")
+        assert socket.receive_json()["type"] == "error"
+        socket.send_json(_answer(third, False))
+
+    assert progress == {
+        "type": "progress",
+        "count": 3,
+        "question_ids": [first.id, second.id],
+        "session_id": started.session_id,
+        "total": 4,
+        "answered": 2,
+        "correct": 2,
+        "remaining": 2,
+        "incorrect_added": [],
+        "incorrect_removed": [],
+    }
+    db.expire_all()
+    session = db.get(models.QuizSession, started.session_id)
+    # The last answer was queued when the socket closed and still counts.
+    assert (session.answered_questions, session.correct_questions) == (3, 2)
+    assert db.get(models.Word, first.word_id).star == 1
+
+
+def test_socket_reports_foreign_questions(db, profile, started, client) -> None:
+    client.post(f"/login/{profile.id}")
+
+    with client.websocket_connect(f"/quizzes/{started.session_id}/ws") as socket:
+        socket.send_json({"question_id": 999_999, "is_correct": True})
+        socket.send_json({"type": "flush"})
+        frame = socket.receive_json()
+
+    assert frame["type"] == "error"
+    assert frame["question_ids"] == [999_999]
+
+
+def test_socket_requires_login(started, client) -> None:
+    with pytest.raises(WebSocketDisconnect) as error:
+        with client.websocket_connect(f"/quizzes/{started.session_id}/ws") as socket:
+            socket.receive_json()
+
+    assert error.value.code == 1008
+
+
+def test_socket_rejects_other_origins(profile, started, client) -> None:
+    client.post(f"/login/{profile.id}")
+    url = f"/quizzes/{started.session_id}/ws"
+
+    with pytest.raises(WebSocketDisconnect) as error:
+        with client.websocket_connect(url, headers={"origin": "https://evil.example"}) as socket:
+            socket.receive_json()
+    assert error.value.code == 1008
+
+    with client.websocket_connect(url, headers={"origin": "http://testserver"}) as socket:
+        socket.send_json({"type": "flush"})
+        socket.send_json({"type": "ping"})
+        assert socket.receive_json()["type"] == "error"
@@ -0,0 +1,132 @@
+"""Tests for creating quiz sessions and their questions."""
+from __future__ import annotations
+
+from fastapi import HTTPException
+from sqlalchemy import event
+import pytest
+
+import database
+import models
+import schemas
+from routers.quizzes import retry_incorrect, start_quiz
+
+
+@pytest.fixture
+def group(db, profile):
+    folder = models.Folder(name="English", profile_id=profile.id)
+    group = models.Group(folder=folder, name="Day1", profile_id=profile.id)
+    group.words = [
+        models.Word(term=f"word{index}", meaning=f"뜻{index}", star=index % 3)
+        for index in range(60)
+    ]
+    db.add(folder)
+    db.commit()
+    return group
+
+
+def _start(db, profile, group, **options):
+    payload = schemas.QuizStartRequest(group_ids=[group.id], **options)
+    return start_quiz(payload, accept=None, db=db, current_user=profile)
+
+
+def _count_inserts(callback) -> tuple[object, int]:
+    inserts: list[str] = []
+
+    def record(conn, cursor, statement, *args) -> None:
+        if statement.lstrip().upper().startswith("INSERT"):
+            inserts.append(statement)
+
+    event.listen(database.engine, "before_cursor_execute", record)
+    try:
+        result = callback()
+    finally:
+        event.remove(database.engine, "before_cursor_execute", record)
+    return result, len(inserts)
+
+
+def test_start_quiz_inserts_questions_in_one_statement(db, profile, group) -> None:
+    response, inserts = _count_inserts(lambda: _start(db, profile, group, random=True))
+
+    # One INSERT each for the session, all of its questions and its groups.
+    assert inserts == 3
+    assert response.total == 60
+    stored = {
+        question.id: question
+        for question in db.query(models.QuizQuestion).filter_by(session_id=response.session_id)
+    }
+    for position, question in enumerate(response.questions, start=1):
+        row = stored[question.id]
+        assert question.position == row.position == position
+        assert (question.prompt, question.answer) == (row.prompt_text, row.answer_text)
+        assert row.word_id == question.word_id
+
+
+def test_start_quiz_directions_and_limits(db, profile, group) -> None:
+    response = _start(
+        db, profile, group, random=False, direction="meaning_to_term", limit=5, min_star=2
+    )
+
+    assert [(q.prompt, q.answer, q.star) for q in response.questions][:2] == [
+        ("뜻2", "word2", 2),
+        ("뜻5", "word5", 2),
+    ]
+    assert len(response.questions) == 5
+
+
+def test_retry_copies_incorrect_questions(db, profile, group) -> None:
+    started = _start(db, profile, group, random=False, limit=4)
+    wrong = started.questions[1::2]
+    db.query(models.QuizQuestion).filter(
+        models.QuizQuestion.id.in_([q.id for q in wrong])
+    ).update({"is_correct": False}, synchronize_session=False)
+    db.commit()
+
+    retried = retry_incorrect(
+        started.session_id,
+        schemas.QuizRetryRequest(random=False),
+        db=db,
+        current_user=profile,
+    )
+
+    assert [(q.word_id, q.position) for q in retried.questions] == [
+        (wrong[0].word_id, 1),
+        (wrong[1].word_id, 2),
+    ]
+    assert {q.id for q in retried.questions}.isdisjoint(q.id for q in started.questions)
+
+
+def test_number_range_and_random_limit(db, profile, group) -> None:
+    in_order = _start(db, profile, group, random=False, number_start=3, number_end=6)
+    assert [q.prompt for q in in_order.questions] == ["word2", "word3", "word4", "word5"]
+
+    sampled = _start(db, profile, group, random=True, number_start=10, number_end=29, limit=5)
+    prompts = [q.prompt for q in sampled.questions]
+    assert len(set(prompts)) == 5
+    assert {int(prompt[4:]) for prompt in prompts} <= set(range(9, 29))
+
+    starred = _start(db, profile, group, random=False, min_star=2, number_start=2, number_end=3)
+    assert [q.prompt for q in starred.questions] == ["word5", "word8"]
+
+
+def test_random_limit_samples_positions(db, profile, group) -> None:
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, *args) -> None:
+        statements.append(statement)
+
+    event.listen(database.engine, "before_cursor_execute", record)
+    try:
+        sampled = _start(db, profile, group, random=True, limit=7)
+    finally:
+        event.remove(database.engine, "before_cursor_execute", record)
+
+    assert len({q.word_id for q in sampled.questions}) == 7
+    assert not any("random()" in statement.lower() for statement in statements)
+
+
+def test_number_range_past_the_end(db, profile, group) -> None:
+    with pytest.raises(HTTPException) as error:
+        _start(db, profile, group, number_start=61)
+
+    assert error.value.status_code == 400
+    assert "총 60개" in error.value.detail
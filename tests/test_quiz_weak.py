@@ -0,0 +1,146 @@
+"""Tests for the weak-words quiz mode."""
+from __future__ import annotations
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select, text
+
+import database
+import models
+import schemas
+from routers.quizzes import start_quiz, submit_answer, submit_answers
+from utils.word_stats import weak_word_query
+
+
+@pytest.fixture
+def groups(db, profile):
+    folder = models.Folder(name="English", profile_id=profile.id)
+    day1 = models.Group(folder=folder, name="Day1", profile_id=profile.id)
+    day2 = models.Group(folder=folder, name="Day2", profile_id=profile.id)
+    day1.words = [models.Word(term=f"a{index}", meaning=f"뜻{index}") for index in range(4)]
+    day2.words = [models.Word(term=f"b{index}", meaning=f"뜻{index}") for index in range(2)]
+    db.add(folder)
+    db.commit()
+    return day1, day2
+
+
+def _start(db, profile, group_ids, **options) -> schemas.QuizStartResponse:
+    payload = schemas.QuizStartRequest(group_ids=group_ids, **{"random": False, **options})
+    return start_quiz(payload, accept=None, db=db, current_user=profile)
+
+
+def _answer(db, profile, group_ids, results: list[bool]) -> schemas.QuizStartResponse:
+    started = _start(db, profile, group_ids, mode="study")
+    submit_answers(
+        started.session_id,
+        schemas.QuizAnswerBatch(
+            answers=[
+                schemas.QuizAnswerSubmit(question_id=question.id, is_correct=is_correct)
+                for question, is_correct in zip(started.questions, results)
+            ]
+        ),
+        db=db,
+        current_user=profile,
+    )
+    return started
+
+
+def _recent_errors(db) -> dict[str, float]:
+    db.expire_all()
+    return {
+        word.term: round(stat.recent_error, 3)
+        for word, stat in db.query(models.Word, models.WordStat).join(
+            models.WordStat, models.WordStat.word_id == models.Word.id
+        )
+    }
+
+
+def test_recent_answers_weigh_more(db, profile, groups) -> None:
+    day1, _ = groups
+    _answer(db, profile, [day1.id], [False, False, True, True])
+    started = _answer(db, profile, [day1.id], [True, False, True, False])
+    assert _recent_errors(db) == {"a0": 0.7, "a1": 1.0, "a2": 0.0, "a3": 0.3}
+
+    # Re-answering swaps the latest answer's share of the average.
+    submit_answer(
+        started.session_id,
+        schemas.QuizAnswerSubmit(question_id=started.questions[0].id, is_correct=False),
+        db=db,
+        current_user=profile,
+    )
+    assert _recent_errors(db)["a0"] == 1.0
+
+
+def test_weak_mode_asks_worst_recent_words(db, profile, groups) -> None:
+    day1, day2 = groups
+    _answer(db, profile, [day1.id, day2.id], [False, False, True, True, False, True])
+    _answer(db, profile, [day1.id, day2.id], [True, False, True, False, False, True])
+
+    started = _start(db, profile, [day1.id, day2.id], mode="weak", limit=3)
+    assert [question.prompt for question in started.questions] == ["b0", "a1", "a0"]
+    started = _start(
+        db, profile, [day1.id], mode="weak", direction="meaning_to_term", random=True
+    )
+    assert sorted(question.answer for question in started.questions) == ["a0", "a1", "a3"]
+    assert db.get(models.QuizSession, started.session_id).mode == "weak"
+
+    with pytest.raises(HTTPException) as error:
+        _start(db, profile, [day1.id], mode="weak", number_start=1)
+    assert error.value.status_code == 400
+
+
+def test_weak_mode_answers_raise_stars(db, profile, groups) -> None:
+    day1, _ = groups
+    _answer(db, profile, [day1.id], [False, True, True, True])
+    started = _start(db, profile, [day1.id], mode="weak")
+    submit_answer(
+        started.session_id,
+        schemas.QuizAnswerSubmit(question_id=started.questions[0].id, is_correct=False),
+        db=db,
+        current_user=profile,
+    )
+
+    assert db.get(models.Word, started.questions[0].word_id).star == 1
+
+
+def test_weak_mode_needs_missed_words(db, profile, groups) -> None:
+    day1, _ = groups
+    _answer(db, profile, [day1.id], [True, True, True, True])
+
+    with pytest.raises(HTTPException) as error:
+        _start(db, profile, [day1.id], mode="weak")
+    assert error.value.status_code == 400
+
+
+def test_weak_words_read_the_recent_error_index(db, groups) -> None:
+    day1, _ = groups
+    statement = (
+        weak_word_query([models.Word.id], [day1.id])
+        .limit(10)
+        .compile(compile_kwargs={"literal_binds": True})
+    )
+    with database.engine.connect() as connection:
+        plan = " ".join(
+            row[-1] for row in connection.execute(text(f"EXPLAIN QUERY PLAN {statement}"))
+        )
+    assert "idx_word_stats_group_recent" in plan
+    assert "TEMP B-TREE" not in plan
+    assert "quiz_questions" not in str(statement)
+
+
+def test_recent_error_is_added_to_existing_stats(db, profile, groups) -> None:
+    day1, _ = groups
+    _answer(db, profile, [day1.id], [False, True, False, True])
+    _answer(db, profile, [day1.id], [True, True, False, True])
+    with database.engine.begin() as connection:
+        connection.execute(text("DROP INDEX idx_word_stats_group_recent"))
+        connection.execute(text("ALTER TABLE word_stats DROP COLUMN recent_error"))
+
+    database.ensure_schema()
+
+    assert _recent_errors(db) == {"a0": 0.5, "a1": 0.0, "a2": 1.0, "a3": 0.0}
+    with database.engine.connect() as connection:
+        indexes = connection.execute(
+            select(text("name")).select_from(text("sqlite_master")).where(text("type = 'index'"))
+        ).scalars()
+        assert "idx_word_stats_group_recent" in set(indexes)
@@ -0,0 +1,44 @@
+"""Tests for compact response negotiation."""
+from __future__ import annotations
+
+from fastapi import HTTPException
+import pytest
+
+from utils import response_formats
+from utils.response_formats import columnar, negotiate_format
+
+
+@pytest.mark.parametrize(
+    ("accept", "expected"),
+    [
+        (None, "json"),
+        ("*/*", "json"),
+        ("text/html, application/json", "json"),
+        ("application/vnd.rememberword.columnar+json", "columnar"),
+        ("application/json;q=0.5, application/vnd.rememberword.columnar+json", "columnar"),
+        ("application/vnd.rememberword.columnar+json;q=0.1, application/json", "json"),
+        ("application/x-msgpack", "msgpack"),
+        ("image/png", "json"),
+    ],
+)
+def test_negotiate_format(accept, expected) -> None:
+    if expected == "msgpack":
+        pytest.importorskip("msgpack")
+    assert negotiate_format(accept) == expected
+
+
+def test_msgpack_without_the_package(monkeypatch) -> None:
+    monkeypatch.setattr(response_formats, "msgpack", None)
+
+    assert negotiate_format("application/msgpack, application/json;q=0.1") == "json"
+    with pytest.raises(HTTPException) as error:
+        negotiate_format("application/msgpack")
+    assert error.value.status_code == 406
+
+
+def test_columnar_transposes_rows() -> None:
+    assert columnar(("id", "term"), [(1, "a"), (2, "b")]) == {
+        "count": 2,
+        "columns": {"id": [1, 2], "term": ["a", "b"]},
+    }
+    assert columnar(("id", "term"), []) == {"count": 0, "columns": {"id": [], "term": []}}
@@ -0,0 +1,73 @@
+"""Tests for the fast word sheet readers."""
+from __future__ import annotations
+
+from io import BytesIO
+
+from openpyxl import Workbook
+import pytest
+
+from utils import table_reader
+from utils.table_reader import read_delimited, read_xlsx, sniff_delimiter
+
+
+@pytest.fixture(params=["c", "pyarrow"])
+def csv_engine(request, monkeypatch):
+    if request.param == "pyarrow":
+        pytest.importorskip("pyarrow")
+    monkeypatch.setattr(table_reader, "CSV_ENGINE", request.param)
+    return request.param
+
+
+@pytest.mark.parametrize(
+    ("content", "expected"),
+    [
+        (b"language,term,meaning\nen,apple,\"a, b\"\n", ","),
+        (b"language\tterm\tmeaning\nen\tapple\t\xec\x82\xac\xea\xb3\xbc\n", "\t"),
+        (b"language;term;meaning\nen;apple;x\n", ";"),
+        (b"language\tterm\tmeaning\treading\nen\tapple\tsagwa\nen\tpear\tbae\tb\n", "\t"),
+        (b"term\n", ","),
+    ],
+)
+def test_sniff_delimiter(content: bytes, expected: str) -> None:
+    assert sniff_delimiter(content) == expected
+
+
+def test_sniff_ignores_a_truncated_last_line(monkeypatch) -> None:
+    monkeypatch.setattr(table_reader, "SNIFF_SAMPLE_BYTES", 24)
+    content = b"a\tb\tc\n1\t2\t3\n4\t5\t6,7,8,9,10\n"
+
+    assert sniff_delimiter(content) == "\t"
+
+
+def test_read_delimited_keeps_strings(csv_engine) -> None:
+    content = "\ufefflanguage\tterm\tmeaning\tstar\nen\tNA\t없음\t3\nen\tnull\t\t\n".encode()
+
+    frame = read_delimited(content)
+
+    assert list(frame.columns) == ["language", "term", "meaning", "star"]
+    assert frame["term"].tolist() == ["NA", "null"]
+    assert frame["meaning"].tolist() == ["없음", ""]
+    assert frame["star"].tolist() == ["3", ""]
+
+
+def test_read_delimited_without_header(csv_engine) -> None:
+    frame = read_delimited(b"F,Day1,apple,x\nF,Day1,pear,y\n", header=None)
+
+    assert frame.shape == (2, 4)
+    assert frame.iloc[1].tolist() == ["F", "Day1", "pear", "y"]
+
+
+def test_read_xlsx_streams_first_sheet() -> None:
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["language", "term", "meaning", "star"])
+    sheet.append(["en", "apple", "사과", 3.0])
+    sheet.append([None, None, None, None])
+    sheet.append(["en", "pear", None])
+    buffer = BytesIO()
+    workbook.save(buffer)
+
+    frame = read_xlsx(buffer.getvalue())
+
+    assert list(frame.columns) == ["language", "term", "meaning", "star"]
+    assert frame.values.tolist() == [["en", "apple", "사과", 3], ["en", "pear", "", ""]]
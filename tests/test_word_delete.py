@@ -0,0 +1,105 @@
+"""Tests for the set-based word deletion engine."""
+from __future__ import annotations
+
+import models
+import schemas
+from routers.quizzes import list_history, start_quiz
+from utils.word_delete import delete_words, owned_word_ids
+
+
+def _session_with_questions(db, profile, group, answers) -> models.QuizSession:
+    session = models.QuizSession(
+        profile_id=profile.id,
+        group_id=group.id,
+        direction="term_to_meaning",
+        mode="exam",
+        total_questions=len(answers),
+        answered_questions=sum(answer is not None for answer in answers),
+        correct_questions=sum(answer is True for answer in answers),
+    )
+    db.add(session)
+    db.flush()
+    for position, (word, answer) in enumerate(zip(group.words, answers), start=1):
+        db.add(
+            models.QuizQuestion(
+                session_id=session.id,
+                word_id=word.id,
+                position=position,
+                prompt_text=word.term,
+                answer_text=word.meaning,
+                user_answer=None if answer is None else "answer",
+                is_correct=answer,
+            )
+        )
+    return session
+
+
+def test_delete_words_repairs_session_counters(db, profile) -> None:
+    folder = models.Folder(name="Folder", profile_id=profile.id)
+    group = models.Group(folder=folder, name="Day1", profile_id=profile.id)
+    group.words = [
+        models.Word(term=f"word{index}", meaning=f"meaning{index}") for index in range(4)
+    ]
+    db.add_all([folder, group])
+    db.flush()
+    first = _session_with_questions(db, profile, group, [True, False, None, True])
+    second = _session_with_questions(db, profile, group, [True, True])
+    third = _session_with_questions(db, profile, group, [None, None, None, True])
+    db.commit()
+    word_ids = [word.id for word in group.words]
+
+    removed = delete_words(db, word_ids[:3])
+    db.commit()
+
+    assert removed == 8
+    assert db.query(models.Word.id).all() == [(word_ids[3],)]
+    counters = {
+        session.id: (
+            session.total_questions,
+            session.answered_questions,
+            session.correct_questions,
+        )
+        for session in db.query(models.QuizSession)
+    }
+    assert counters == {first.id: (1, 1, 1), second.id: (0, 0, 0), third.id: (1, 1, 1)}
+    assert db.query(models.QuizQuestion).count() == 2
+
+
+def test_delete_words_drops_emptied_session_groups(db, profile) -> None:
+    folder = models.Folder(name="Folder", profile_id=profile.id)
+    day1 = models.Group(folder=folder, name="Day1", profile_id=profile.id)
+    day2 = models.Group(folder=folder, name="Day2", profile_id=profile.id)
+    day1.words = [models.Word(term=f"a{index}", meaning="뜻") for index in range(2)]
+    day2.words = [models.Word(term=f"b{index}", meaning="뜻") for index in range(2)]
+    db.add(folder)
+    db.commit()
+    payload = schemas.QuizStartRequest(group_ids=[day1.id, day2.id], random=False)
+    started = start_quiz(payload, accept=None, db=db, current_user=profile)
+    db.query(models.QuizSession).update({"is_completed": True})
+    db.commit()
+
+    delete_words(db, [day1.words[0].id])
+    db.commit()
+    assert list_history(limit=20, db=db, current_user=profile)[0].group_ids == [
+        day1.id,
+        day2.id,
+    ]
+
+    delete_words(db, [word.id for word in day2.words])
+    db.commit()
+    history = list_history(limit=20, db=db, current_user=profile)
+    assert [(item.session_id, item.group_ids) for item in history] == [
+        (started.session_id, [day1.id])
+    ]
+
+
+def test_owned_word_ids_ignores_other_profiles(db, profile) -> None:
+    other = models.Profile(username="other", name="Other")
+    folder = models.Folder(name="Folder", profile=other)
+    group = models.Group(folder=folder, name="Day1", profile=other)
+    word = models.Word(group=group, term="term", meaning="meaning")
+    db.add_all([other, folder, group, word])
+    db.commit()
+
+    assert owned_word_ids(db, other.id, [word.id, word.id + 1]) == [word.id]
+    assert owned_word_ids(db, profile.id, [word.id]) == []
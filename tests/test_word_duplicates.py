@@ -0,0 +1,143 @@
+"""Tests for the MinHash/LSH duplicate finder and word merging."""
+from __future__ import annotations
+
+import numpy as np
+
+import models
+import schemas
+from routers.quizzes import start_quiz, submit_answers
+from utils.word_duplicates import (
+    DuplicateWord,
+    find_duplicate_clusters,
+    jaccard,
+    load_profile_words,
+    lsh_candidate_pairs,
+    merge_words,
+    minhash_signatures,
+    shingles,
+)
+
+
+def _word(word_id: int, term: str, meaning: str, language: str = "en") -> DuplicateWord:
+    return DuplicateWord(word_id, 1, "group", "folder", language, term, meaning, 0, 0)
+
+
+def test_minhash_agreement_tracks_jaccard() -> None:
+    left = shingles("the quick brown fox jumps over the lazy dog")
+    right = shingles("the quick brown fox jumped over a lazy dog")
+    other = shingles("completely unrelated words here")
+
+    signatures = minhash_signatures([left, right, other], permutations=256)
+
+    estimate = (signatures[0] == signatures[1]).mean()
+    assert abs(estimate - jaccard(left, right)) < 0.1
+    assert (signatures[0] == signatures[2]).mean() < 0.1
+
+
+def test_lsh_pairs_similar_rows_without_comparing_all_pairs() -> None:
+    signatures = np.array([[1] * 8, [1] * 8, [2] * 8, [1] * 8], dtype=np.uint64)
+
+    pairs = lsh_candidate_pairs(signatures, bands=4)
+
+    assert pairs == {(0, 1), (1, 3), (0, 3)}
+
+
+def test_find_duplicate_clusters_separates_exact_and_near() -> None:
+    words = [
+        _word(1, "apple", "사과"),
+        _word(2, "Apple ", "사과, 능금"),
+        _word(3, "colour", "색깔, 빛깔"),
+        _word(4, "color", "색깔, 빛깔"),
+        _word(5, "color", "색깔, 빛깔", language="fr"),
+        _word(6, "zebra", "얼룩말"),
+    ]
+
+    clusters = find_duplicate_clusters(words)
+
+    assert [(cluster.kind, [word.id for word in cluster.words]) for cluster in clusters] == [
+        ("exact", [1, 2]),
+        ("near", [3, 4]),
+    ]
+    assert 0.6 <= clusters[1].similarity < 1
+
+
+def test_merge_words_keeps_canonical_and_quiz_history(db, profile) -> None:
+    folder = models.Folder(name="Folder", profile_id=profile.id)
+    first = models.Group(folder=folder, name="Day1", profile_id=profile.id)
+    second = models.Group(folder=folder, name="Day2", profile_id=profile.id)
+    canonical = models.Word(group=first, term="apple", meaning="사과", star=1)
+    duplicate = models.Word(group=second, term="apple", meaning="사과", star=3)
+    session = models.QuizSession(
+        profile_id=profile.id,
+        group=second,
+        direction="term_to_meaning",
+        mode="exam",
+        total_questions=1,
+    )
+    db.add_all([folder, first, second, canonical, duplicate, session])
+    db.flush()
+    db.add(
+        models.QuizQuestion(
+            session_id=session.id,
+            word_id=duplicate.id,
+            position=1,
+            prompt_text="apple",
+            answer_text="사과",
+        )
+    )
+    db.commit()
+    canonical_id, duplicate_id = canonical.id, duplicate.id
+    assert [word.question_count for word in load_profile_words(db, profile.id)] == [0, 1]
+
+    assert merge_words(db, canonical_id, [duplicate_id, canonical_id]) == 1
+    db.commit()
+
+    assert db.get(models.Word, duplicate_id) is None
+    assert db.get(models.Word, canonical_id).star == 3
+    assert db.query(models.QuizQuestion.word_id).scalar() == canonical_id
+
+
+def test_merge_words_links_sessions_and_folds_shared_answers(db, profile) -> None:
+    folder = models.Folder(name="Folder", profile_id=profile.id)
+    first = models.Group(folder=folder, name="Day1", profile_id=profile.id)
+    second = models.Group(folder=folder, name="Day2", profile_id=profile.id)
+    first.words = [models.Word(term="apple", meaning="사과")]
+    second.words = [models.Word(term="apple", meaning="사과")]
+    db.add(folder)
+    db.commit()
+    canonical_id, duplicate_id = first.words[0].id, second.words[0].id
+    group_ids = [first.id, second.id]
+
+    asked_second = start_quiz(
+        schemas.QuizStartRequest(group_ids=[second.id], random=False, mode="exam"),
+        accept=None,
+        db=db,
+        current_user=profile,
+    )
+    asked_both = start_quiz(
+        schemas.QuizStartRequest(group_ids=group_ids, random=False, mode="exam"),
+        accept=None,
+        db=db,
+        current_user=profile,
+    )
+    merge_words(db, canonical_id, [duplicate_id])
+    db.commit()
+
+    links = db.query(models.QuizSessionGroup.session_id, models.QuizSessionGroup.group_id)
+    assert (asked_second.session_id, first.id) in set(links)
+
+    # Both questions of the shared session now ask the canonical word.
+    submit_answers(
+        asked_both.session_id,
+        schemas.QuizAnswerBatch(
+            answers=[
+                schemas.QuizAnswerSubmit(question_id=question.id, is_correct=is_correct)
+                for question, is_correct in zip(asked_both.questions, [False, True])
+            ]
+        ),
+        db=db,
+        current_user=profile,
+    )
+    db.expire_all()
+    stat = db.get(models.WordStat, canonical_id)
+    assert (stat.attempts, stat.correct, stat.last_correct) == (2, 1, True)
@@ -0,0 +1,43 @@
+"""Tests for the streaming word export writers."""
+from __future__ import annotations
+
+from io import BytesIO
+
+import pandas as pd
+import pytest
+
+from utils.word_export import EXPORT_COLUMNS, EXPORT_WRITERS
+
+ROWS = [
+    ("Folder", "Day1", "en", "apple", "사과, 과일", None, "noun", 'say "hi"', None, 3),
+    ("Folder", "Day1", "en", "NA", "없음", "엔에이", None, None, "memo", 0),
+]
+
+
+def _read(export_format: str, payload: bytes) -> pd.DataFrame:
+    if export_format == "csv":
+        return pd.read_csv(BytesIO(payload), dtype=str, keep_default_na=False)
+    if export_format == "ndjson":
+        return pd.read_json(BytesIO(payload), lines=True, dtype=False)
+    if export_format == "msgpack":
+        import msgpack
+
+        unpacker = msgpack.Unpacker(BytesIO(payload), raw=False)
+        return pd.concat(pd.DataFrame(batch["columns"]) for batch in unpacker)
+    return pd.read_excel(BytesIO(payload), keep_default_na=False)
+
+
+@pytest.mark.parametrize("export_format", sorted(EXPORT_WRITERS))
+def test_writers_round_trip(export_format: str) -> None:
+    if export_format == "msgpack":
+        pytest.importorskip("msgpack")
+    batches = iter([ROWS[:1], ROWS[1:]])
+    payload = b"".join(EXPORT_WRITERS[export_format](batches))
+
+    frame = _read(export_format, payload)
+
+    assert list(frame.columns) == list(EXPORT_COLUMNS)
+    assert frame["term"].tolist() == ["apple", "NA"]
+    assert frame["meaning"].tolist() == ["사과, 과일", "없음"]
+    assert frame["example"].iloc[0] == 'say "hi"'
+    assert [int(value) for value in frame["star"]] == [3, 0]
@@ -0,0 +1,146 @@
+"""Tests for the bulk word import helpers."""
+from __future__ import annotations
+
+import pandas as pd
+from sqlalchemy import event
+
+import database
+import models
+from utils.word_import import (
+    apply_group_import,
+    apply_structured_import,
+    normalize_group_frame,
+    normalize_structured_frame,
+    plan_group_import,
+    plan_structured_import,
+    preview_structured_import,
+)
+
+
+def _rows(count: int, groups: int, suffix: str = "") -> list[dict]:
+    return [
+        {
+            "folder": f"Folder{index % 2}{suffix}",
+            "group": f"Day{index % groups}",
+            "term": f"word{index}",
+            "meaning": f"meaning{index}",
+        }
+        for index in range(count)
+    ]
+
+
+def _structured(db, profile_id: int, rows: list[dict], language: str = "기본"):
+    frame = normalize_structured_frame(pd.DataFrame(rows), language)
+    return apply_structured_import(
+        db, plan_structured_import(db, profile_id, frame, language)
+    )
+
+
+def _count_statements(callback) -> int:
+    statements: list[str] = []
+
+    def record(*args) -> None:
+        statements.append(args[2])
+
+    event.listen(database.engine, "before_cursor_execute", record)
+    try:
+        callback()
+    finally:
+        event.remove(database.engine, "before_cursor_execute", record)
+    return len(statements)
+
+
+def test_structured_import_creates_structure(db, profile) -> None:
+    rows = _rows(20, 4) + [
+        {"folder": " Folder0 ", "group": "day0", "term": "WORD0 ", "meaning": "dup"},
+        {"folder": None, "group": "Day0", "term": "orphan", "meaning": "x"},
+    ]
+
+    summary = _structured(db, profile.id, rows)
+    db.commit()
+
+    assert summary.inserted == 20
+    assert summary.skipped == 2
+    assert summary.folders_created == 2
+    assert summary.groups_created == 4
+    assert db.query(models.Word).count() == 20
+
+    again = _structured(db, profile.id, rows)
+    assert again.inserted == 0
+    assert again.skipped == 22
+    assert again.groups_created == 0
+
+
+def test_structured_import_statement_count_is_constant(db, profile) -> None:
+    profile_id = profile.id
+
+    def run(groups: int) -> int:
+        rows = _rows(200, groups, suffix=f"-{groups}")
+        return _count_statements(lambda: _structured(db, profile_id, rows))
+
+    assert run(2) == run(50)
+
+
+def test_structured_import_backfills_folder_language(db, profile) -> None:
+    folder = models.Folder(name="Hanja", profile_id=profile.id)
+    db.add(folder)
+    db.commit()
+
+    rows = [{"folder": "hanja", "group": "Day1", "term": "山", "meaning": "산"}]
+    summary = _structured(db, profile.id, rows, language="한자")
+    db.commit()
+    db.refresh(folder)
+
+    assert summary.folders_created == 0
+    assert folder.default_language == "한자"
+
+
+def test_group_import_upserts_and_clamps_star(db, profile) -> None:
+    folder = models.Folder(name="English", profile_id=profile.id)
+    group = models.Group(folder=folder, name="Day1", profile_id=profile.id)
+    db.add_all([folder, group])
+    db.flush()
+    db.add(models.Word(group_id=group.id, language="en", term="apple", meaning="old", star=2))
+    db.commit()
+
+    df = pd.DataFrame(
+        {
+            "language": ["en", "en", "en", "en", None],
+            "term": [" apple", "Apple", "banana", "banana", "cherry"],
+            "meaning": ["사과", "대문자 사과", "바나나", "바나나2", None],
+            "star": [None, None, "15", 3.7, 1],
+        }
+    )
+    summary = apply_group_import(db, plan_group_import(db, group.id, normalize_group_frame(df)))
+    db.commit()
+
+    assert summary == {"inserted": 2, "updated": 1, "skipped": 2}
+    words = {word.term: word for word in db.query(models.Word).all()}
+    assert words["apple"].meaning == "사과"
+    # Terms are matched exactly, so a different case is a new word.
+    assert words["Apple"].meaning == "대문자 사과"
+    assert words["apple"].star == 2
+    assert words["banana"].meaning == "바나나2"
+    assert words["banana"].star == 3
+
+
+def test_structured_preview_matches_apply_without_writing(db, profile) -> None:
+    rows = _rows(30, 3) + [
+        {"folder": "Folder0", "group": "Day0", "term": "word0", "meaning": "again"},
+        {"folder": "Folder1", "group": "Day9", "term": "lonely", "meaning": None},
+    ]
+    frame = normalize_structured_frame(pd.DataFrame(rows), "기본")
+
+    preview = preview_structured_import(plan_structured_import(db, profile.id, frame, "기본"))
+    assert db.query(models.Folder).count() == 0
+
+    summary = apply_structured_import(db, plan_structured_import(db, profile.id, frame, "기본"))
+    assert (preview.inserted, preview.skipped) == (summary.inserted, summary.skipped)
+    assert preview.groups_created == summary.groups_created
+    assert sum(group.inserted for group in preview.groups) == summary.inserted
+    assert sum(group.skipped for group in preview.groups) == summary.skipped
+    assert {conflict.reason for conflict in preview.conflicts} == {
+        "duplicate_in_file",
+        "missing_field",
+    }
+    assert [group.group_name for group in preview.groups if group.inserted == 0] == ["Day9"]
@@ -0,0 +1,40 @@
+"""Tests for filling Hanja readings in bulk."""
+from __future__ import annotations
+
+import models
+from utils.word_readings import fill_hanja_readings
+
+
+def test_fill_hanja_readings(db, profile) -> None:
+    folder = models.Folder(name="한자", profile_id=profile.id, default_language="한자")
+    group = models.Group(folder=folder, name="Day 1", profile_id=profile.id)
+    group.words = [
+        models.Word(term="學生", meaning="학생"),
+        models.Word(term="樂園", meaning="낙원"),
+        models.Word(term="apple", meaning="사과"),
+        models.Word(term="大學", meaning="대학", reading=""),
+        models.Word(term="天", meaning="하늘", reading="하늘 천"),
+    ]
+    db.add(folder)
+    db.commit()
+
+    preview = fill_hanja_readings(db, [group.id], dry_run=True, chunk_size=2)
+    assert (preview.filled, preview.skipped, preview.ambiguous) == (2, 1, 1)
+    assert db.query(models.Word).filter(models.Word.reading == "학생").count() == 0
+
+    result = fill_hanja_readings(db, [group.id], chunk_size=2)
+    db.commit()
+    readings = dict(db.query(models.Word.term, models.Word.reading))
+    assert (result.filled, result.skipped, result.ambiguous) == (2, 1, 1)
+    assert readings == {
+        "學生": "학생",
+        "樂園": None,
+        "apple": None,
+        "大學": "대학",
+        "天": "하늘 천",
+    }
+
+    result = fill_hanja_readings(db, [group.id], include_ambiguous=True)
+    db.commit()
+    assert (result.filled, result.ambiguous) == (1, 1)
+    assert db.query(models.Word.reading).filter_by(term="樂園").scalar() == "낙원"
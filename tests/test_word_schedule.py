@@ -0,0 +1,237 @@
+"""Tests for the spaced-repetition schedule and the due queue."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import text
+
+import database
+import models
+import schemas
+from routers.quizzes import (
+    list_due_words,
+    retry_incorrect,
+    start_due_quiz,
+    start_quiz,
+    submit_answer,
+    submit_answers,
+)
+from utils.word_stats import select_due_words
+
+
+@pytest.fixture
+def groups(db, profile):
+    folder = models.Folder(name="English", profile_id=profile.id)
+    day1 = models.Group(folder=folder, name="Day1", profile_id=profile.id)
+    day2 = models.Group(folder=folder, name="Day2", profile_id=profile.id)
+    day1.words = [models.Word(term=f"a{index}", meaning="뜻") for index in range(2)]
+    day2.words = [models.Word(term=f"b{index}", meaning="뜻") for index in range(2)]
+    db.add(folder)
+    db.commit()
+    return day1, day2
+
+
+def _answer(db, profile, started, results: list[bool]) -> None:
+    submit_answers(
+        started.session_id,
+        schemas.QuizAnswerBatch(
+            answers=[
+                schemas.QuizAnswerSubmit(question_id=question.id, is_correct=is_correct)
+                for question, is_correct in zip(started.questions, results)
+            ]
+        ),
+        db=db,
+        current_user=profile,
+    )
+
+
+def _exam(db, profile, group, results: list[bool], mode: str = "exam"):
+    payload = schemas.QuizStartRequest(group_ids=[group.id], random=False, mode=mode)
+    started = start_quiz(payload, accept=None, db=db, current_user=profile)
+    _answer(db, profile, started, results)
+    return started
+
+
+def _schedule(db, word_id: int) -> tuple:
+    db.expire_all()
+    stat = db.get(models.WordStat, word_id)
+    due_in = (stat.next_due_at - stat.last_answered_at).total_seconds() / 86400
+    return stat.repetitions, round(stat.interval_days, 2), round(stat.ease, 2), round(due_in, 2)
+
+
+def test_intervals_grow_and_lapses_reset(db, profile, groups) -> None:
+    day1, _ = groups
+    first, second = sorted(word.id for word in day1.words)
+
+    for results, expected in [
+        ([True, False], ((1, 1.0, 2.5, 1.0), (0, 1.0, 2.3, 1.0))),
+        ([True, False], ((2, 6.0, 2.5, 6.0), (0, 1.0, 2.1, 1.0))),
+        ([True, True], ((3, 15.0, 2.5, 15.0), (1, 1.0, 2.1, 1.0))),
+        ([False, True], ((0, 1.0, 2.3, 1.0), (2, 6.0, 2.1, 6.0))),
+    ]:
+        _exam(db, profile, day1, results)
+        assert (_schedule(db, first), _schedule(db, second)) == expected
+
+    for _ in range(6):
+        _exam(db, profile, day1, [False, False])
+    assert _schedule(db, first)[2] == 1.3
+
+
+def test_changed_answers_do_not_review_twice(db, profile, groups) -> None:
+    day1, _ = groups
+    first, second = sorted(word.id for word in day1.words)
+    started = _exam(db, profile, day1, [False, True])
+    for question, is_correct in zip(started.questions, [True, False]):
+        submit_answer(
+            started.session_id,
+            schemas.QuizAnswerSubmit(question_id=question.id, is_correct=is_correct),
+            db=db,
+            current_user=profile,
+        )
+
+    # The first answer of each question is its review.
+    assert (_schedule(db, first), _schedule(db, second)) == (
+        (0, 1.0, 2.3, 1.0),
+        (1, 1.0, 2.5, 1.0),
+    )
+
+
+def test_study_and_retry_answers_do_not_schedule(db, profile, groups) -> None:
+    day1, _ = groups
+    word_id = min(word.id for word in day1.words)
+    started = _exam(db, profile, day1, [False, True])
+    assert _schedule(db, word_id) == (0, 1.0, 2.3, 1.0)
+
+    retried = retry_incorrect(
+        started.session_id, schemas.QuizRetryRequest(), db=db, current_user=profile
+    )
+    _answer(db, profile, retried, [True])
+    _exam(db, profile, day1, [True, True], mode="study")
+
+    assert _schedule(db, word_id) == (0, 1.0, 2.3, 1.0)
+    assert db.get(models.WordStat, word_id).attempts == 3
+
+
+def test_due_queue_spans_groups_and_starts_an_exam(db, profile, groups) -> None:
+    day1, day2 = groups
+    _exam(db, profile, day1, [True, False])
+    _exam(db, profile, day2, [False, True])
+    stats = models.WordStat
+    due = {word.id: index for index, word in enumerate([*day1.words, *day2.words])}
+    for word_id, index in due.items():
+        db.query(stats).filter(stats.word_id == word_id).update(
+            {"next_due_at": datetime.utcnow() - timedelta(days=10 - index)}
+        )
+    db.query(stats).filter(stats.word_id == day2.words[1].id).update(
+        {"next_due_at": datetime.utcnow() + timedelta(days=1)}
+    )
+    db.commit()
+
+    listed = list_due_words(limit=2, db=db, current_user=profile)
+    assert [item.term for item in listed.items] == ["a0", "a1"]
+    assert listed.has_more
+    listed = list_due_words(limit=5, db=db, current_user=profile)
+    assert [item.term for item in listed.items] == ["a0", "a1", "b0"]
+    assert not listed.has_more
+
+    started = start_due_quiz(
+        schemas.QuizDueStartRequest(limit=5, random=False), accept=None, db=db, current_user=profile
+    )
+    assert [question.prompt for question in started.questions] == ["a0", "a1", "b0"]
+    session = db.get(models.QuizSession, started.session_id)
+    assert session.mode == "exam"
+    assert {link.group_id for link in session.group_links} == {day1.id, day2.id}
+
+    _answer(db, profile, started, [True, True, True])
+    assert list_due_words(limit=5, db=db, current_user=profile).items == []
+    with pytest.raises(HTTPException) as error:
+        start_due_quiz(schemas.QuizDueStartRequest(), accept=None, db=db, current_user=profile)
+    assert error.value.status_code == 400
+
+
+def test_due_queue_reads_the_profile_due_index(db, profile, groups) -> None:
+    statement = (
+        db.query(models.WordStat.word_id)
+        .filter(
+            models.WordStat.profile_id == profile.id,
+            models.WordStat.next_due_at <= datetime.utcnow(),
+        )
+        .order_by(models.WordStat.next_due_at)
+        .limit(10)
+        .statement.compile(compile_kwargs={"literal_binds": True})
+    )
+    with database.engine.connect() as connection:
+        plan = " ".join(
+            row[-1] for row in connection.execute(text(f"EXPLAIN QUERY PLAN {statement}"))
+        )
+    assert "idx_word_stats_profile_due" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def _graded_and_ungraded_history(db, profile, groups) -> None:
+    day1, day2 = groups
+    started = _exam(db, profile, day1, [True, False])
+    retried = retry_incorrect(
+        started.session_id, schemas.QuizRetryRequest(), db=db, current_user=profile
+    )
+    _answer(db, profile, retried, [True])
+    _exam(db, profile, day2, [True, False], mode="study")
+
+
+def _assert_seeded_from_graded_answers(db, profile, groups) -> None:
+    day1, day2 = groups
+    db.expire_all()
+    for word in day1.words:
+        assert _schedule(db, word.id) == (0, 1.0, 2.5, 1.0)
+    assert all(db.get(models.WordStat, word.id).next_due_at is None for word in day2.words)
+
+    # Old history is due a day after its last graded answer, not all at once.
+    assert select_due_words(db, profile.id, 10, now=datetime.utcnow()) == []
+    rows = select_due_words(db, profile.id, 10, now=datetime.utcnow() + timedelta(days=2))
+    assert sorted(word.term for word, _ in rows) == ["a0", "a1"]
+
+
+def test_backfill_schedules_only_graded_answers(db, profile, groups) -> None:
+    _graded_and_ungraded_history(db, profile, groups)
+    with database.engine.begin() as connection:
+        connection.execute(text("DROP TABLE word_stats"))
+
+    database.ensure_schema()
+
+    _assert_seeded_from_graded_answers(db, profile, groups)
+
+
+def test_schedule_columns_are_added_to_existing_stats(db, profile, groups) -> None:
+    _graded_and_ungraded_history(db, profile, groups)
+    with database.engine.begin() as connection:
+        # ``word_stats`` as it was before the schedule columns existed.
+        connection.execute(text("ALTER TABLE word_stats RENAME TO word_stats_new"))
+        connection.execute(
+            text(
+                """
+                CREATE TABLE word_stats (
+                    word_id INTEGER PRIMARY KEY REFERENCES words(id) ON DELETE CASCADE,
+                    group_id INTEGER NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    correct INTEGER NOT NULL DEFAULT 0,
+                    streak INTEGER NOT NULL DEFAULT 0,
+                    last_correct BOOLEAN,
+                    last_answered_at DATETIME,
+                    error_rate FLOAT NOT NULL DEFAULT 0
+                )
+                """
+            )
+        )
+        connection.execute(
+            text(
+                "INSERT INTO word_stats SELECT word_id, group_id, attempts, correct, "
+                "streak, last_correct, last_answered_at, error_rate FROM word_stats_new"
+            )
+        )
+        connection.execute(text("DROP TABLE word_stats_new"))
+
+    database.ensure_schema()
+
+    _assert_seeded_from_graded_answers(db, profile, groups)
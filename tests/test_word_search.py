@@ -0,0 +1,148 @@
+"""Tests for the indexed word search."""
+from __future__ import annotations
+
+import pandas as pd
+from sqlalchemy import event, text
+
+import database
+import models
+from utils.word_import import apply_group_import, normalize_group_frame, plan_group_import
+from utils.word_search import search_words, search_words_hangul
+
+
+def _terms(db, profile_id: int, query: str, **kwargs) -> list[str]:
+    rows, _ = search_words(
+        db, profile_id, query, limit=kwargs.get("limit", 20), offset=kwargs.get("offset", 0)
+    )
+    return [row.term for row in rows]
+
+
+def _seed(db, profile) -> models.Group:
+    folder = models.Folder(name="English", profile_id=profile.id)
+    group = models.Group(folder=folder, name="Day1", profile_id=profile.id)
+    db.add_all([folder, group])
+    db.flush()
+    db.add_all(
+        [
+            models.Word(group_id=group.id, term="pineapple", meaning="파인애플"),
+            models.Word(group_id=group.id, term="apple", meaning="사과", example="apple pie"),
+            models.Word(group_id=group.id, term="app", meaning="앱"),
+        ]
+    )
+    db.commit()
+    return group
+
+
+def test_search_ranks_exact_and_prefix_matches_first(db, profile) -> None:
+    _seed(db, profile)
+
+    assert _terms(db, profile.id, "app") == ["app", "apple", "pineapple"]
+    assert _terms(db, profile.id, "PIE") == ["apple"]
+    assert _terms(db, profile.id, "사과") == ["apple"]
+    assert _terms(db, profile.id, "%") == []
+
+
+def test_short_queries_use_prefix_indexes(db, profile) -> None:
+    _seed(db, profile)
+    statements: list[tuple] = []
+
+    def record(conn, cursor, statement, parameters, *args) -> None:
+        statements.append((statement, parameters))
+
+    event.listen(database.engine, "before_cursor_execute", record)
+    try:
+        assert _terms(db, profile.id, "AP") == ["app", "apple"]
+        assert _terms(db, profile.id, "사") == ["apple"]
+        assert _terms(db, profile.id, "pl") == []
+    finally:
+        event.remove(database.engine, "before_cursor_execute", record)
+
+    statement, parameters = next(item for item in statements if "term_jamo" in item[0])
+    with database.engine.connect() as connection:
+        plan = " ".join(
+            row[-1]
+            for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        )
+    assert "idx_words_term_jamo" in plan
+    assert "idx_words_meaning_jamo" in plan
+    assert "SCAN words" not in plan
+
+
+def test_search_paginates(db, profile) -> None:
+    _seed(db, profile)
+
+    rows, has_more = search_words(db, profile.id, "app", limit=2, offset=0)
+    assert [row.term for row in rows] == ["app", "apple"]
+    assert has_more
+    rows, has_more = search_words(db, profile.id, "app", limit=2, offset=2)
+    assert [row.term for row in rows] == ["pineapple"]
+    assert not has_more
+
+
+def test_search_index_follows_updates_and_deletes(db, profile) -> None:
+    _seed(db, profile)
+    word = db.query(models.Word).filter(models.Word.term == "pineapple").one()
+
+    word.term = "pear"
+    db.commit()
+    assert _terms(db, profile.id, "pineapple") == []
+    assert _terms(db, profile.id, "pear") == ["pear"]
+
+    db.delete(word)
+    db.commit()
+    assert _terms(db, profile.id, "pear") == []
+
+    other = models.Profile(username="other", name="Other")
+    db.add(other)
+    db.commit()
+    assert _terms(db, other.id, "apple") == []
+
+
+def _hangul_terms(db, profile_id: int, query: str) -> list[str]:
+    rows, _ = search_words_hangul(db, profile_id, query, limit=20, offset=0)
+    return [row.term for row in rows]
+
+
+def test_hangul_search_matches_initials_and_partial_syllables(db, profile) -> None:
+    folder = models.Folder(name="과일", profile_id=profile.id)
+    group = models.Group(folder=folder, name="1일차", profile_id=profile.id)
+    db.add_all(
+        [
+            folder,
+            group,
+            models.Word(group=group, term="사과", meaning="apple"),
+            models.Word(group=group, term="사랑", meaning="love"),
+            models.Word(group=group, term="apple", meaning="사과"),
+        ]
+    )
+    db.commit()
+
+    assert _hangul_terms(db, profile.id, "ㅅㄱ") == ["사과", "apple"]
+    assert _hangul_terms(db, profile.id, "ㅅ") == ["사과", "사랑", "apple"]
+    assert _hangul_terms(db, profile.id, "삭") == ["사과", "apple"]
+    assert _hangul_terms(db, profile.id, "살") == ["사랑"]
+    assert _hangul_terms(db, profile.id, "ㅂ") == []
+
+    word = db.query(models.Word).filter(models.Word.term == "사랑").one()
+    word.term = "바람"
+    db.commit()
+    assert _hangul_terms(db, profile.id, "ㅂㄹ") == ["바람"]
+    assert _hangul_terms(db, profile.id, "살") == []
+
+
+def test_hangul_keys_follow_bulk_imports(db, profile) -> None:
+    folder = models.Folder(name="Fruit", profile_id=profile.id)
+    group = models.Group(folder=folder, name="Day1", profile_id=profile.id)
+    db.add_all([folder, group])
+    db.commit()
+
+    sheet = pd.DataFrame({"term": ["pear"], "meaning": ["배"]})
+    apply_group_import(db, plan_group_import(db, group.id, normalize_group_frame(sheet)))
+    db.commit()
+    assert _hangul_terms(db, profile.id, "ㅂ") == ["pear"]
+
+    sheet = pd.DataFrame({"term": ["pear"], "meaning": ["서양배"]})
+    apply_group_import(db, plan_group_import(db, group.id, normalize_group_frame(sheet)))
+    db.commit()
+    assert _hangul_terms(db, profile.id, "ㅂ") == []
+    assert _hangul_terms(db, profile.id, "ㅅㅇ") == ["pear"]
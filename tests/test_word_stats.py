@@ -0,0 +1,117 @@
+"""Tests for per-word answer statistics."""
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import text
+
+import database
+import models
+import schemas
+from routers.groups import list_weakest_words
+from routers.quizzes import start_quiz, submit_answer, submit_answers
+from utils.word_delete import delete_words
+from utils.word_duplicates import merge_words
+from utils.word_transfer import apply_transfer, plan_transfer
+
+
+@pytest.fixture
+def groups(db, profile):
+    folder = models.Folder(name="English", profile_id=profile.id)
+    day1 = models.Group(folder=folder, name="Day1", profile_id=profile.id)
+    day2 = models.Group(folder=folder, name="Day2", profile_id=profile.id)
+    day1.words = [models.Word(term=f"word{index}", meaning=f"뜻{index}") for index in range(4)]
+    db.add(folder)
+    db.add(day2)
+    db.commit()
+    return day1, day2
+
+
+def _answer_all(db, profile, group, results: list[bool]) -> schemas.QuizStartResponse:
+    payload = schemas.QuizStartRequest(group_ids=[group.id], random=False)
+    started = start_quiz(payload, accept=None, db=db, current_user=profile)
+    submit_answers(
+        started.session_id,
+        schemas.QuizAnswerBatch(
+            answers=[
+                schemas.QuizAnswerSubmit(question_id=question.id, is_correct=is_correct)
+                for question, is_correct in zip(started.questions, results)
+            ]
+        ),
+        db=db,
+        current_user=profile,
+    )
+    return started
+
+
+def _stats(db) -> dict[int, tuple]:
+    db.expire_all()
+    return {
+        stat.word_id: (
+            stat.group_id,
+            stat.attempts,
+            stat.correct,
+            stat.streak,
+            stat.last_correct,
+            round(stat.error_rate, 3),
+        )
+        for stat in db.query(models.WordStat)
+    }
+
+
+def test_answers_update_stats_and_weakest_words(db, profile, groups) -> None:
+    day1, _ = groups
+    ids = [word.id for word in sorted(day1.words, key=lambda word: word.id)]
+    started = _answer_all(db, profile, day1, [False, True, False, True])
+    # Re-answering changes the result of that attempt, not the attempt count.
+    submit_answer(
+        started.session_id,
+        schemas.QuizAnswerSubmit(question_id=started.questions[2].id, is_correct=True),
+        db=db,
+        current_user=profile,
+    )
+    _answer_all(db, profile, day1, [False, False, True, True])
+
+    assert _stats(db) == {
+        ids[0]: (day1.id, 2, 0, 0, False, 1.0),
+        ids[1]: (day1.id, 2, 1, 0, False, 0.5),
+        ids[2]: (day1.id, 2, 2, 2, True, 0.0),
+        ids[3]: (day1.id, 2, 2, 2, True, 0.0),
+    }
+    weakest = list_weakest_words(day1.id, limit=20, min_attempts=1, db=db, current_user=profile)
+    assert [(word.term, word.error_rate) for word in weakest] == [
+        ("word0", 1.0),
+        ("word1", 0.5),
+    ]
+
+
+def test_backfill_matches_incremental_stats(db, profile, groups) -> None:
+    day1, _ = groups
+    _answer_all(db, profile, day1, [False, True, True, False])
+    _answer_all(db, profile, day1, [True, True, False, False])
+    incremental = _stats(db)
+
+    with database.engine.begin() as connection:
+        connection.execute(text("DROP TABLE word_stats"))
+    database.ensure_schema()
+
+    assert _stats(db) == incremental
+
+
+def test_stats_follow_word_moves_merges_and_deletes(db, profile, groups) -> None:
+    day1, day2 = groups
+    ids = [word.id for word in sorted(day1.words, key=lambda word: word.id)]
+    _answer_all(db, profile, day1, [False, True, True, False])
+
+    apply_transfer(db, plan_transfer(db, [ids[0]], day2.id, "move", "skip"), "move")
+    merge_words(db, ids[1], [ids[2]])
+    delete_words(db, [ids[3]])
+    db.commit()
+
+    assert _stats(db) == {
+        ids[0]: (day2.id, 1, 0, 0, False, 1.0),
+        ids[1]: (day1.id, 2, 2, 1, True, 0.0),
+    }
+
+    db.delete(day2)
+    db.commit()
+    assert set(_stats(db)) == {ids[1]}
@@ -0,0 +1,140 @@
+"""Tests for bulk moving and copying words between groups."""
+from __future__ import annotations
+
+import pytest
+
+import models
+from utils.group_counters import refresh_group_counters
+from utils.word_transfer import apply_transfer, plan_transfer
+
+
+@pytest.fixture
+def groups(db, profile):
+    folder = models.Folder(name="Folder", profile_id=profile.id)
+    source = models.Group(folder=folder, name="Source", profile_id=profile.id)
+    target = models.Group(folder=folder, name="Target", profile_id=profile.id)
+    source.words = [
+        models.Word(term="apple", meaning="사과", star=2),
+        models.Word(term="pear", meaning="배"),
+        models.Word(term="plum", meaning="자두"),
+    ]
+    target.words = [
+        models.Word(term="apple", meaning="old"),
+        models.Word(term="apple (2)", meaning="x"),
+    ]
+    db.add_all([folder, source, target])
+    db.commit()
+    return source, target
+
+
+def _terms(db, group) -> dict[str, str]:
+    return dict(
+        db.query(models.Word.term, models.Word.meaning)
+        .filter(models.Word.group_id == group.id)
+        .all()
+    )
+
+
+def _transfer(db, word_ids, target, action, on_conflict):
+    plan = plan_transfer(db, word_ids, target.id, action, on_conflict)
+    apply_transfer(db, plan, action)
+    db.commit()
+    return plan
+
+
+def test_move_skip_leaves_conflicts_in_place(db, groups) -> None:
+    source, target = groups
+    word_ids = [word.id for word in source.words]
+
+    plan = _transfer(db, word_ids, target, "move", "skip")
+
+    assert (len(plan.plain_ids), len(plan.skipped_ids)) == (2, 1)
+    assert _terms(db, source) == {"apple": "사과"}
+    assert _terms(db, target) == {"apple": "old", "apple (2)": "x", "pear": "배", "plum": "자두"}
+    # Moved words keep their ids.
+    moved = db.query(models.Word.group_id).filter(models.Word.id.in_(word_ids[1:])).all()
+    assert moved == [(target.id,), (target.id,)]
+
+
+def test_move_rename_picks_a_free_suffix(db, groups) -> None:
+    source, target = groups
+
+    _transfer(db, [word.id for word in source.words], target, "move", "rename")
+
+    assert _terms(db, source) == {}
+    assert _terms(db, target)["apple (3)"] == "사과"
+
+
+def test_move_overwrite_repoints_quiz_questions(db, profile, groups) -> None:
+    source, target = groups
+    apple = source.words[0]
+    existing = target.words[0]
+    session = models.QuizSession(
+        profile_id=profile.id,
+        group_id=source.id,
+        direction="term_to_meaning",
+        mode="exam",
+        total_questions=1,
+    )
+    db.add(session)
+    db.flush()
+    db.add(
+        models.QuizQuestion(
+            session_id=session.id,
+            word_id=apple.id,
+            position=1,
+            prompt_text="apple",
+            answer_text="사과",
+        )
+    )
+    db.commit()
+    apple_id, existing_id = apple.id, existing.id
+
+    _transfer(db, [apple_id], target, "move", "overwrite")
+
+    assert db.get(models.Word, apple_id) is None
+    assert db.get(models.Word, existing_id).meaning == "사과"
+    assert db.get(models.Word, existing_id).star == 2
+    assert db.query(models.QuizQuestion.word_id).scalar() == existing_id
+
+
+@pytest.mark.parametrize("action", ["move", "copy"])
+def test_overwrite_takes_one_source_per_target_word(db, profile, groups, action) -> None:
+    source, target = groups
+    other = models.Group(folder_id=source.folder_id, name="Other", profile_id=profile.id)
+    other.words = [models.Word(term="apple", meaning="능금", star=5)]
+    db.add(other)
+    db.flush()
+    refresh_group_counters(db)
+    db.commit()
+    word_ids = [source.words[0].id, other.words[0].id]
+
+    plan = _transfer(db, word_ids, target, action, "overwrite")
+
+    assert plan.overwrites == {word_ids[0]: target.words[0].id}
+    assert plan.skipped_ids == [word_ids[1]]
+    assert _terms(db, target)["apple"] == "사과"
+    assert _terms(db, other) == {"apple": "능금"}
+    counters = [(group.word_count, group.star_histogram) for group in (source, target, other)]
+    refresh_group_counters(db)
+    db.commit()
+    db.expire_all()
+    assert counters == [
+        (group.word_count, group.star_histogram) for group in (source, target, other)
+    ]
+
+
+def test_copy_leaves_sources_and_copies_hangul_keys(db, groups) -> None:
+    source, target = groups
+
+    plan = _transfer(db, [word.id for word in source.words], target, "copy", "rename")
+
+    assert (len(plan.plain_ids), len(plan.renames)) == (2, 1)
+    assert len(_terms(db, source)) == 3
+    copied = (
+        db.query(models.Word)
+        .filter(models.Word.group_id == target.id, models.Word.term == "pear")
+        .one()
+    )
+    assert copied.meaning_chosung == "ㅂ"
+    assert db.query(models.Word).filter(models.Word.term == "apple (3)").one().meaning == "사과"
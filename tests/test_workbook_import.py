@@ -0,0 +1,70 @@
+"""Tests for importing every sheet of a workbook."""
+from __future__ import annotations
+
+from openpyxl import Workbook
+import pytest
+
+import models
+from utils import workbook_import
+from utils.table_reader import xlsx_sheet_names
+from utils.workbook_import import SheetProgress, import_workbook
+
+
+@pytest.fixture
+def workbook_path(tmp_path) -> str:
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "Unit 1"
+    sheet.append(["language", "word", "뜻"])
+    sheet.append(["en", "apple", "사과"])
+    sheet.append(["en", "pear", "배"])
+    sheet = workbook.create_sheet("Unit 2")
+    sheet.append(["term", "meaning", "star"])
+    sheet.append(["cat", "고양이", 2])
+    sheet.append(["apple", "사과", None])
+    sheet = workbook.create_sheet("Mixed")
+    sheet.append(["folder", "group", "term", "meaning"])
+    sheet.append(["Other", "Extra", "dog", "개"])
+    sheet.append([None, None, "cow", "소"])
+    workbook.create_sheet("Notes").append(["just notes"])
+    path = tmp_path / "book.xlsx"
+    workbook.save(path)
+    return str(path)
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_import_workbook(db, profile, workbook_path, max_workers, monkeypatch) -> None:
+    monkeypatch.setattr(workbook_import, "PARALLEL_PARSE_MIN_BYTES", 0)
+    sheets = [SheetProgress(name=name) for name in xlsx_sheet_names(workbook_path)]
+
+    summary = import_workbook(
+        db,
+        profile.id,
+        workbook_path,
+        sheets,
+        folder_name="Textbook",
+        default_language="en",
+        max_workers=max_workers,
+    )
+    db.commit()
+
+    progress = {sheet.name: (sheet.status, sheet.inserted) for sheet in sheets}
+    assert progress == {
+        "Unit 1": ("imported", 2),
+        "Unit 2": ("imported", 2),
+        "Mixed": ("imported", 2),
+        "Notes": ("skipped", 0),
+    }
+    assert (summary.inserted, summary.folders_created, summary.groups_created) == (6, 2, 4)
+    groups = {
+        (group.folder.name, group.name): sorted(word.term for word in group.words)
+        for group in db.query(models.Group)
+    }
+    assert groups == {
+        ("Textbook", "Unit 1"): ["apple", "pear"],
+        ("Textbook", "Unit 2"): ["apple", "cat"],
+        ("Textbook", "Mixed"): ["cow"],
+        ("Other", "Extra"): ["dog"],
+    }
+    cat = db.query(models.Word).filter_by(term="cat").one()
+    assert (cat.language, cat.star) == ("en", 2)